@@ -1,13 +1,13 @@
 import streamlit as st
 import os
-import tempfile
 import zipfile
 import io
 from datetime import datetime
 import traceback
 import openpyxl
-from excel_processor_v01 import ExcelProcessorV01
-from document_generator_v04 import DocumentGeneratorV04
+from batch_processor import process_uploads
+from bill_validator import validate_workbooks
+from excel_processor_v01 import summarize_bill
 from custom_utils.utils import setup_wkhtmltopdf
 
 # Page setup
@@ -124,77 +124,62 @@ def main():
         st.info(f"📅 Current Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 def process_bills_batch(uploaded_files, premium_percentage, reverse_font, gen_html, gen_pdf, gen_docx, gen_latex):
-    """Process multiple uploaded bill files in batch"""
+    """Process multiple uploaded bill files in parallel on the shared worker pool"""
     
     total_files = len(uploaded_files)
     progress_bar = st.progress(0)
     status_text = st.empty()
+    file_status = st.empty()
     
-    all_generated_files = []
+    file_sizes = {}
     processed_data = []
     failed_files = []
+    statuses = {index: f"⏳ {uploaded_file.name}" for index, uploaded_file in enumerate(uploaded_files, 1)}
     
     try:
         st.info(f"🔄 Starting batch processing of {total_files} files...")
+        uploads = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+        file_status.markdown("\n".join(f"- {status}" for status in statuses.values()))
         
-        for file_idx, uploaded_file in enumerate(uploaded_files):
-            try:
-                # Update progress
-                file_progress = (file_idx / total_files) * 100
-                status_text.text(f"Processing file {file_idx + 1}/{total_files}: {uploaded_file.name}")
-                progress_bar.progress(int(file_progress))
+        # Documents are written into the archive as each bill completes
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            results = process_uploads(
+                uploads,
+                premium_percentage=premium_percentage,
+                reverse_font=reverse_font,
+                generate_html=gen_html,
+                generate_pdf=gen_pdf,
+                generate_docx=gen_docx,
+                generate_latex=gen_latex
+            )
+            for completed, result in enumerate(results, 1):
+                if result['error']:
+                    failed_files.append({'name': result['name'], 'error': result['error']})
+                    statuses[result['index']] = f"❌ {result['name']}: {result['error']}"
+                else:
+                    # Prefix file names with the bill identifier
+                    bill_id = result['data'].get('bill_number', f"bill_{result['index']}")
+                    for name, content in result['documents'].items():
+                        archive_name = f"{bill_id}_{name}"
+                        if archive_name in file_sizes:
+                            archive_name = f"{bill_id}_{result['index']}_{name}"
+                        zip_file.writestr(archive_name, content)
+                        file_sizes[archive_name] = len(content)
+                    processed_data.append(summarize_bill(result['data']))
+                    statuses[result['index']] = f"✅ {result['name']}"
                 
-                # Step 1: Process Excel file
-                processor = ExcelProcessorV01()
-                data = processor.process_excel(uploaded_file)
-                
-                # Add premium percentage and file info to data
-                data['premium_percentage'] = premium_percentage
-                data['source_filename'] = uploaded_file.name
-                data['file_index'] = file_idx + 1
-                
-                # Step 2: Generate documents
-                generator = DocumentGeneratorV04()
-                
-                # Configure generator based on user selections
-                generator.generate_html = gen_html
-                generator.generate_pdf = gen_pdf
-                generator.generate_docx = gen_docx
-                generator.generate_latex = gen_latex
-                
-                # Create unique output directory for this file
-                generator.output_dir = tempfile.mkdtemp(prefix=f'bill_v04_{file_idx+1}_')
-                
-                files = generator.generate_all_documents(data, reverse_font)
-                
-                # Rename files to include bill identifier
-                renamed_files = []
-                bill_id = data.get('bill_number', f'bill_{file_idx+1}')
-                for file_path in files:
-                    if os.path.exists(file_path):
-                        file_ext = os.path.splitext(file_path)[1]
-                        base_name = os.path.splitext(os.path.basename(file_path))[0]
-                        new_name = f"{bill_id}_{base_name}{file_ext}"
-                        new_path = os.path.join(os.path.dirname(file_path), new_name)
-                        os.rename(file_path, new_path)
-                        renamed_files.append(new_path)
-                
-                all_generated_files.extend(renamed_files)
-                processed_data.append(data)
-                
-                st.success(f"✅ File {file_idx + 1} processed: {uploaded_file.name}")
-                
-            except Exception as e:
-                failed_files.append({'name': uploaded_file.name, 'error': str(e)})
-                st.error(f"❌ Failed to process {uploaded_file.name}: {str(e)}")
-                continue
+                progress_bar.progress(int(completed / total_files * 100))
+                status_text.text(f"Processed {completed}/{total_files}: {result['name']}")
+                file_status.markdown("\n".join(f"- {status}" for status in statuses.values()))
         
         # Final progress update
         progress_bar.progress(100)
         status_text.text("✅ Batch processing completed!")
         
         # Display batch results
-        display_batch_results(all_generated_files, processed_data, failed_files)
+        processed_data.sort(key=lambda data: data['file_index'])
+        display_batch_results(file_sizes, zip_buffer.getvalue(), processed_data, failed_files)
         
     except Exception as e:
         st.error(f"❌ Error in batch processing: {str(e)}")
@@ -202,59 +187,47 @@ def process_bills_batch(uploaded_files, premium_percentage, reverse_font, gen_ht
         st.code(traceback.format_exc())
 
 def test_processing_batch(uploaded_files):
-    """Test batch file processing without full generation"""
+    """Check uploaded bills for missing sheets, headers, bad numbers and totals without generating documents"""
     
-    with st.spinner("Testing batch file processing..."):
+    with st.spinner("Validating bill files..."):
         try:
-            results = []
-            for i, uploaded_file in enumerate(uploaded_files):
-                try:
-                    processor = ExcelProcessorV01()
-                    data = processor.process_excel(uploaded_file)
-                    results.append({
-                        'file': uploaded_file.name,
-                        'status': 'Success',
-                        'data': data
-                    })
-                except Exception as e:
-                    results.append({
-                        'file': uploaded_file.name,
-                        'status': 'Failed',
-                        'error': str(e)
-                    })
+            uploads = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+            reports = validate_workbooks(uploads, processes=False)
             
             # Show results summary
-            success_count = sum(1 for r in results if r['status'] == 'Success')
-            st.success(f"✅ Batch test completed: {success_count}/{len(uploaded_files)} files processed successfully")
+            valid_count = sum(1 for report in reports if report['valid'])
+            if valid_count == len(reports):
+                st.success(f"✅ Validation completed: {valid_count}/{len(reports)} files ready for processing")
+            else:
+                st.error(f"❌ Validation completed: {len(reports) - valid_count}/{len(reports)} files have errors")
+            
+            st.dataframe([{
+                'File': report['file'],
+                'Status': '✅ Valid' if report['valid'] else '❌ Invalid',
+                'Items': sum(report['items'].values()),
+                'Total Amount': report['total_amount'],
+                'Errors': len(report['errors']),
+                'Warnings': len(report['warnings']),
+                'Time (ms)': report['elapsed_ms'],
+            } for report in reports], use_container_width=True, hide_index=True)
             
             # Show detailed results
             with st.expander("🔍 Detailed Test Results"):
-                for result in results:
-                    if result['status'] == 'Success':
-                        st.write(f"**{result['file']}** - ✅ Success")
-                        st.json(result['data'], expanded=False)
-                    else:
-                        st.write(f"**{result['file']}** - ❌ Failed: {result['error']}")
+                for report in reports:
+                    if not report['errors'] and not report['warnings']:
+                        continue
+                    st.write(f"**{report['file']}**")
+                    for message in report['errors']:
+                        st.write(f"- ❌ {message}")
+                    for message in report['warnings']:
+                        st.write(f"- ⚠️ {message}")
                         
         except Exception as e:
             st.error(f"❌ Batch test failed: {str(e)}")
             st.error("**Error details:**")
             st.code(traceback.format_exc())
 
-def create_zip_bundle(file_paths):
-    """Create a ZIP bundle of all files"""
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for file_path in file_paths:
-            if os.path.exists(file_path):
-                filename = os.path.basename(file_path)
-                zip_file.write(file_path, filename)
-    
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue()
-
-def display_batch_results(all_files, processed_data, failed_files):
+def display_batch_results(file_sizes, zip_bytes, processed_data, failed_files):
     """Display batch processing results and download options"""
     
     st.header("📋 Batch Processing Results")
@@ -275,7 +248,7 @@ def display_batch_results(all_files, processed_data, failed_files):
         st.metric("Failed", len(failed_files), delta=f"-{(len(failed_files)/total_files*100):.0f}%" if total_files > 0 else "0%")
     
     with col4:
-        st.metric("Documents Generated", len(all_files))
+        st.metric("Documents Generated", len(file_sizes))
     
     # Show failed files if any
     if failed_files:
@@ -290,17 +263,15 @@ def display_batch_results(all_files, processed_data, failed_files):
                 st.write(f"**{data.get('source_filename', 'Unknown')}** - Bill: {data.get('bill_number', 'N/A')} - Amount: ₹{data.get('total_amount', 0):,.2f}")
     
     # Download section
-    if all_files:
+    if file_sizes:
         st.subheader("⬇️ Download Results")
         
-        # Create master ZIP with all files
-        zip_buffer = create_zip_bundle(all_files)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         zip_filename = f"batch_bills_v04_{timestamp}.zip"
         
         st.download_button(
-            label=f"📦 Download All Files ({len(all_files)} documents)",
-            data=zip_buffer,
+            label=f"📦 Download All Files ({len(file_sizes)} documents)",
+            data=zip_bytes,
             file_name=zip_filename,
             mime="application/zip",
             type="primary",
@@ -309,11 +280,8 @@ def display_batch_results(all_files, processed_data, failed_files):
         
         # File list
         with st.expander("📁 Generated Files List"):
-            for file_path in all_files:
-                if os.path.exists(file_path):
-                    filename = os.path.basename(file_path)
-                    file_size = os.path.getsize(file_path)
-                    st.write(f"• **{filename}** ({file_size:,} bytes)")
+            for filename, size in file_sizes.items():
+                st.write(f"• **{filename}** ({size:,} bytes)")
     
     else:
         st.warning("No files were generated. Please check the error messages above.")
@@ -7,28 +7,102 @@ output documents in various formats (HTML, PDF, DOCX) using the specified
 templates and configurations.
 """
 
+import io
+import json
 import logging
+import os
 import sys
+import threading
 import traceback
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('batch_processing.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Import document generator and excel processor
 from excel_processor_v01 import ExcelProcessorV01
 from document_generator_v04 import DocumentGeneratorV04
+from instrumentation import get_recorder, hotspots, profiled, stage, summarize
+from bill_validator import format_report, validate_workbooks
+
+# Worker threads shared by every upload batch in this process. Threads rather
+# than CPUs: most of a bill's time is spent waiting on wkhtmltopdf
+UPLOAD_WORKERS = int(os.environ.get('BILL_UPLOAD_WORKERS', 4))
+
+_upload_pool = None
+_upload_pool_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def get_upload_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool that processes uploaded bills."""
+    global _upload_pool
+    with _upload_pool_lock:
+        if _upload_pool is None:
+            _upload_pool = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix='bill-upload')
+        return _upload_pool
+
+
+def _worker_instances() -> Tuple[ExcelProcessorV01, DocumentGeneratorV04]:
+    """Processor and generator reused by every bill this worker thread handles."""
+    if getattr(_worker_state, 'generator', None) is None:
+        _worker_state.processor = ExcelProcessorV01()
+        _worker_state.generator = DocumentGeneratorV04()
+    return _worker_state.processor, _worker_state.generator
+
+
+def process_upload(index: int, name: str, content: bytes, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Process one uploaded bill in memory.
+
+    Args:
+        index: 1-based position of the file in the upload
+        name: Uploaded file name
+        content: Workbook bytes
+        options: premium_percentage, reverse_font and generate_html/pdf/docx/latex flags
+
+    Returns:
+        Dictionary with index, name, data, documents (file name -> bytes) and error
+    """
+    result = {'index': index, 'name': name, 'data': None, 'documents': {}, 'error': None}
+    try:
+        processor, generator = _worker_instances()
+        data = processor.process_excel(io.BytesIO(content))
+        data['premium_percentage'] = options['premium_percentage']
+        data['source_filename'] = name
+        data['file_index'] = index
+        
+        generator.generate_html = options['generate_html']
+        generator.generate_pdf = options['generate_pdf']
+        generator.generate_docx = options['generate_docx']
+        generator.generate_latex = options['generate_latex']
+        
+        result['data'] = data
+        result['documents'] = generator.render_documents(data, options['reverse_font'])
+    except Exception as e:
+        logger.error(f"Error processing upload {name}: {e}")
+        result['error'] = str(e)
+    return result
+
+
+def process_uploads(uploads: List[Tuple[str, bytes]], **options: Any) -> Iterator[Dict[str, Any]]:
+    """Process uploaded bills on the shared pool, yielding results as they complete.
+
+    Args:
+        uploads: (file name, workbook bytes) pairs
+        **options: See process_upload
+
+    Yields:
+        process_upload results, in completion order
+    """
+    pool = get_upload_pool()
+    futures = [
+        pool.submit(process_upload, index, name, content, options)
+        for index, (name, content) in enumerate(uploads, 1)
+    ]
+    for future in as_completed(futures):
+        yield future.result()
 
 def process_single_file(
     input_file: str,
@@ -51,6 +125,16 @@ def process_single_file(
     Returns:
         Dictionary with processing results and metadata
     """
+    # BILL_PROFILE=1 leaves profile_<bill>.prof in the batch output directory
+    with stage('process_single_file', input_file=str(input_file)), \
+            profiled(f"profile_{Path(input_file).stem}", str(output_dir)) as profile_path:
+        result = _process_single_file(input_file, output_dir, reverse_font,
+                                      generate_html, generate_pdf, generate_docx)
+    result['profile'] = profile_path
+    return result
+
+
+def _process_single_file(input_file, output_dir, reverse_font, generate_html, generate_pdf, generate_docx):
     start_time = datetime.now()
     file_name = Path(input_file).stem
     file_output_dir = Path(output_dir) / f"bill_{file_name}_{start_time.strftime('%Y%m%d_%H%M%S')}"
@@ -130,6 +214,7 @@ def process_batch_files(
         Dictionary with batch processing results and statistics
     """
     start_time = datetime.now()
+    batch_started = start_time.isoformat(timespec='milliseconds')
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -193,17 +278,35 @@ def process_batch_files(
         'results': results,
         'success': error_count == 0,
         'start_time': start_time.isoformat(),
-        'end_time': datetime.now().isoformat()
+        'end_time': datetime.now().isoformat(),
+        'stages': summarize(record for record in get_recorder().records()
+                            if record['timestamp'] >= batch_started),
+        'hotspots': hotspots(r.get('profile') for r in results)
     }
     
     logger.info(f"Batch processing completed in {total_time:.2f} seconds")
     logger.info(f"Success: {success_count}, Failed: {error_count}")
+    for entry in summary['stages'][:5]:
+        logger.info(f"Stage {entry['stage']}: {entry['calls']} call(s), "
+                    f"{entry['wall_ms'] / 1000:.2f}s total, {entry['cpu_ms'] / 1000:.2f}s CPU")
+    for row in summary['hotspots'][:10]:
+        logger.info(f"Hotspot {row['function']}: {row['tottime']:.3f}s own, "
+                    f"{row['cumtime']:.3f}s cumulative, {row['calls']} call(s)")
     
     return summary
 
 if __name__ == "__main__":
     import argparse
     
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler('batch_processing.log')
+        ]
+    )
+    
     parser = argparse.ArgumentParser(description='Process bill files in batch')
     parser.add_argument('input_files', nargs='+', help='Input Excel files')
     parser.add_argument('--output-dir', default='batch_processing_output', help='Output directory')
@@ -212,8 +315,25 @@ if __name__ == "__main__":
     parser.add_argument('--no-pdf', action='store_false', dest='pdf', help='Skip PDF generation')
     parser.add_argument('--no-docx', action='store_false', dest='docx', help='Skip DOCX generation')
     parser.add_argument('--workers', type=int, default=4, help='Maximum number of parallel workers')
+    parser.add_argument('--perf-log', help='Append per-stage timings to this JSON-lines file')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write a cProfile profile per bill and log the hottest functions')
+    parser.add_argument('--validate', action='store_true',
+                        help='Only check the workbooks (sheets, headers, numbers, totals); exit 1 if any is invalid')
+    parser.add_argument('--report', help='With --validate, also write the reports to this JSON file')
     
     args = parser.parse_args()
+    if args.validate:
+        reports = validate_workbooks(args.input_files, workers=args.workers)
+        print(format_report(reports))
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(reports, f, indent=2)
+        sys.exit(0 if all(report['valid'] for report in reports) else 1)
+    if args.perf_log:
+        get_recorder().log_path = args.perf_log
+    if args.profile:
+        os.environ['BILL_PROFILE'] = '1'
     
     result = process_batch_files(
         input_files=args.input_files,
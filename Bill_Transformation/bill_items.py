@@ -0,0 +1,198 @@
+"""
+Typed, columnar bill item table.
+
+Bill items come out of the Excel processor as dicts of strings. This module
+converts them once per bill into a pandas DataFrame with float64 columns and
+derives every quantity/amount used by the templates (deviation, excess,
+saving, tender premium) with whole-column operations instead of per-cell
+string parsing.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional
+
+# Numeric columns of the item table
+NUMERIC_COLUMNS = ['qty_wo', 'qty_bill', 'rate', 'amount']
+
+# Columns of a deviation statement row, in template order
+DEVIATION_COLUMNS = [
+    'serial_no', 'description', 'unit',
+    'qty_wo', 'rate', 'amt_wo',
+    'qty_bill', 'amt_bill',
+    'excess_qty', 'excess_amt',
+    'saving_qty', 'saving_amt',
+    'remark'
+]
+
+
+def parse_numeric(values: Iterable[Any]) -> np.ndarray:
+    """Convert a column of cell values to float64 in one pass.
+
+    Currency symbols, thousands separators and other non-numeric characters
+    are stripped; anything that still does not parse becomes NaN.
+    """
+    series = pd.Series(list(values) if not isinstance(values, pd.Series) else values, dtype=object)
+    if series.empty:
+        return np.empty(0, dtype=np.float64)
+    cleaned = series.where(series.notna(), '').astype(str).str.replace(r'[^\d.-]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _text_column(items: List[Dict[str, Any]], key: str) -> pd.Series:
+    return pd.Series([item.get(key, '') for item in items], dtype=object).fillna('').astype(str)
+
+
+def build_item_table(items: List[Dict[str, Any]],
+                     work_order_items: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+    """Build the typed item table for a bill.
+
+    Args:
+        items: Executed (bill quantity) items with description/unit/quantity/rate/amount
+        work_order_items: Optional work order items in the same format; matched to
+            bill items by description (and occurrence, for repeated descriptions)
+
+    Returns:
+        DataFrame with text columns serial_no/description/unit/remark and
+        float64 columns qty_wo/qty_bill/rate/amount. Rows without any numeric
+        value (header rows, section titles) are dropped.
+    """
+    columns = ['serial_no', 'description', 'unit', 'remark'] + NUMERIC_COLUMNS
+    if not items:
+        return pd.DataFrame({col: pd.Series(dtype=np.float64 if col in NUMERIC_COLUMNS else object)
+                             for col in columns})
+
+    table = pd.DataFrame({
+        'serial_no': _text_column(items, 'serial_no'),
+        'description': _text_column(items, 'description'),
+        'unit': _text_column(items, 'unit'),
+        'remark': _text_column(items, 'remark'),
+        'qty_bill': parse_numeric(item.get('quantity') for item in items),
+        'rate': parse_numeric(item.get('rate') for item in items),
+        'amount': parse_numeric(item.get('amount') for item in items),
+    })
+
+    # Drop rows that carry no numbers at all
+    table = table[table[['qty_bill', 'rate', 'amount']].notna().any(axis=1)].reset_index(drop=True)
+
+    if work_order_items:
+        wo = pd.DataFrame({
+            'description': _text_column(work_order_items, 'description'),
+            'qty_wo': parse_numeric(item.get('quantity') for item in work_order_items),
+        })
+        wo = wo[wo['qty_wo'].notna()]
+        wo['_occurrence'] = wo.groupby('description').cumcount()
+        table['_occurrence'] = table.groupby('description').cumcount()
+        table = table.merge(wo, on=['description', '_occurrence'], how='left').drop(columns='_occurrence')
+        table['qty_wo'] = table['qty_wo'].fillna(0.0)
+    else:
+        # Without a work order sheet the executed quantity is the only reference
+        table['qty_wo'] = table['qty_bill']
+
+    table[NUMERIC_COLUMNS] = table[NUMERIC_COLUMNS].fillna(0.0)
+    serial_missing = table['serial_no'] == ''
+    table.loc[serial_missing, 'serial_no'] = (table.index[serial_missing] + 1).astype(str)
+    return table[columns]
+
+
+def compute_deviation(table: pd.DataFrame) -> pd.DataFrame:
+    """Add work order/executed amounts and excess/saving columns to an item table"""
+    result = table.copy()
+    rate = result['rate'].to_numpy()
+    qty_wo = result['qty_wo'].to_numpy()
+    qty_bill = result['qty_bill'].to_numpy()
+
+    difference = qty_bill - qty_wo
+    excess_qty = np.clip(difference, 0.0, None)
+    saving_qty = np.clip(-difference, 0.0, None)
+
+    result['amt_wo'] = np.round(qty_wo * rate)
+    # Lump-sum rows have an amount but no rate
+    result['amt_bill'] = np.where(rate != 0, np.round(qty_bill * rate), result['amount'].to_numpy())
+    result['difference'] = difference
+    result['excess_qty'] = excess_qty
+    result['excess_amt'] = np.round(excess_qty * rate)
+    result['saving_qty'] = saving_qty
+    result['saving_amt'] = np.round(saving_qty * rate)
+    return result
+
+
+def premium_fraction(premium_percentage: float, premium_type: str = 'above') -> float:
+    """Signed tender premium as a fraction (negative for 'below' tenders)"""
+    fraction = float(premium_percentage or 0) / 100
+    return -fraction if str(premium_type).strip().lower() == 'below' else fraction
+
+
+def summarize_deviation(deviation: pd.DataFrame, premium_percentage: float = 0.0,
+                        premium_type: str = 'above') -> Dict[str, float]:
+    """Deviation statement totals, including tender premium on each column"""
+    fraction = premium_fraction(premium_percentage, premium_type)
+    totals = deviation[['amt_wo', 'amt_bill', 'excess_amt', 'saving_amt']].sum().to_numpy()
+    work_order_total, executed_total, overall_excess, overall_saving = (float(v) for v in totals)
+    premiums = np.round(totals * fraction)
+    grand_totals = totals + premiums
+
+    return {
+        'work_order_total': round(work_order_total),
+        'executed_total': round(executed_total),
+        'overall_excess': round(overall_excess),
+        'overall_saving': round(overall_saving),
+        'premium': {'percent': fraction, 'type': premium_type},
+        'tender_premium_f': float(premiums[0]),
+        'tender_premium_h': float(premiums[1]),
+        'tender_premium_j': float(premiums[2]),
+        'tender_premium_l': float(premiums[3]),
+        'grand_total_f': float(grand_totals[0]),
+        'grand_total_h': float(grand_totals[1]),
+        'grand_total_j': float(grand_totals[2]),
+        'grand_total_l': float(grand_totals[3]),
+        'net_difference': round(float(grand_totals[1] - grand_totals[0]))
+    }
+
+
+def deviation_records(deviation: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Deviation rows as plain dicts for template rendering"""
+    return deviation[DEVIATION_COLUMNS].to_dict('records')
+
+
+def bill_totals(table: pd.DataFrame, extra_items: Optional[List[Dict[str, Any]]] = None,
+                premium_percentage: float = 0.0, premium_type: str = 'above') -> Dict[str, Any]:
+    """First page / extra item totals of a bill"""
+    fraction = premium_fraction(premium_percentage, premium_type)
+    bill_total = float(table['amount'].sum())
+    bill_premium = round(bill_total * fraction)
+
+    extra_amounts = parse_numeric(item.get('amount') for item in (extra_items or []))
+    extra_total = float(np.nansum(extra_amounts))
+    extra_premium = round(extra_total * fraction)
+
+    return {
+        'tender_premium_percent': fraction,
+        'bill_total': bill_total,
+        'bill_premium': bill_premium,
+        'bill_grand_total': bill_total + bill_premium,
+        'extra_items_sum': extra_total + extra_premium,
+        'grand_total': extra_total,
+        'tender_premium': extra_premium,
+        'total_executed': extra_total + extra_premium
+    }
+
+
+def build_bill_context(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute every derived figure the templates need for one bill.
+
+    Uses ``data['item_table']`` when the processor already built it, so the
+    string -> float conversion happens once per bill.
+    """
+    table = data.get('item_table')
+    if not isinstance(table, pd.DataFrame):
+        table = build_item_table(data.get('items', []), data.get('work_order_items'))
+
+    premium_percentage = data.get('premium_percentage', 0) or 0
+    premium_type = data.get('premium_type', 'above') or 'above'
+
+    deviation = compute_deviation(table)
+    context = bill_totals(table, data.get('extra_items'), premium_percentage, premium_type)
+    context['deviation_table'] = deviation
+    context['deviation_summary'] = summarize_deviation(deviation, premium_percentage, premium_type)
+    return context
@@ -0,0 +1,306 @@
+"""
+Dry-run validation of bill workbooks.
+
+Checks that a workbook has the sheets, headers, numeric cells and totals the
+Excel processor relies on, without building DataFrames or rendering any
+document. Workbooks are streamed in openpyxl's read-only mode and each one
+yields a small report dict, so hundreds of files can be checked in parallel
+as a pre-flight gate before a batch run.
+"""
+
+import io
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+
+import openpyxl
+
+from instrumentation import instrumented
+
+# Worker processes for validate_workbooks (default: one per CPU)
+VALIDATE_WORKERS = int(os.environ.get('BILL_VALIDATE_WORKERS', 0)) or None
+
+# Sheets the processor needs, matched on a lower-cased sheet name fragment
+REQUIRED_SHEETS = {
+    'work order': 'Work Order',
+    'bill': 'Bill Quantity',
+}
+
+# Item table headers; a header cell matches a column if it contains a keyword
+COLUMN_KEYWORDS = {
+    'description': ('description', 'particulars'),
+    'quantity': ('quantity', 'qty'),
+    'rate': ('rate',),
+    'amount': ('amount',),
+    'unit': ('unit',),
+}
+REQUIRED_COLUMNS = ('description', 'quantity', 'rate', 'amount')
+NUMERIC_COLUMNS = ('quantity', 'rate', 'amount')
+
+# Title sheet labels the generated documents print; missing ones get defaults
+TITLE_FIELDS = {
+    'contractor': 'contractor',
+    'name of work': 'work name',
+    'bill number': 'bill number',
+}
+
+# Rows searched for an item table header
+HEADER_SCAN_ROWS = 10
+# Allowed difference between a computed and a stated amount: absolute, relative
+AMOUNT_TOLERANCE = (1.0, 0.005)
+# Issues listed per workbook before the rest are only counted
+MAX_ISSUES = 20
+
+_EXCEL_ERROR = re.compile(r'^#(REF|VALUE|DIV/0|NAME\?|N/A|NUM|NULL)!?$')
+
+Source = Union[str, Path, Tuple[str, bytes]]
+
+
+def _number(value: Any) -> Tuple[Optional[float], bool]:
+    """Parse a cell the way the processor does; returns (number, is_valid).
+
+    Blank cells are valid with no number. Currency symbols and thousands
+    separators are stripped before parsing, matching bill_items.parse_numeric.
+    """
+    if value is None or isinstance(value, bool):
+        return None, value is None
+    if isinstance(value, (int, float)):
+        return float(value), True
+    text = str(value).strip()
+    if not text:
+        return None, True
+    try:
+        return float(re.sub(r'[^\d.-]', '', text)), True
+    except ValueError:
+        return None, False
+
+
+def _close(expected: float, actual: float) -> bool:
+    absolute, relative = AMOUNT_TOLERANCE
+    return abs(expected - actual) <= max(absolute, relative * abs(expected))
+
+
+Row = Tuple[int, Tuple[Any, ...]]
+
+
+def _find_header(rows: List[Row]) -> Tuple[Optional[int], Dict[str, int]]:
+    """Index of the item table header among the first rows, and its column map."""
+    for row_index, (_, row) in enumerate(rows[:HEADER_SCAN_ROWS]):
+        columns = {}
+        for col_index, cell in enumerate(row):
+            if not isinstance(cell, str):
+                continue
+            text = cell.strip().lower()
+            for column, keywords in COLUMN_KEYWORDS.items():
+                if column not in columns and any(keyword in text for keyword in keywords):
+                    columns[column] = col_index
+                    break
+        if all(column in columns for column in NUMERIC_COLUMNS):
+            return row_index, columns
+    return None, {}
+
+
+class _Report:
+    """Accumulates the findings for one workbook."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.sheets: List[str] = []
+        self.items: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+        self._dropped = 0
+
+    def _add(self, issues: List[str], message: str):
+        if len(self.errors) + len(self.warnings) < MAX_ISSUES:
+            issues.append(message)
+        else:
+            self._dropped += 1
+
+    def error(self, message: str):
+        self._add(self.errors, message)
+
+    def warning(self, message: str):
+        self._add(self.warnings, message)
+
+    def as_dict(self, started: float) -> Dict[str, Any]:
+        warnings = list(self.warnings)
+        if self._dropped:
+            warnings.append(f"{self._dropped} more issue(s) not listed")
+        return {
+            'file': self.name,
+            'valid': not self.errors,
+            'sheets': self.sheets,
+            'items': self.items,
+            'totals': self.totals,
+            # What the processor bills: every item sheet except the work order
+            'total_amount': round(sum(amount for sheet, amount in self.totals.items()
+                                      if 'work order' not in sheet.lower()), 2),
+            'errors': self.errors,
+            'warnings': warnings,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def _check_title(rows: List[Row], report: _Report):
+    labels = [str(row[0]).strip().lower() for _, row in rows if row and row[0]]
+    for label, field in TITLE_FIELDS.items():
+        if not any(label in text for text in labels):
+            report.warning(f"Title: no {field} found")
+
+
+def _check_items(sheet_name: str, rows: List[Row], report: _Report):
+    header_index, columns = _find_header(rows)
+    if header_index is None:
+        report.error(f"{sheet_name}: no header row with quantity, rate and amount columns")
+        return
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        report.error(f"{sheet_name}: missing {', '.join(missing)} column(s)")
+        return
+
+    item_count = 0
+    computed_total = 0.0
+    stated_total = None
+    for row_number, row in rows[header_index + 1:]:
+        cells = {column: row[index] if index < len(row) else None for column, index in columns.items()}
+        description = str(cells['description'] or '').strip()
+        if description.lower().startswith('total'):
+            stated_total = cells['amount']
+            break
+
+        values = {}
+        for column in NUMERIC_COLUMNS:
+            value = cells[column]
+            number, valid = _number(value)
+            if isinstance(value, str) and _EXCEL_ERROR.match(value.strip()):
+                report.error(f"{sheet_name} row {row_number}: {column} is {value.strip()}")
+            elif not valid:
+                report.error(f"{sheet_name} row {row_number}: {column} {value!r} is not a number")
+            values[column] = number
+
+        quantity, rate, amount = values['quantity'], values['rate'], values['amount']
+        if quantity is None and rate is None and amount is None:
+            continue
+        item_count += 1
+        if amount is not None:
+            computed_total += amount
+        if None not in (quantity, rate, amount) and not _close(quantity * rate, amount):
+            report.warning(f"{sheet_name} row {row_number}: amount {amount:g} != "
+                           f"quantity {quantity:g} x rate {rate:g}")
+
+    report.items[sheet_name] = item_count
+    report.totals[sheet_name] = round(computed_total, 2)
+    if stated_total is None:
+        return
+    number, valid = _number(stated_total)
+    if not valid or number is None:
+        # A broken total under no items does not stop processing the bill
+        if item_count:
+            report.error(f"{sheet_name}: total is {stated_total!r}")
+        else:
+            report.warning(f"{sheet_name}: total is {stated_total!r} (sheet has no items)")
+    elif not _close(number, computed_total):
+        report.error(f"{sheet_name}: stated total {number:g} != sum of amounts {computed_total:g}")
+
+
+@instrumented()
+def validate_workbook(source: Union[str, Path, bytes, BinaryIO], name: Optional[str] = None) -> Dict[str, Any]:
+    """Validate one bill workbook without processing or rendering it.
+
+    Args:
+        source: Path, workbook bytes or a binary file object
+        name: Name to report (default: the path, else "workbook")
+
+    Returns:
+        Dictionary with file, valid, sheets, items and totals (per item sheet),
+        total_amount, errors, warnings and elapsed_ms
+    """
+    started = time.perf_counter()
+    if name is None:
+        name = str(source) if isinstance(source, (str, Path)) else 'workbook'
+    report = _Report(name)
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    try:
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    except Exception as e:
+        report.error(f"Cannot open workbook: {e}")
+        return report.as_dict(started)
+
+    try:
+        report.sheets = list(workbook.sheetnames)
+        lowered = {sheet_name: sheet_name.lower() for sheet_name in report.sheets}
+        for fragment, label in REQUIRED_SHEETS.items():
+            if not any(fragment in sheet_name for sheet_name in lowered.values()):
+                report.error(f"Missing required sheet: {label}")
+        if not any('title' in sheet_name for sheet_name in lowered.values()):
+            report.warning("No Title sheet; header fields will use defaults")
+
+        for sheet_name, lower in lowered.items():
+            is_title = 'title' in lower
+            is_items = any(fragment in lower for fragment in ('work order', 'bill', 'item', 'extra'))
+            if not (is_title or is_items):
+                continue
+            # Non-empty rows with their sheet row numbers, for messages
+            rows = [(row_number, row) for row_number, row
+                    in enumerate(workbook[sheet_name].iter_rows(values_only=True), 1)
+                    if any(cell not in (None, '') for cell in row)]
+            if is_title:
+                _check_title(rows, report)
+            elif rows:
+                _check_items(sheet_name, rows, report)
+            elif 'extra' not in lower:
+                report.error(f"{sheet_name}: sheet is empty")
+    except Exception as e:
+        report.error(f"Cannot read workbook: {e}")
+    finally:
+        workbook.close()
+    return report.as_dict(started)
+
+
+def _validate_source(source: Source) -> Dict[str, Any]:
+    if isinstance(source, tuple):
+        name, content = source
+        return validate_workbook(content, name)
+    return validate_workbook(source)
+
+
+def validate_workbooks(sources: Iterable[Source], workers: Optional[int] = VALIDATE_WORKERS,
+                       processes: bool = True) -> List[Dict[str, Any]]:
+    """Validate many workbooks in parallel.
+
+    Args:
+        sources: Paths, or (name, workbook bytes) pairs for uploads
+        workers: Pool size (default: one per CPU)
+        processes: Parse in worker processes; pass False for a few in-memory
+            uploads, where starting processes costs more than it saves
+
+    Returns:
+        validate_workbook reports, in input order
+    """
+    sources = list(sources)
+    if len(sources) <= 1:
+        return [_validate_source(source) for source in sources]
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor(max_workers=workers) as pool:
+        return list(pool.map(_validate_source, sources, chunksize=1))
+
+
+def format_report(reports: List[Dict[str, Any]]) -> str:
+    """Render validation reports as text, one line per workbook plus its issues."""
+    lines = []
+    for report in reports:
+        status = 'OK  ' if report['valid'] else 'FAIL'
+        counts = ', '.join(f"{sheet} {count}" for sheet, count in report['items'].items())
+        lines.append(f"{status} {report['file']} ({counts or 'no items'}; {report['elapsed_ms']:.0f} ms)")
+        lines.extend(f"     error: {message}" for message in report['errors'])
+        lines.extend(f"     warning: {message}" for message in report['warnings'])
+    valid = sum(1 for report in reports if report['valid'])
+    lines.append(f"{valid}/{len(reports)} workbook(s) valid")
+    return '\n'.join(lines)
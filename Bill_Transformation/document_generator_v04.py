@@ -1,16 +1,98 @@
+import io
 import os
 import tempfile
 import logging
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, TemplateNotFound
 import pdfkit
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 from queue import Queue
 import time
 import zipfile
 
+import pandas as pd
+
+from bill_items import build_bill_context, build_item_table, compute_deviation, parse_numeric
+from instrumentation import instrumented
+
+# Document types rendered by DocumentGeneratorV04, in output order
+TEMPLATE_DOCUMENTS = {
+    'first_page': 'first_page.html',
+    'deviation_statement': 'deviation_statement.html',
+    'extra_items': 'extra_items.html',
+    'certificate_ii': 'certificate_ii.html',
+    'certificate_iii': 'certificate_iii.html',
+    'note_sheet': 'note_sheet.html',
+    'bill_template': 'bill_template.html',
+    'last_page': 'last_page.html'
+}
+
+# Template engine configuration (overridable through the environment)
+TEMPLATE_AUTO_RELOAD = os.environ.get('BILL_TEMPLATE_AUTO_RELOAD', '0').lower() in ('1', 'true', 'yes')
+TEMPLATE_CACHE_DIR = os.environ.get(
+    'BILL_TEMPLATE_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'bill_v04_jinja_cache')
+)
+
+_jinja_envs = {}
+_preloaded_templates = {}
+_jinja_lock = threading.Lock()
+
+
+def get_jinja_environment(templates_dir):
+    """Return the process-wide Jinja2 environment for a templates directory.
+
+    Compiled templates are persisted with a FileSystemBytecodeCache so that
+    new processes skip parsing as well; with auto reload disabled Jinja never
+    stats the template files again after the first load.
+    """
+    templates_dir = os.path.abspath(templates_dir)
+    with _jinja_lock:
+        env = _jinja_envs.get(templates_dir)
+        if env is None:
+            bytecode_cache = None
+            try:
+                os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+            except OSError as e:
+                logging.getLogger(__name__).warning(f"Template bytecode cache disabled: {e}")
+            env = Environment(
+                loader=FileSystemLoader(templates_dir),
+                trim_blocks=True,
+                lstrip_blocks=True,
+                auto_reload=TEMPLATE_AUTO_RELOAD,
+                bytecode_cache=bytecode_cache,
+                cache_size=-1
+            )
+            _jinja_envs[templates_dir] = env
+        return env
+
+
+def preload_templates(templates_dir):
+    """Compile every document template once per process.
+
+    Returns a mapping of document type to compiled template; templates that
+    do not exist are left out (and reported once, here).
+    """
+    templates_dir = os.path.abspath(templates_dir)
+    with _jinja_lock:
+        templates = _preloaded_templates.get(templates_dir)
+    if templates is not None:
+        return templates
+
+    env = get_jinja_environment(templates_dir)
+    templates = {}
+    for doc_type, template_name in TEMPLATE_DOCUMENTS.items():
+        try:
+            templates[doc_type] = env.get_template(template_name)
+        except TemplateNotFound:
+            logging.getLogger(__name__).warning(f"Template not found: {template_name}")
+
+    with _jinja_lock:
+        return _preloaded_templates.setdefault(templates_dir, templates)
+
+
 class WKHTMLTOPDFPool:
     _instance = None
     _lock = threading.Lock()
@@ -67,17 +149,15 @@ class WKHTMLTOPDFPool:
 class DocumentGeneratorV04:
     """Generate V04 compliant documents from processed Excel data"""
     
-    def __init__(self):
+    def __init__(self, output_dir=None):
         self.logger = logging.getLogger(__name__)
         self.templates_dir = os.path.join(os.getcwd(), 'templates')
-        self.output_dir = tempfile.mkdtemp(prefix='bill_v04_')
+        # Created lazily: the in-memory pipeline never needs a directory
+        self._output_dir = output_dir
         
-        # Setup Jinja2 environment
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(self.templates_dir),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        # Shared Jinja2 environment; templates are compiled once per process
+        self.jinja_env = get_jinja_environment(self.templates_dir)
+        self.templates = preload_templates(self.templates_dir)
         
         # Default generation flags
         self.generate_html = True
@@ -89,37 +169,30 @@ class DocumentGeneratorV04:
         self.pdf_pool = WKHTMLTOPDFPool(pool_size=4)
         self.pdf_timeout = 10  # seconds per PDF generation
     
+    @property
+    def output_dir(self):
+        """Directory for on-disk output, created on first use"""
+        if self._output_dir is None:
+            self._output_dir = tempfile.mkdtemp(prefix='bill_v04_')
+        return self._output_dir
+    
+    @output_dir.setter
+    def output_dir(self, value):
+        self._output_dir = value
+    
+    @instrumented()
     def generate_all_documents(self, data, reverse_font=False):
-        """Generate all document types with optimized performance"""
+        """Generate all document types and write them to the output directory"""
         start_time = time.time()
-        generated_files = []
         
         try:
-            # Generate HTML in parallel
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                html_future = executor.submit(self._generate_html_documents, data, reverse_font)
-                
-                # Start other generations in parallel
-                futures = {
-                    'html': html_future
-                }
-                
-                # Wait for HTML to be ready before starting PDF generation
-                html_files = html_future.result()
-                
-                if self.generate_pdf and html_files:
-                    futures['pdf'] = executor.submit(self._generate_pdf_documents, html_files)
-                
-                # Wait for all futures to complete
-                for future in as_completed(futures.values()):
-                    result = future.result()
-                    if isinstance(result, list):
-                        generated_files.extend(result)
+            documents = self.render_documents(data, reverse_font)
+            generated_files = self.save_documents(documents)
             
             # Generate ZIP if we have files
-            if generated_files:
-                zip_path = self._generate_zip_archive(generated_files)
-                if zip_path:
+            if documents:
+                zip_path = os.path.join(self.output_dir, 'billing_documents.zip')
+                if self.write_zip(documents, zip_path):
                     generated_files.append(zip_path)
             
             elapsed = time.time() - start_time
@@ -130,44 +203,109 @@ class DocumentGeneratorV04:
             self.logger.error(f"Error in document generation: {e}")
             raise
     
-    def _generate_html_documents(self, data, reverse_font):
-        """Generate all HTML documents"""
-        html_files = []
-        
-        # Document types to generate
-        documents = {
-            'first_page': 'first_page.html',
-            'deviation_statement': 'deviation_statement.html',
-            'extra_items': 'extra_items.html',
-            'certificate_ii': 'certificate_ii.html',
-            'certificate_iii': 'certificate_iii.html',
-            'note_sheet': 'note_sheet.html',
-            'bill_template': 'bill_template.html',
-            'last_page': 'last_page.html'
-        }
-        
-        for doc_type, template_name in documents.items():
+    @instrumented()
+    def render_documents(self, data, reverse_font=False):
+        """Render all documents in memory.
+        
+        Returns an ordered mapping of file name to file content (bytes). HTML
+        is piped straight to wkhtmltopdf, so nothing touches the filesystem.
+        """
+        start_time = time.time()
+        documents = {}
+        
+        html_documents = self._render_html_documents(data, reverse_font)
+        
+        pdf_documents = {}
+        if self.generate_pdf and html_documents:
+            for doc_type, html_bytes in html_documents.items():
+                pdf_bytes = self._html_to_pdf_bytes(html_bytes, doc_type)
+                if pdf_bytes:
+                    pdf_documents[doc_type] = pdf_bytes
+        
+        if self.generate_html:
+            for doc_type, html_bytes in html_documents.items():
+                documents[f'{doc_type}.html'] = html_bytes
+        for doc_type, pdf_bytes in pdf_documents.items():
+            documents[f'{doc_type}.pdf'] = pdf_bytes
+        
+        elapsed = time.time() - start_time
+        self.logger.info(f"Rendered {len(documents)} documents in memory in {elapsed:.2f} seconds")
+        return documents
+    
+    @instrumented()
+    def generate_zip_bytes(self, data, reverse_font=False, prefix=''):
+        """Render all documents and return them as an in-memory ZIP archive"""
+        buffer = io.BytesIO()
+        self.write_zip(self.render_documents(data, reverse_font), buffer, prefix)
+        return buffer.getvalue()
+    
+    @instrumented()
+    def write_zip(self, documents, target, prefix=''):
+        """Stream rendered documents into a ZIP archive.
+        
+        Args:
+            documents: Mapping of file name to bytes, as returned by render_documents
+            target: Path of the archive, or an open binary file-like object
+            prefix: Optional prefix added to every archive member name
+            
+        Returns:
+            True if the archive was written
+        """
+        if not documents:
+            self.logger.warning("No documents provided for ZIP archive")
+            return False
+        
+        try:
+            with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                for name, content in documents.items():
+                    zipf.writestr(f'{prefix}{name}', content)
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error creating ZIP archive: {e}")
+            return False
+    
+    @instrumented()
+    def save_documents(self, documents, output_dir=None):
+        """Write rendered documents to disk and return the file paths"""
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        
+        saved_files = []
+        for name, content in documents.items():
+            output_path = os.path.join(output_dir, name)
+            with open(output_path, 'wb') as f:
+                f.write(content)
+            saved_files.append(output_path)
+        
+        return saved_files
+    
+    @instrumented()
+    def _render_html_documents(self, data, reverse_font):
+        """Render all HTML documents, returning a mapping of document type to UTF-8 bytes"""
+        html_documents = {}
+        
+        # Derived figures are computed once per bill and shared by every template
+        bill_context = build_bill_context(data)
+        deviation_items = data.get('deviation_items') or self._deviation_table_to_items(
+            bill_context['deviation_table']
+        )
+        
+        for doc_type, template in self.templates.items():
             try:
-                # Check if template exists
-                template_path = os.path.join(self.templates_dir, template_name)
-                if not os.path.exists(template_path):
-                    self.logger.warning(f"Template not found: {template_name}")
-                    continue
-                
-                # Load template
-                template = self.jinja_env.get_template(template_name)
+                # Pick up edited templates when auto reload is enabled
+                if TEMPLATE_AUTO_RELOAD:
+                    template = self.jinja_env.get_template(TEMPLATE_DOCUMENTS[doc_type])
                 
                 # Prepare template-specific data
                 template_data = data.copy()
+                for key, value in bill_context.items():
+                    template_data.setdefault(key, value)
                 
                 # For deviation statement, ensure items are properly structured
                 if doc_type == 'deviation_statement':
-                    if 'deviation_items' in data and data['deviation_items']:
-                        template_data['items'] = data['deviation_items']
-                    else:
-                        template_data['items'] = self._convert_bill_items_to_deviation(
-                            data.get('items', [])
-                        )
+                    template_data['deviation_items'] = deviation_items
+                    template_data['items'] = deviation_items
                 
                 # For extra_items template, use extra_items data
                 elif doc_type == 'extra_items':
@@ -185,118 +323,92 @@ class DocumentGeneratorV04:
                     if k not in ['data', 'reverse_font', 'generation_date', 'items']:
                         render_args[k] = v
                         
-                html_content = template.render(**render_args)
-                
-                # Save HTML file
-                output_path = os.path.join(self.output_dir, f'{doc_type}.html')
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                
-                html_files.append(output_path)
+                html_documents[doc_type] = template.render(**render_args).encode('utf-8')
                 self.logger.info(f"Generated HTML: {doc_type}")
                 
             except Exception as e:
                 self.logger.error(f"Error generating {doc_type} HTML: {e}")
                 continue
         
-        return html_files
+        return html_documents
+    
+    def _generate_html_documents(self, data, reverse_font):
+        """Generate all HTML documents on disk"""
+        html_documents = self._render_html_documents(data, reverse_font)
+        return self.save_documents(
+            {f'{doc_type}.html': html for doc_type, html in html_documents.items()}
+        )
+    
+    @instrumented()
+    def _html_to_pdf_bytes(self, html_bytes, name='document'):
+        """Convert HTML bytes to PDF bytes by piping them through wkhtmltopdf"""
+        cmd = [
+            'wkhtmltopdf',
+            '--quiet',
+            '--enable-javascript',
+            '--javascript-delay', '1000',
+            '--no-stop-slow-scripts',
+            '--disable-smart-shrinking',
+            '--margin-top', '10mm',
+            '--margin-bottom', '10mm',
+            '--margin-left', '10mm',
+            '--margin-right', '10mm',
+            '-',
+            '-'
+        ]
+        
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+        except OSError as e:
+            self.logger.error(f"Could not start wkhtmltopdf for {name}: {e}")
+            return None
+        
+        try:
+            stdout, stderr = process.communicate(input=html_bytes, timeout=self.pdf_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            self.logger.error(f"PDF generation timed out for {name}")
+            return None
+        
+        if process.returncode != 0 or not stdout:
+            error_msg = stderr.decode('utf-8', errors='replace')
+            self.logger.error(f"PDF generation failed for {name}: {error_msg}")
+            return None
+        
+        self.logger.info(f"Successfully generated PDF: {name}")
+        return stdout
     
     def _generate_pdf_documents(self, html_files):
-        """Generate PDF documents from HTML files with robust error handling and process management"""
+        """Generate PDF documents next to existing HTML files"""
         if not html_files:
             self.logger.warning("No HTML files provided for PDF generation")
             return []
 
         pdf_files = []
         start_time = time.time()
-        processes = []
-        temp_files = []
-
-        def cleanup():
-            """Clean up any remaining processes and temporary files"""
-            # Terminate any running processes
-            for process in processes:
-                try:
-                    if process.poll() is None:  # Process is still running
-                        process.terminate()
-                        try:
-                            process.wait(timeout=2)
-                        except:
-                            process.kill()
-                except:
-                    pass
-            
-            # Clean up temporary files
-            for temp_file in temp_files:
-                try:
-                    if os.path.exists(temp_file):
-                        os.unlink(temp_file)
-                except:
-                    pass
 
-        try:
-            # Process files sequentially to avoid resource exhaustion
-            for html_path in html_files:
-                try:
-                    output_path = os.path.splitext(html_path)[0] + '.pdf'
-                    
-                    # Create a temporary file for the HTML content
-                    with tempfile.NamedTemporaryFile(mode='w+b', suffix='.html', delete=False) as f:
-                        with open(html_path, 'rb') as src:
-                            f.write(src.read())
-                        temp_html = f.name
-                        temp_files.append(temp_html)
-
-                    # Prepare command
-                    cmd = [
-                        'wkhtmltopdf',
-                        '--quiet',
-                        '--enable-javascript',
-                        '--javascript-delay', '1000',
-                        '--no-stop-slow-scripts',
-                        '--disable-smart-shrinking',
-                        '--margin-top', '10mm',
-                        '--margin-bottom', '10mm',
-                        '--margin-left', '10mm',
-                        '--margin-right', '10mm',
-                        temp_html,
-                        output_path
-                    ]
-
-                    # Start the process
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-                    )
-                    processes.append(process)
-
-                    # Wait with timeout
-                    try:
-                        stdout, stderr = process.communicate(timeout=self.pdf_timeout)
-                        if process.returncode != 0:
-                            error_msg = stderr.decode('utf-8', errors='replace')
-                            self.logger.error(f"PDF generation failed for {html_path}: {error_msg}")
-                            continue
-                        
-                        if os.path.exists(output_path):
-                            pdf_files.append(output_path)
-                            self.logger.info(f"Successfully generated PDF: {output_path}")
-                        else:
-                            self.logger.error(f"PDF was not created: {output_path}")
-                            
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                        self.logger.error(f"PDF generation timed out for {html_path}")
-                        continue
-
-                except Exception as e:
-                    self.logger.error(f"Error processing {html_path}: {str(e)}")
+        for html_path in html_files:
+            try:
+                with open(html_path, 'rb') as f:
+                    pdf_bytes = self._html_to_pdf_bytes(f.read(), html_path)
+                if not pdf_bytes:
                     continue
+                
+                output_path = os.path.splitext(html_path)[0] + '.pdf'
+                with open(output_path, 'wb') as f:
+                    f.write(pdf_bytes)
+                pdf_files.append(output_path)
 
-        finally:
-            cleanup()
+            except Exception as e:
+                self.logger.error(f"Error processing {html_path}: {str(e)}")
+                continue
 
         elapsed = time.time() - start_time
         success_rate = (len(pdf_files) / len(html_files)) * 100 if html_files else 0
@@ -335,20 +447,16 @@ class DocumentGeneratorV04:
     
     def _convert_bill_items_to_deviation(self, items):
         """Convert regular bill items to deviation format"""
-        deviation_items = []
-        
-        for item in items:
-            deviation_item = {
-                'description': item.get('description', 'Item'),
-                'original_qty': item.get('quantity', '0'),
-                'revised_qty': item.get('quantity', '0'),
-                'difference': '0',
-                'rate': item.get('rate', '0'),
-                'amount': item.get('amount', '0')
-            }
-            deviation_items.append(deviation_item)
-        
-        return deviation_items
+        return self._deviation_table_to_items(compute_deviation(build_item_table(items)))
+    
+    def _deviation_table_to_items(self, deviation):
+        """Deviation rows for templates and DOCX tables (both key sets)"""
+        records = deviation.assign(
+            original_qty=deviation['qty_wo'],
+            revised_qty=deviation['qty_bill'],
+            amount=deviation['amt_bill']
+        )
+        return records.to_dict('records')
     
     def _add_project_info(self, doc, data):
         """Add project information to DOCX"""
@@ -581,15 +689,14 @@ This certifies that all work has been completed satisfactorily, quality complian
         total = 0.0
         
         # Calculate from bill summary
-        if 'bill_summary' in data and hasattr(data['bill_summary'], 'sum'):
+        if isinstance(data.get('bill_summary'), pd.DataFrame):
             df = data['bill_summary']
             # Look for amount columns
             amount_cols = [col for col in df.columns if 'amount' in str(col).lower()]
             for col in amount_cols:
-                try:
-                    total += df[col].sum()
-                except:
-                    pass
+                total += float(pd.Series(parse_numeric(df[col])).sum())
+        elif isinstance(data.get('item_table'), pd.DataFrame):
+            total = float(data['item_table']['amount'].sum())
         
         # Add premium
         premium_pct = data.get('premium_percentage', 0)
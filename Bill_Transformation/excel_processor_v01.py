@@ -1,14 +1,72 @@
+import numpy as np
 import pandas as pd
 import openpyxl
 import logging
-import re
 import os
 import tempfile
 import shutil
 from datetime import datetime
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Iterator, Mapping, Union, Optional
 from pathlib import Path
 
+from bill_items import build_item_table, parse_numeric
+from instrumentation import instrumented
+
+
+def sheet_to_dataframe(sheet) -> pd.DataFrame:
+    """Cell values of a worksheet as a DataFrame, without empty rows and columns"""
+    data = [row for row in sheet.iter_rows(values_only=True)]
+    if not data:
+        return pd.DataFrame()
+    return pd.DataFrame(data).dropna(how='all').dropna(axis=1, how='all')
+
+
+class LazySheets(Mapping):
+    """
+    Sheet name -> DataFrame view of a processed workbook, read on access.
+
+    Processed bills keep this instead of a DataFrame per sheet, so a batch
+    holds only the extracted fields. Each lookup re-reads the sheet from the
+    source (a path or the caller's file object); nothing is cached.
+    """
+
+    def __init__(self, source, sheet_names: List[str]):
+        self._source = source
+        self._sheet_names = list(sheet_names)
+
+    def __getitem__(self, sheet_name: str) -> pd.DataFrame:
+        if sheet_name not in self._sheet_names:
+            raise KeyError(sheet_name)
+        if hasattr(self._source, 'seek'):
+            self._source.seek(0)
+        workbook = openpyxl.load_workbook(self._source, read_only=True, data_only=True)
+        try:
+            return sheet_to_dataframe(workbook[sheet_name])
+        finally:
+            workbook.close()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sheet_names)
+
+    def __len__(self) -> int:
+        return len(self._sheet_names)
+
+    def __repr__(self) -> str:
+        return f"LazySheets({self._sheet_names!r})"
+
+
+# Fields of a processed bill kept for batch summaries
+SUMMARY_FIELDS = ('source_filename', 'file_index', 'bill_number', 'bill_date',
+                  'project_name', 'contractor_name', 'total_amount')
+
+
+def summarize_bill(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Small per-bill record for batch results, so item lists and tables can be freed"""
+    summary = {key: data[key] for key in SUMMARY_FIELDS if key in data}
+    summary['item_count'] = len(data.get('item_table', ()))
+    return summary
+
+
 class ExcelProcessorV01:
     """
     Enhanced V01 Excel Processor with batch processing and V04 improvements.
@@ -305,45 +363,52 @@ class ExcelProcessorV01:
         except Exception as e:
             self.logger.error(f"Error generating batch summary: {e}")
     
+    @instrumented()
     def process_excel(self, file_buffer):
-        """Process uploaded Excel file and extract all relevant data"""
+        """Process uploaded Excel file and extract all relevant data
+        
+        The result holds the extracted fields, item lists and the typed item
+        table. Sheet DataFrames are only built while extracting; raw sheets
+        stay available through data['sheets'] (a LazySheets), which re-reads
+        them from file_buffer on access.
+        """
         try:
-            # Load workbook
-            workbook = openpyxl.load_workbook(file_buffer, data_only=True)
-            
-            # Initialize data structure
-            data = {
-                'project_name': '',
-                'contractor_name': '',
-                'bill_number': '',
-                'bill_date': '',
-                'premium_percentage': 0.0,
-                'items': [],
-                'deviation_items': [],
-                'extra_items': [],
-                'bill_summary': None,
-                'header_data': [],
-                'data_frames': {},
-                'raw_data': {}
-            }
+            # Stream the workbook; each sheet's DataFrame is dropped after extraction
+            workbook = openpyxl.load_workbook(file_buffer, read_only=True, data_only=True)
+            try:
+                # Initialize data structure
+                data = {
+                    'project_name': '',
+                    'contractor_name': '',
+                    'bill_number': '',
+                    'bill_date': '',
+                    'premium_percentage': 0.0,
+                    'items': [],
+                    'work_order_items': [],
+                    'deviation_items': [],
+                    'extra_items': [],
+                    'bill_summary': None,
+                    'header_data': [],
+                    'sheets': LazySheets(file_buffer, workbook.sheetnames)
+                }
             
-            # Process each sheet
-            for sheet_name in workbook.sheetnames:
-                self.logger.info(f"Processing sheet: {sheet_name}")
-                sheet = workbook[sheet_name]
+                # Process each sheet
+                for sheet_name in workbook.sheetnames:
+                    self.logger.info(f"Processing sheet: {sheet_name}")
+                    sheet = workbook[sheet_name]
                 
-                # Convert sheet to DataFrame
-                df = self._sheet_to_dataframe(sheet)
-                data['data_frames'][sheet_name] = df
+                    # Convert sheet to DataFrame
+                    df = self._sheet_to_dataframe(sheet)
                 
-                # Extract specific data based on sheet content
-                self._extract_sheet_data(sheet, df, data, sheet_name)
-            
-            # Post-process and validate data
-            self._post_process_data(data)
+                    # Extract specific data based on sheet content
+                    self._extract_sheet_data(sheet, df, data, sheet_name)
             
-            workbook.close()
-            return data
+                # Post-process and validate data
+                self._post_process_data(data)
+                
+                return data
+            finally:
+                workbook.close()
             
         except Exception as e:
             self.logger.error(f"Error processing Excel file: {e}")
@@ -352,22 +417,7 @@ class ExcelProcessorV01:
     def _sheet_to_dataframe(self, sheet):
         """Convert Excel sheet to pandas DataFrame"""
         try:
-            # Get all values from sheet
-            data = []
-            for row in sheet.iter_rows(values_only=True):
-                data.append(row)
-            
-            if not data:
-                return pd.DataFrame()
-            
-            # Create DataFrame
-            df = pd.DataFrame(data)
-            
-            # Clean up - remove completely empty rows and columns
-            df = df.dropna(how='all').dropna(axis=1, how='all')
-            
-            return df
-            
+            return sheet_to_dataframe(sheet)
         except Exception as e:
             self.logger.error(f"Error converting sheet to DataFrame: {e}")
             return pd.DataFrame()
@@ -378,8 +428,14 @@ class ExcelProcessorV01:
         # Look for header information
         self._extract_header_info(df, data)
         
+        # Look for work order items (reference quantities for deviation)
+        if 'work order' in sheet_name.lower():
+            work_order_items = self._extract_bill_items(df)
+            if work_order_items:
+                data['work_order_items'].extend(work_order_items)
+        
         # Look for bill items
-        if 'bill' in sheet_name.lower() or 'item' in sheet_name.lower():
+        elif 'bill' in sheet_name.lower() or 'item' in sheet_name.lower():
             items = self._extract_bill_items(df)
             if items:
                 data['items'].extend(items)
@@ -562,6 +618,9 @@ class ExcelProcessorV01:
         if not data['bill_date']:
             data['bill_date'] = datetime.now().strftime('%Y-%m-%d')
         
+        # Typed item table, parsed once and shared by all document templates
+        data['item_table'] = build_item_table(data['items'], data['work_order_items'])
+        
         # Calculate totals
         data['total_amount'] = self._calculate_total_amount(data)
         
@@ -571,36 +630,12 @@ class ExcelProcessorV01:
     
     def _calculate_total_amount(self, data):
         """Calculate total amount from all items"""
-        total = 0.0
-        
-        # Sum from regular items
-        for item in data['items']:
-            amount_str = item.get('amount', '0')
-            try:
-                amount = float(re.sub(r'[^\d.-]', '', str(amount_str)))
-                total += amount
-            except:
-                pass
-        
-        # Sum from deviation items
-        for item in data['deviation_items']:
-            amount_str = item.get('amount', '0')
-            try:
-                amount = float(re.sub(r'[^\d.-]', '', str(amount_str)))
-                total += amount
-            except:
-                pass
-        
-        # Sum from extra items
-        for item in data['extra_items']:
-            amount_str = item.get('amount', '0')
-            try:
-                amount = float(re.sub(r'[^\d.-]', '', str(amount_str)))
-                total += amount
-            except:
-                pass
-        
-        return total
+        amounts = parse_numeric(
+            item.get('amount', '0')
+            for key in ('items', 'deviation_items', 'extra_items')
+            for item in data[key]
+        )
+        return float(np.nansum(amounts))
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the typed bill item table and its vectorized deviation arithmetic.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from bill_items import (
+    build_bill_context,
+    build_item_table,
+    compute_deviation,
+    parse_numeric,
+    summarize_deviation,
+)
+
+
+def create_test_items():
+    """Bill and work order items as the Excel processor returns them (strings)"""
+    work_order_items = [
+        {'description': 'Description', 'unit': 'Unit', 'quantity': 'Quantity', 'rate': 'Rate', 'amount': 'Amount'},
+        {'description': 'Short point', 'unit': 'P. point', 'quantity': '50', 'rate': '256', 'amount': '12800'},
+        {'description': 'On board', 'unit': 'P. point', 'quantity': '100', 'rate': '136', 'amount': '13600'},
+    ]
+    bill_items = [
+        {'description': 'Description', 'unit': 'Unit', 'quantity': 'Quantity', 'rate': 'Rate', 'amount': 'Amount'},
+        {'description': 'Short point', 'unit': 'P. point', 'quantity': '52', 'rate': '256', 'amount': '13,312'},
+        {'description': 'On board', 'unit': 'P. point', 'quantity': '98', 'rate': '136', 'amount': '₹ 13328'},
+    ]
+    return bill_items, work_order_items
+
+
+def test_parse_numeric():
+    values = parse_numeric(['1,234.50', '₹ 10', None, 'N/A', 7])
+    assert values[0] == 1234.5
+    assert values[1] == 10.0
+    assert values[4] == 7.0
+    assert all(v != v for v in values[2:4])  # NaN
+
+
+def test_build_item_table_drops_header_and_matches_work_order():
+    bill_items, work_order_items = create_test_items()
+    table = build_item_table(bill_items, work_order_items)
+
+    assert list(table['description']) == ['Short point', 'On board']
+    assert list(table['qty_wo']) == [50.0, 100.0]
+    assert list(table['qty_bill']) == [52.0, 98.0]
+    assert list(table['amount']) == [13312.0, 13328.0]
+
+
+def test_deviation_and_premium():
+    bill_items, work_order_items = create_test_items()
+    deviation = compute_deviation(build_item_table(bill_items, work_order_items))
+
+    assert list(deviation['excess_qty']) == [2.0, 0.0]
+    assert list(deviation['saving_qty']) == [0.0, 2.0]
+    assert list(deviation['excess_amt']) == [512.0, 0.0]
+    assert list(deviation['saving_amt']) == [0.0, 272.0]
+
+    summary = summarize_deviation(deviation, premium_percentage=4, premium_type='above')
+    assert summary['work_order_total'] == 26400
+    assert summary['executed_total'] == 26640
+    assert summary['tender_premium_f'] == 1056
+    assert summary['grand_total_f'] == 27456
+    assert summary['net_difference'] == round((26640 + 1066) - 27456)
+
+    below = summarize_deviation(deviation, premium_percentage=4, premium_type='below')
+    assert below['tender_premium_f'] == -1056
+
+
+def test_build_bill_context_without_work_order():
+    bill_items, _ = create_test_items()
+    context = build_bill_context({'items': bill_items, 'premium_percentage': 10})
+
+    # Without a work order the executed quantities are the reference
+    assert context['deviation_summary']['overall_excess'] == 0
+    assert context['deviation_summary']['overall_saving'] == 0
+    assert context['bill_total'] == 26640.0
+    assert context['bill_premium'] == 2664
+    assert context['tender_premium_percent'] == 0.1
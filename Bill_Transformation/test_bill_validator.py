@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the dry-run bill workbook validator.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import openpyxl
+
+sys.path.append(str(Path(__file__).parent))
+from bill_validator import validate_workbook, validate_workbooks
+
+HEADER = ['Item', 'Description', 'Unit', 'Quantity', 'Rate', 'Amount', 'BSR']
+
+
+def create_workbook(bill_rows=None, sheets=('Title', 'Work Order', 'Bill Quantity')):
+    """Workbook bytes in the V01 layout with two items and a total row"""
+    items = [
+        [1, 'Short point', 'P. point', 50, 256, 12800, '1.5.1'],
+        [2, 'On board', 'P. point', 100, 136, 13600, '1.7.1'],
+        [None, 'Total', None, None, None, 26400, None],
+    ]
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for name in sheets:
+        sheet = workbook.create_sheet(name)
+        if name == 'Title':
+            sheet.append(['Bill Number', 'First'])
+            sheet.append(['Name of Contractor or supplier : ', 'M/s. Test Traders'])
+            sheet.append(['Name of Work ;- ', 'Electric repair work'])
+            continue
+        sheet.append(HEADER)
+        for row in (bill_rows if name == 'Bill Quantity' and bill_rows is not None else items):
+            sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_valid_workbook():
+    report = validate_workbook(create_workbook(), 'bill.xlsx')
+
+    assert report['valid'], report['errors']
+    assert report['file'] == 'bill.xlsx'
+    assert report['items'] == {'Work Order': 2, 'Bill Quantity': 2}
+    assert report['total_amount'] == 26400.0
+    assert report['warnings'] == []
+
+
+def test_missing_sheet_and_bad_cells():
+    rows = [
+        [1, 'Short point', 'P. point', 'fifty', 256, 12800, '1.5.1'],
+        [2, 'On board', 'P. point', 100, 136, 9999, '1.7.1'],
+        [None, 'Total', None, None, None, '#REF!', None],
+    ]
+    report = validate_workbook(create_workbook(rows, sheets=('Bill Quantity',)), 'bad.xlsx')
+
+    assert not report['valid']
+    assert 'Missing required sheet: Work Order' in report['errors']
+    assert "Bill Quantity row 2: quantity 'fifty' is not a number" in report['errors']
+    assert "Bill Quantity: total is '#REF!'" in report['errors']
+    assert 'Bill Quantity row 3: amount 9999 != quantity 100 x rate 136' in report['warnings']
+
+
+def test_broken_total_without_items_is_a_warning():
+    rows = [[None, 'Total', None, None, None, '#REF!', None]]
+    report = validate_workbook(create_workbook(rows), 'empty.xlsx')
+
+    assert report['valid'], report['errors']
+    assert report['items']['Bill Quantity'] == 0
+    assert report['warnings'] == ["Bill Quantity: total is '#REF!' (sheet has no items)"]
+
+    sample = Path(__file__).parent / 'test_files' / 'FirstFINALnoExtra.xlsx'
+    assert validate_workbook(str(sample))['valid']
+
+
+def test_stated_total_mismatch():
+    rows = [
+        [1, 'Short point', 'P. point', 50, 256, 12800, '1.5.1'],
+        [None, 'Total', None, None, None, 20000, None],
+    ]
+    report = validate_workbook(create_workbook(rows), 'total.xlsx')
+
+    assert report['errors'] == ['Bill Quantity: stated total 20000 != sum of amounts 12800']
+
+
+def test_unreadable_file_and_batch_order():
+    reports = validate_workbooks(
+        [('a.xlsx', create_workbook()), ('b.xlsx', b'not a workbook')], processes=False)
+
+    assert [report['file'] for report in reports] == ['a.xlsx', 'b.xlsx']
+    assert reports[0]['valid']
+    assert not reports[1]['valid']
+    assert reports[1]['errors'][0].startswith('Cannot open workbook')
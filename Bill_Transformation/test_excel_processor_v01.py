@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact result of the V01 Excel processor.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+from excel_processor_v01 import ExcelProcessorV01, summarize_bill
+
+SAMPLE_BILL = Path(__file__).parent / 'sample_bill.xlsx'
+
+
+def test_result_keeps_extracted_fields_and_lazy_sheets():
+    data = ExcelProcessorV01().process_excel(io.BytesIO(SAMPLE_BILL.read_bytes()))
+
+    assert 'data_frames' not in data and 'raw_data' not in data
+    assert isinstance(data['item_table'], pd.DataFrame)
+    assert list(data['sheets']) == ['Title', 'Work Order', 'Bill Quantity', 'Extra Items']
+
+    # Raw sheets are read back from the source on access
+    work_order = data['sheets']['Work Order']
+    assert work_order.iloc[0].tolist()[:6] == ['Item', 'Description', 'Unit', 'Quantity', 'Rate', 'Amount']
+
+
+def test_summarize_bill():
+    data = ExcelProcessorV01().process_excel(str(SAMPLE_BILL))
+    data['source_filename'] = 'sample_bill.xlsx'
+    summary = summarize_bill(data)
+
+    assert summary['source_filename'] == 'sample_bill.xlsx'
+    assert summary['total_amount'] == data['total_amount']
+    assert summary['item_count'] == len(data['item_table'])
+    assert 'items' not in summary
@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import json
 import os
 from datetime import datetime
@@ -10,24 +9,27 @@ from pathlib import Path
 DB_PATH = Path(__file__).parent / "bidder_database.json"
 
 # Import custom modules
-from theme import apply_custom_css
+from logging_config import configure_logging
+from theme import apply_custom_css, clear_style_cache
 from ui_components import create_header, create_footer, show_balloons, create_info_card
 from tender_processor import TenderProcessor
-from excel_parser import ExcelParser
 from bidder_manager import BidderManager
-from report_generator import ReportGenerator
-from document_generator import DocumentGenerator
-from comparative_statement_generator import ComparativeStatementGenerator
-from letter_acceptance_generator import LetterAcceptanceGenerator
-from work_order_generator import WorkOrderGenerator
-from scrutiny_sheet_generator import ScrutinySheetGenerator
 from date_utils import DateUtils
-from pdf_generator import PDFGenerator
-from latex_pdf_generator import LatexPDFGenerator
-from zip_generator import ZipGenerator
+from bidder_ranking import select_lowest
+# Generators (and their pandas/reportlab/docx/WeasyPrint backends) load on first use
+from generator_registry import clear_generators, get_generator
+from artifact_cache import get_artifact_cache
+from instrumentation import get_recorder
+from job_queue import get_job_queue, QUEUED, RUNNING, FAILED
+from report_jobs import prepare_work_info
+from tender_history import get_tender_history
+from session_store import SNAPSHOT_KEYS, get_session_store, new_session_token
+
+# Seconds between progress refreshes of a running background job
+JOB_POLL_SECONDS = 1.0
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_logging()
 
 # Page configuration
 st.set_page_config(
@@ -45,6 +47,7 @@ def main():
     
     create_header()
     
+    restore_session()
     if 'current_work' not in st.session_state:
         st.session_state.current_work = None
     if 'bidders' not in st.session_state:
@@ -60,10 +63,13 @@ def main():
             "📄 Upload NIT Document", 
             "👥 Manage Bidders", 
             "📊 Generate Reports",
-            "📝 Generate Documents"
+            "📝 Generate Documents",
+            "📈 Tender History"
         ]
     )
     
+    show_render_cache_stats()
+    
     if operation == "📄 Upload NIT Document":
         handle_nit_upload()
     elif operation == "👥 Manage Bidders":
@@ -72,9 +78,91 @@ def main():
         handle_report_generation()
     elif operation == "📝 Generate Documents":
         handle_document_generation()
+    elif operation == "📈 Tender History":
+        handle_tender_history()
+    
+    # After the page so this run's stages are included
+    show_performance_summary()
+    
+    save_session()
     
     create_footer()
 
+def restore_session():
+    """Resume the parsed work and bidders of this browser session after a refresh or restart."""
+    if 'session_token' in st.session_state:
+        return
+    
+    token = st.query_params.get('session')
+    snapshot = get_session_store().load(token) if token else None
+    if snapshot:
+        for key in SNAPSHOT_KEYS:
+            if snapshot.get(key) is not None:
+                st.session_state[key] = snapshot[key]
+        st.toast("♻️ Previous session restored")
+    else:
+        token = new_session_token()
+        st.query_params['session'] = token
+    st.session_state.session_token = token
+
+def save_session():
+    """Checkpoint the parsed work and bidders; unchanged state is not rewritten."""
+    token = st.session_state.get('session_token')
+    if not token:
+        return
+    snapshot = {key: st.session_state.get(key) for key in SNAPSHOT_KEYS}
+    if any(snapshot.values()):
+        get_session_store().save(token, snapshot)
+    else:
+        get_session_store().delete(token)
+
+def show_render_cache_stats():
+    """Show render cache counters in the sidebar."""
+    cache = get_artifact_cache()
+    stats = cache.stats()
+    with st.sidebar.expander("⚡ Render Cache"):
+        st.write(f"Hits: {stats['hits']} / {stats['hits'] + stats['misses']} "
+                 f"({stats['hit_ratio']:.0%})")
+        st.write(f"Saved: {stats['bytes_saved'] / 1024:.1f} KB")
+        if st.button("🗑️ Clear Render Cache"):
+            cache.clear()
+            st.success("✅ Render cache cleared")
+        if st.button("♻️ Reload Generators & Styles"):
+            clear_generators()
+            clear_style_cache()
+            st.success("✅ Generators and styles will be rebuilt")
+
+def show_performance_summary():
+    """Show per-stage timings recorded by the instrumentation layer in the sidebar."""
+    recorder = get_recorder()
+    summary = recorder.summary()
+    with st.sidebar.expander("⏱️ Performance"):
+        if not summary:
+            st.caption("No stages recorded yet.")
+            return
+        st.dataframe(
+            [{
+                'Stage': entry['stage'],
+                'Calls': entry['calls'],
+                'Total ms': entry['wall_ms'],
+                'Mean ms': entry['mean_wall_ms'],
+                'Max ms': entry['max_wall_ms'],
+                'CPU ms': entry['cpu_ms'],
+                'Peak RSS +KB': entry['peak_rss_delta_kb'],
+                'Output KB': round(entry['output_bytes'] / 1024, 1),
+            } for entry in summary],
+            hide_index=True
+        )
+        st.download_button(
+            "📥 Download stage log (JSON lines)",
+            data=recorder.to_jsonl(),
+            file_name=f"tender_stages_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+            mime="application/x-ndjson"
+        )
+        if st.button("🗑️ Clear Timings"):
+            recorder.clear()
+            st.rerun()
+
 def handle_nit_upload():
     """Handle NIT document upload and processing."""
     st.header("📄 Upload NIT Document")
@@ -98,7 +186,7 @@ def handle_nit_upload():
                 tmp_file.write(uploaded_file.getvalue())
                 tmp_file_path = tmp_file.name
             
-            parser = ExcelParser()
+            parser = get_generator('excel_parser')
             work_data = parser.parse_nit_excel(tmp_file_path)
             
             os.unlink(tmp_file_path)
@@ -127,6 +215,7 @@ def handle_nit_upload():
                 if work_data.get('works') and len(work_data['works']) > 1:
                     st.subheader("📋 Individual Works Details")
                     
+                    import pandas as pd
                     works_df = pd.DataFrame(work_data['works'])
                     works_df['estimated_cost_display'] = works_df['estimated_cost'].apply(lambda x: f"₹{x:,.0f}")
                     works_df['earnest_money_display'] = works_df['earnest_money'].apply(lambda x: f"₹{x:,.0f}")
@@ -213,6 +302,8 @@ def handle_bidder_management():
     
     st.info(f"📋 Available bidders in database: {len(bidder_database)}")
     
+    handle_bidder_import(selected_work, bidder_database)
+    
     st.subheader("📊 Step 2: Select Number of Bidders")
     num_bidders = st.number_input(
         f"How many bidders participated for {selected_work['name']}?", 
@@ -315,24 +406,7 @@ def handle_bidder_management():
         with col1:
             if st.button("✅ Add All Bidders", type="primary", disabled=not all_valid or len(bidder_data_list) != num_bidders):
                 st.session_state.bidders = bidder_data_list
-                
-                for bidder_data in bidder_data_list:
-                    if bidder_data['name'] in bidder_database:
-                        bidder_database[bidder_data['name']]['last_used'] = DateUtils().get_current_date()
-                    else:
-                        bidder_database[bidder_data['name']] = {
-                            'address': bidder_data['address'],
-                            'date_added': DateUtils().get_current_date(),
-                            'last_used': DateUtils().get_current_date(),
-                            'total_tenders': 1
-                        }
-                
-                try:
-                    with open('bidder_database.json', 'w', encoding='utf-8') as f:
-                        json.dump(bidder_database, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    st.warning(f"⚠️ Could not update bidder database: {str(e)}")
-                
+                update_bidder_database(bidder_database, bidder_data_list)
                 st.success(f"✅ Added {len(bidder_data_list)} bidders successfully!")
                 st.rerun()
         
@@ -358,11 +432,11 @@ def handle_bidder_management():
                 'Earnest Money (₹)': f"₹{bidder['earnest_money']}"
             })
         
+        import pandas as pd
         df = pd.DataFrame(df_data)
         st.dataframe(df, use_container_width=True)
         
-        sorted_bidders = sorted(st.session_state.bidders, key=lambda x: x['bid_amount'])
-        l1_bidder = sorted_bidders[0]
+        l1_bidder = select_lowest(st.session_state.bidders)
         st.success(f"🥇 L1 (Lowest) Bidder: {l1_bidder['name']} - ₹{l1_bidder['bid_amount']:,.2f} ({l1_bidder['percentage']:+.2f}%)")
         
         if st.button("🗑️ Clear All Bidders", type="secondary"):
@@ -370,6 +444,92 @@ def handle_bidder_management():
             st.success("✅ Cleared all bidders")
             st.rerun()
 
+def update_bidder_database(bidder_database, bidders):
+    """Mark known bidders as used and register new ones in bidder_database.json."""
+    today = DateUtils().get_current_date()
+    for bidder_data in bidders:
+        if bidder_data['name'] in bidder_database:
+            bidder_database[bidder_data['name']]['last_used'] = today
+        else:
+            bidder_database[bidder_data['name']] = {
+                'address': bidder_data['address'],
+                'date_added': today,
+                'last_used': today,
+                'total_tenders': 1
+            }
+    
+    try:
+        with open('bidder_database.json', 'w', encoding='utf-8') as f:
+            json.dump(bidder_database, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        st.warning(f"⚠️ Could not update bidder database: {str(e)}")
+
+def handle_bidder_import(selected_work, bidder_database):
+    """Add all bidders of a tender at once from a CSV, Excel or JSON sheet."""
+    with st.expander("📥 Bulk Import Bidders (CSV / Excel)"):
+        st.caption("One row per bidder with **Name** and **Percentage** columns; "
+                   "optional **Address** and **Bid Amount**. Bid amounts are computed "
+                   "from the estimated cost when not given.")
+        uploaded_file = st.file_uploader(
+            "Bidder sheet",
+            type=['csv', 'xlsx', 'xls', 'json'],
+            key="bidder_import_file"
+        )
+        if uploaded_file is None:
+            return
+        
+        from bidder_import import import_bidders
+        try:
+            result = import_bidders(
+                uploaded_file,
+                float(selected_work['estimated_cost']),
+                selected_work['earnest_money'],
+                registered=bidder_database
+            )
+        except Exception as e:
+            st.error(f"❌ Could not read bidder sheet: {str(e)}")
+            logging.error(f"Error importing bidder sheet: {e}")
+            return
+        
+        bidders = result['bidders']
+        for bidder in bidders:
+            bidder['work_item'] = selected_work['item_no']
+            bidder['work_name'] = selected_work['name']
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Valid Bidders", len(bidders))
+        with col2:
+            st.metric("Rejected Rows", len(result['errors']))
+        with col3:
+            st.metric("New to Database", len(result['new_bidders']))
+        
+        if result['errors']:
+            st.error("❌ These rows were rejected and will not be imported:")
+            st.dataframe(
+                [{'Row': error['row'], 'Bidder': error['name'], 'Error': error['error']}
+                 for error in result['errors']],
+                hide_index=True,
+                use_container_width=True
+            )
+        
+        if bidders:
+            st.dataframe(
+                [{
+                    'Bidder Name': bidder['name'],
+                    'Address': bidder['address'] or 'N/A',
+                    'Percentage (%)': f"{bidder['percentage']:+.2f}%",
+                    'Bid Amount (₹)': f"₹{bidder['bid_amount']:,.2f}"
+                } for bidder in bidders],
+                hide_index=True,
+                use_container_width=True
+            )
+            if st.button(f"✅ Use {len(bidders)} Imported Bidders", type="primary"):
+                st.session_state.bidders = bidders
+                update_bidder_database(bidder_database, bidders)
+                st.success(f"✅ Imported {len(bidders)} bidders successfully!")
+                st.rerun()
+
 def handle_report_generation():
     """Handle report generation with simultaneous generation and download."""
     st.header("📊 Generate Reports")
@@ -388,8 +548,8 @@ def handle_report_generation():
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                pdf_gen = PDFGenerator()
-                doc_gen = DocumentGenerator()
+                pdf_gen = get_generator('pdf')
+                doc_gen = get_generator('docx')
                 
                 generated_files = {}
                 
@@ -491,6 +651,52 @@ def handle_report_generation():
                 logging.error(f"Error in bulk report generation: {e}")
     # ... (rest of handle_report_generation() continues as previously provided)
 
+def _poll_job(job_id):
+    """Progress of a running job; reruns the page once it finishes."""
+    status = get_job_queue().status(job_id)
+    if status is None or status['status'] not in (QUEUED, RUNNING):
+        st.rerun()
+    st.progress(status['progress'])
+    st.text(status['message'] or "Waiting for a free worker...")
+
+def show_generation_job(state_key, results_key, title, success_message, groups):
+    """Show progress or downloads of the background job stored in session state."""
+    job_id = st.session_state.get(state_key)
+    if not job_id:
+        return
+    
+    status = get_job_queue().status(job_id)
+    if status is None:
+        del st.session_state[state_key]
+        return
+    
+    if status['status'] in (QUEUED, RUNNING):
+        # Only this fragment reruns while polling; other sessions are unaffected
+        st.fragment(_poll_job, run_every=JOB_POLL_SECONDS)(job_id)
+        return
+    
+    if status['status'] == FAILED:
+        st.error(f"❌ Error in bulk generation: {status['error']}")
+        return
+    
+    generated_files = get_job_queue().results(job_id)
+    st.session_state[results_key] = generated_files
+    st.success(success_message)
+    st.subheader(title)
+    
+    for column, (heading, icon, pdf_key, doc_key) in zip(st.columns(len(groups)), groups):
+        with column:
+            st.markdown(f"**{heading}**")
+            for key, label in ((pdf_key, "PDF"), (doc_key, "DOC")):
+                if key in generated_files:
+                    st.download_button(
+                        label=f"{icon} Download {label}",
+                        data=generated_files[key]['content'],
+                        file_name=generated_files[key]['filename'],
+                        mime=generated_files[key]['mime'],
+                        key=f"download_{key}"
+                    )
+
 def handle_report_generation():
     """Handle report generation with simultaneous generation and download."""
     st.header("📊 Generate Reports")
@@ -505,246 +711,37 @@ def handle_report_generation():
     
     with col1:
         if st.button("📦 Generate All Reports", type="primary", help="Generate all reports at once"):
-            try:
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                pdf_gen = PDFGenerator()
-                doc_gen = DocumentGenerator()
-                
-                generated_files = {}
-                
-                status_text.text("Generating Comparative Statement PDF...")
-                progress_bar.progress(20)
-                comp_pdf = pdf_gen.generate_comparative_statement_pdf(
-                    st.session_state.current_work,
-                    st.session_state.bidders
-                )
-                generated_files['comparative_statement_pdf'] = {
-                    'content': comp_pdf,
-                    'filename': f"comparative_statement_{st.session_state.current_work['nit_number']}.pdf",
-                    'mime': "application/pdf"
-                }
-                
-                status_text.text("Generating Comparative Statement DOC...")
-                progress_bar.progress(40)
-                comp_doc = doc_gen.generate_comparative_statement_doc(
-                    st.session_state.current_work,
-                    st.session_state.bidders
-                )
-                generated_files['comparative_statement_doc'] = {
-                    'content': comp_doc,
-                    'filename': f"comparative_statement_{st.session_state.current_work['nit_number']}.docx",
-                    'mime': "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                }
-                
-                status_text.text("Generating Scrutiny Sheet PDF...")
-                progress_bar.progress(60)
-                scrutiny_pdf = pdf_gen.generate_scrutiny_sheet_pdf(
-                    st.session_state.current_work,
-                    st.session_state.bidders
-                )
-                generated_files['scrutiny_sheet_pdf'] = {
-                    'content': scrutiny_pdf,
-                    'filename': f"scrutiny_sheet_{st.session_state.current_work['nit_number']}.pdf",
-                    'mime': "application/pdf"
-                }
-                
-                status_text.text("Generating Scrutiny Sheet DOC...")
-                progress_bar.progress(80)
-                scrutiny_doc = doc_gen.generate_scrutiny_sheet_doc(
-                    st.session_state.current_work,
-                    st.session_state.bidders
-                )
-                generated_files['scrutiny_sheet_doc'] = {
-                    'content': scrutiny_doc,
-                    'filename': f"scrutiny_sheet_{st.session_state.current_work['nit_number']}.docx",
-                    'mime': "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                }
-                
-                progress_bar.progress(100)
-                status_text.text("All reports generated successfully!")
-                
-                st.success("✅ All reports generated simultaneously in PDF and DOC formats!")
-                
-                st.session_state.generated_reports = generated_files
-                
-                st.subheader("📥 Download Generated Reports")
-                
-                col_a, col_b = st.columns(2)
-                
-                with col_a:
-                    st.markdown("**Comparative Statement**")
-                    st.download_button(
-                        label="📋 Download PDF",
-                        data=generated_files['comparative_statement_pdf']['content'],
-                        file_name=generated_files['comparative_statement_pdf']['filename'],
-                        mime="application/pdf",
-                        key="download_comp_pdf"
-                    )
-                    st.download_button(
-                        label="📋 Download DOC",
-                        data=generated_files['comparative_statement_doc']['content'],
-                        file_name=generated_files['comparative_statement_doc']['filename'],
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key="download_comp_doc"
-                    )
-                
-                with col_b:
-                    st.markdown("**Scrutiny Sheet**")
-                    st.download_button(
-                        label="🔍 Download PDF",
-                        data=generated_files['scrutiny_sheet_pdf']['content'],
-                        file_name=generated_files['scrutiny_sheet_pdf']['filename'],
-                        mime="application/pdf",
-                        key="download_scrutiny_pdf"
-                    )
-                    st.download_button(
-                        label="🔍 Download DOC",
-                        data=generated_files['scrutiny_sheet_doc']['content'],
-                        file_name=generated_files['scrutiny_sheet_doc']['filename'],
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key="download_scrutiny_doc"
-                    )
-                
-            except Exception as e:
-                st.error(f"❌ Error in bulk report generation: {str(e)}")
-                logging.error(f"Error in bulk report generation: {e}")
+            st.session_state.report_job_id = get_job_queue().submit('reports', {
+                'work': st.session_state.current_work,
+                'bidders': st.session_state.bidders
+            })
     
     with col2:
         if st.button("📄 Generate All Documents", type="primary", help="Generate all official documents at once"):
-            try:
-                progress_bar2 = st.progress(0)
-                status_text2 = st.empty()
-                
-                pdf_gen = PDFGenerator()
-                doc_gen = DocumentGenerator()
-                
-                # Prepare work_info for document generation
-                work_data = st.session_state.current_work
-                work_info = {
-                    'name': work_data.get('work_name', 'Unknown Work'),
-                    'nit_number': work_data.get('nit_number', 'Unknown NIT'),
-                    'estimated_cost': work_data.get('estimated_cost', 0),
-                    'earnest_money': work_data.get('earnest_money', 0),
-                    'time_completion': work_data.get('time_completion', 6),
-                    'time_of_completion': work_data.get('time_completion', 6),  # Added for compatibility
-                    'nit_date': work_data.get('nit_date', 'Not found'),
-                    'receipt_date': work_data.get('receipt_date', 'Not found'),
-                    'opening_date': work_data.get('opening_date', 'Not found'),
-                    'date': work_data.get('nit_date', 'Not found')  # Added for compatibility
-                }
-                # If there's a works list, use the first work's details
-                if work_data.get('works') and len(work_data['works']) > 0:
-                    work_info.update({
-                        'name': work_data['works'][0]['name'],
-                        'item_no': work_data['works'][0]['item_no'],
-                        'estimated_cost': work_data['works'][0]['estimated_cost'],
-                        'earnest_money': work_data['works'][0]['earnest_money'],
-                        'time_completion': work_data['works'][0]['time_completion'],
-                        'time_of_completion': work_data['works'][0]['time_completion']  # Added for compatibility
-                    })
-                
-                # Update current_work with work_info
-                st.session_state.current_work['work_info'] = work_info
-                
-                generated_docs = {}
-                
-                status_text2.text("Generating Letter of Acceptance PDF...")
-                progress_bar2.progress(25)
-                loa_pdf = pdf_gen.generate_letter_of_acceptance_pdf(
-                    st.session_state.current_work,
-                    st.session_state.bidders
-                )
-                generated_docs['letter_of_acceptance_pdf'] = {
-                    'content': loa_pdf,
-                    'filename': f"letter_of_acceptance_{st.session_state.current_work['nit_number']}.pdf",
-                    'mime': "application/pdf"
-                }
-                
-                status_text2.text("Generating Letter of Acceptance DOC...")
-                progress_bar2.progress(50)
-                loa_doc = doc_gen.generate_letter_of_acceptance_doc(
-                    st.session_state.current_work,
-                    st.session_state.bidders
-                )
-                generated_docs['letter_of_acceptance_doc'] = {
-                    'content': loa_doc,
-                    'filename': f"letter_of_acceptance_{st.session_state.current_work['nit_number']}.docx",
-                    'mime': "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                }
-                
-                status_text2.text("Generating Work Order PDF...")
-                progress_bar2.progress(75)
-                wo_pdf = pdf_gen.generate_work_order_pdf(
-                    st.session_state.current_work,
-                    st.session_state.bidders
-                )
-                generated_docs['work_order_pdf'] = {
-                    'content': wo_pdf,
-                    'filename': f"work_order_{st.session_state.current_work['nit_number']}.pdf",
-                    'mime': "application/pdf"
-                }
-                
-                status_text2.text("Generating Work Order DOC...")
-                progress_bar2.progress(100)
-                wo_doc = doc_gen.generate_work_order_doc(
-                    st.session_state.current_work,
-                    st.session_state.bidders
-                )
-                generated_docs['work_order_doc'] = {
-                    'content': wo_doc,
-                    'filename': f"work_order_{st.session_state.current_work['nit_number']}.docx",
-                    'mime': "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                }
-                
-                status_text2.text("All documents generated successfully!")
-                
-                st.success("✅ All documents generated simultaneously in PDF and DOC formats!")
-                
-                st.session_state.generated_documents = generated_docs
-                
-                st.subheader("📥 Download Generated Documents")
-                
-                col_x, col_y = st.columns(2)
-                
-                with col_x:
-                    st.markdown("**Letter of Acceptance**")
-                    st.download_button(
-                        label="📄 Download PDF",
-                        data=generated_docs['letter_of_acceptance_pdf']['content'],
-                        file_name=generated_docs['letter_of_acceptance_pdf']['filename'],
-                        mime="application/pdf",
-                        key="download_loa_pdf"
-                    )
-                    st.download_button(
-                        label="📄 Download DOC",
-                        data=generated_docs['letter_of_acceptance_doc']['content'],
-                        file_name=generated_docs['letter_of_acceptance_doc']['filename'],
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key="download_loa_doc"
-                    )
-                
-                with col_y:
-                    st.markdown("**Work Order**")
-                    st.download_button(
-                        label="📋 Download PDF",
-                        data=generated_docs['work_order_pdf']['content'],
-                        file_name=generated_docs['work_order_pdf']['filename'],
-                        mime="application/pdf",
-                        key="download_wo_pdf"
-                    )
-                    st.download_button(
-                        label="📋 Download DOC",
-                        data=generated_docs['work_order_doc']['content'],
-                        file_name=generated_docs['work_order_doc']['filename'],
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key="download_wo_doc"
-                    )
-                
-            except Exception as e:
-                st.error(f"❌ Error in bulk document generation: {str(e)}")
-                logging.error(f"Error in bulk document generation: {e}")
+            # Update current_work with work_info
+            st.session_state.current_work['work_info'] = prepare_work_info(st.session_state.current_work)
+            st.session_state.document_job_id = get_job_queue().submit('documents', {
+                'work': st.session_state.current_work,
+                'bidders': st.session_state.bidders
+            })
+    
+    show_generation_job(
+        'report_job_id', 'generated_reports', "📥 Download Generated Reports",
+        "✅ All reports generated simultaneously in PDF and DOC formats!",
+        [
+            ("Comparative Statement", "📋", 'comparative_statement_pdf', 'comparative_statement_doc'),
+            ("Scrutiny Sheet", "🔍", 'scrutiny_sheet_pdf', 'scrutiny_sheet_doc'),
+            ("Bid Analysis", "📈", 'bid_analysis_pdf', 'bid_analysis_doc'),
+        ]
+    )
+    show_generation_job(
+        'document_job_id', 'generated_documents', "📥 Download Generated Documents",
+        "✅ All documents generated simultaneously in PDF and DOC formats!",
+        [
+            ("Letter of Acceptance", "📄", 'letter_of_acceptance_pdf', 'letter_of_acceptance_doc'),
+            ("Work Order", "📋", 'work_order_pdf', 'work_order_doc'),
+        ]
+    )
     
     st.markdown("---")
     
@@ -755,7 +752,7 @@ def handle_report_generation():
     with col3:
         if st.button("📋 Generate Comparative Statement", type="secondary"):
             try:
-                comp_gen = ComparativeStatementGenerator()
+                comp_gen = get_generator('comparative_statement')
                 html_content = comp_gen.generate_comparative_statement(
                     st.session_state.current_work,
                     st.session_state.bidders
@@ -805,7 +802,7 @@ def handle_report_generation():
                 # Update current_work with work_info
                 st.session_state.current_work['work_info'] = work_info
                 
-                report_generator = ReportGenerator()
+                report_generator = get_generator('report')
                 html_content = report_generator.generate_detailed_report(
                     st.session_state.current_work,
                     st.session_state.bidders
@@ -839,7 +836,7 @@ def handle_document_generation():
     with col1:
         if st.button("📄 Generate Letter of Acceptance", type="secondary"):
             try:
-                loa_gen = LetterAcceptanceGenerator()
+                loa_gen = get_generator('letter_acceptance')
                 html_content = loa_gen.generate_letter_of_acceptance(
                     st.session_state.current_work,
                     st.session_state.bidders
@@ -862,7 +859,7 @@ def handle_document_generation():
     with col2:
         if st.button("📋 Generate Work Order", type="secondary"):
             try:
-                wo_gen = WorkOrderGenerator()
+                wo_gen = get_generator('work_order')
                 html_content = wo_gen.generate_work_order(
                     st.session_state.current_work,
                     st.session_state.bidders
@@ -885,7 +882,7 @@ def handle_document_generation():
     with col3:
         if st.button("🔍 Generate Scrutiny Sheet", type="secondary"):
             try:
-                ss_gen = ScrutinySheetGenerator()
+                ss_gen = get_generator('scrutiny_sheet')
                 html_content = ss_gen.generate_scrutiny_sheet(
                     st.session_state.current_work,
                     st.session_state.bidders
@@ -915,7 +912,7 @@ def handle_document_generation():
         st.subheader("🎯 LaTeX-Based PDF Generation")
         if st.button("📋 Generate All PDFs (LaTeX)", type="primary"):
             try:
-                latex_gen = LatexPDFGenerator()
+                latex_gen = get_generator('latex_pdf')
                 documents = {}
                 
                 with st.spinner("Generating PDF documents..."):
@@ -929,7 +926,7 @@ def handle_document_generation():
                             documents['comparative_statement'] = f.read()
                     
                     # Letter of Acceptance
-                    l1_bidder = min(st.session_state.bidders, key=lambda x: x.get('bid_amount', float('inf')))
+                    l1_bidder = select_lowest(st.session_state.bidders)
                     loa_path = os.path.join(temp_dir, "letter_acceptance.pdf")
                     if latex_gen.generate_letter_acceptance_pdf(st.session_state.current_work, l1_bidder, loa_path):
                         with open(loa_path, 'rb') as f:
@@ -975,7 +972,7 @@ def handle_document_generation():
         if st.button("🚀 Download All as ZIP", type="primary"):
             try:
                 with st.spinner("Creating ZIP package..."):
-                    zip_gen = ZipGenerator()
+                    zip_gen = get_generator('zip')
                     
                     # Check if we have generated PDFs
                     if hasattr(st.session_state, 'generated_pdfs') and st.session_state.generated_pdfs:
@@ -983,7 +980,7 @@ def handle_document_generation():
                     else:
                         # Generate new PDFs if not available
                         documents = {}
-                        latex_gen = LatexPDFGenerator()
+                        latex_gen = get_generator('latex_pdf')
                         temp_dir = tempfile.mkdtemp()
                         
                         # Generate all documents
@@ -993,7 +990,7 @@ def handle_document_generation():
                                 documents['comparative_statement'] = f.read()
                         
                         if st.session_state.bidders:
-                            l1_bidder = min(st.session_state.bidders, key=lambda x: x.get('bid_amount', float('inf')))
+                            l1_bidder = select_lowest(st.session_state.bidders)
                             
                             loa_path = os.path.join(temp_dir, "letter_acceptance.pdf")
                             if latex_gen.generate_letter_acceptance_pdf(st.session_state.current_work, l1_bidder, loa_path):
@@ -1046,6 +1043,73 @@ def handle_document_generation():
         st.info("💡 The ZIP package includes:\n- All tender documents as PDFs\n- Summary file\n- Data reference file")
 
 
+def handle_tender_history():
+    """Bidder performance and quote trends across all processed tenders."""
+    st.header("📈 Tender History")
+
+    history = get_tender_history()
+    if history is None:
+        st.info("ℹ️ Tender history is disabled (TENDER_HISTORY_DB is empty).")
+        return
+    if not history.tender_count():
+        st.info("ℹ️ No tenders recorded yet. Tenders are recorded when their reports or documents are generated.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        division = st.selectbox("Division:", ["All divisions"] + history.divisions())
+    with col2:
+        bidder = st.text_input("Bidder:", placeholder="All bidders")
+    with col3:
+        since = st.date_input("From:", value=None)
+    with col4:
+        until = st.date_input("To:", value=None)
+
+    filters = {
+        'bidder': bidder.strip() or None,
+        'division': None if division == "All divisions" else division,
+        'since': since.isoformat() if since else None,
+        'until': until.isoformat() if until else None,
+    }
+
+    import pandas as pd
+    trend = pd.DataFrame(history.quarterly_trend(**filters))
+    if trend.empty:
+        st.warning("⚠️ No bids match these filters.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Tenders", f"{trend['tenders'].sum():,}")
+    with col2:
+        st.metric("Bids", f"{trend['bids'].sum():,}")
+    with col3:
+        st.metric("L1 Wins", f"{trend['wins'].sum():,}")
+
+    st.subheader("📉 Quarterly Quote Trend")
+    st.line_chart(trend.set_index('quarter')[['average_percentage', 'l1_average_percentage']])
+    st.dataframe(trend.rename(columns={
+        'quarter': 'Quarter',
+        'tenders': 'Tenders',
+        'bids': 'Bids',
+        'wins': 'L1 Wins',
+        'average_percentage': 'Average %',
+        'l1_average_percentage': 'L1 Average %',
+        'bids_per_tender': 'Bids per Tender',
+    }), hide_index=True, use_container_width=True)
+
+    st.subheader("👥 Bidder Performance")
+    bidders = pd.DataFrame(history.bidder_statistics(**filters))
+    st.dataframe(bidders.rename(columns={
+        'bidder': 'Bidder',
+        'tenders': 'Tenders',
+        'wins': 'L1 Wins',
+        'win_rate': 'Win Rate',
+        'average_percentage': 'Average %',
+        'average_bid': 'Average Bid (₹)',
+        'last_tender': 'Last Tender',
+    }), hide_index=True, use_container_width=True)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,234 @@
+"""
+Artifact Cache for Tender Processing System
+Content-addressed on-disk cache of rendered documents shared by all generators
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Cache location and size budget, overridable from the environment
+ARTIFACT_CACHE_DIR = Path(os.environ.get('ARTIFACT_CACHE_DIR',
+                                         os.path.join(tempfile.gettempdir(), 'tender_artifact_cache')))
+ARTIFACT_CACHE_MAX_MB = float(os.environ.get('ARTIFACT_CACHE_MAX_MB', 256))
+
+
+def _canonical(value: Any) -> Any:
+    """Reduce input data to a JSON-stable form (sorted keys, plain types)."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        # 1000 and 1000.0 render identically
+        return int(value)
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+@functools.lru_cache(maxsize=256)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def template_version(*paths: Any) -> str:
+    """
+    Version string for a set of template/source files.
+
+    Changes whenever any file's content changes; missing files are recorded
+    as such so adding a template also changes the version.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        path = str(path)
+        try:
+            stat = os.stat(path)
+            digest.update(_file_digest(path, stat.st_mtime_ns, stat.st_size).encode('ascii'))
+        except OSError:
+            digest.update(f"missing:{path}".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class ArtifactCache:
+    """
+    Size-bounded LRU cache of rendered artefacts on disk.
+
+    Entries are addressed by a SHA-256 of the canonical input data, the
+    template version and the generator name, so identical requests from any
+    session or process share one file. Access time is the file mtime, which
+    makes eviction least-recently-used across processes too.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or ARTIFACT_CACHE_DIR)
+        self.max_bytes = int(max_bytes if max_bytes is not None else ARTIFACT_CACHE_MAX_MB * 1024 * 1024)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def make_key(generator: str, version: str, data: Any) -> str:
+        """Content address of one rendering."""
+        payload = json.dumps({'generator': generator, 'version': version, 'data': _canonical(data)},
+                             sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.bin"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes for a key, or None."""
+        path = self._path(key)
+        try:
+            content = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(content)
+        return content
+
+    def put(self, key: str, content: bytes):
+        """Store bytes under a key and evict old entries beyond the size budget."""
+        if not content or len(content) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so readers never see a partial file
+            staging = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            staging.write_bytes(content)
+            os.replace(staging, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write artifact cache entry {key}: {e}")
+            return
+        self._evict()
+
+    def get_or_render(self, generator: str, version: str, data: Any,
+                      render: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """Return the cached artefact, rendering and storing it on a miss."""
+        key = self.make_key(generator, version, data)
+        content = self.get(key)
+        if content is not None:
+            return content
+        content = render()
+        if isinstance(content, bytes) and content:
+            self.put(key, content)
+        return content
+
+    def _entries(self) -> Iterable[Tuple[Path, os.stat_result]]:
+        for path in self.cache_dir.glob('*/*.bin'):
+            try:
+                yield path, path.stat()
+            except OSError:
+                continue
+
+    def _evict(self):
+        entries = list(self._entries())
+        total = sum(stat.st_size for _, stat in entries)
+        if total <= self.max_bytes:
+            return
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime):
+            try:
+                path.unlink()
+                total -= stat.st_size
+            except OSError:
+                continue
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Remove every cached artefact."""
+        for path, _ in list(self._entries()):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'bytes_saved': self.bytes_saved,
+            }
+
+
+_cache: Optional[ArtifactCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Return the process-wide artefact cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ArtifactCache()
+        return _cache
+
+
+def artifact_key(generator: str, version: str, arguments: Dict[str, Any]) -> str:
+    """
+    Cache key for a generator call.
+
+    Today's date is part of the key because documents print the current date.
+    """
+    data = {'args': arguments, 'date': date.today().isoformat()}
+    return ArtifactCache.make_key(generator, version, data)
+
+
+def cached_artifact(generator: str, version: Callable[[Any], str]):
+    """
+    Decorator for generator methods returning document bytes.
+
+    The cache key covers every argument except ``output_path`` (see
+    artifact_key). On a hit with an ``output_path`` the cached bytes are also
+    written there, as the generator would have done.
+
+    Args:
+        generator: Stable name of the generator method
+        version: Called with the generator instance; returns its template version
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            arguments = dict(bound.arguments)
+            arguments.pop('self', None)
+            output_path = arguments.pop('output_path', None)
+
+            cache = get_artifact_cache()
+            key = artifact_key(generator, version(self), arguments)
+            content = cache.get(key)
+            if content is None:
+                content = func(self, *args, **kwargs)
+                if isinstance(content, bytes) and content:
+                    cache.put(key, content)
+            elif output_path:
+                with open(output_path, 'wb') as f:
+                    f.write(content)
+            return content
+
+        return wrapper
+    return decorator
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Startup import benchmark for the Streamlit app.
+
+Runs `python -X importtime -c "import app"` several times in fresh
+interpreters and reports the median cumulative import time of the app and of
+each module it imports directly.
+
+    python benchmarks/importtime.py [--module app] [--runs 5] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# "import time:  self [us] | cumulative | imported package"
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$')
+
+
+def measure_once(module: str) -> Dict[str, int]:
+    """Cumulative import time (microseconds) of a module and its direct imports."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        # One space of indent is the measured module, three its direct imports
+        if indent == 1 and name == module:
+            timings['TOTAL'] = cumulative
+        elif indent == 3:
+            timings[name] = timings.get(name, 0) + cumulative
+    return timings
+
+
+def measure(module: str, runs: int) -> Dict[str, float]:
+    samples: List[Dict[str, int]] = [measure_once(module) for _ in range(runs)]
+    names = {name for sample in samples for name in sample}
+    return {name: statistics.median(sample.get(name, 0) for sample in samples) / 1000 for name in names}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="direct imports to list")
+    parser.add_argument('--json', help="write results (milliseconds) to this file")
+    args = parser.parse_args()
+
+    timings = measure(args.module, args.runs)
+    total = timings.pop('TOTAL', 0.0)
+    print(f"import {args.module}: {total:.0f} ms (median of {args.runs})")
+    for name, ms in sorted(timings.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'module': args.module, 'runs': args.runs, 'total_ms': total,
+                       'imports_ms': timings}, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
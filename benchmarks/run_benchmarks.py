@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the tender pipeline.
+
+Times NIT parsing, bidder ranking, every document generator and ZIP
+packaging on synthetic tenders at several scales, writes the results to
+benchmarks/results/<timestamp>.json and compares them with the previous run.
+
+    python benchmarks/run_benchmarks.py                 # full matrix
+    python benchmarks/run_benchmarks.py --quick         # smallest scales only
+    python benchmarks/run_benchmarks.py -k pdf          # cases whose name contains "pdf"
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+# Measure rendering, not the artefact cache: a zero budget stores nothing, and
+# an empty private directory keeps entries written by the app or CLI out of reach
+_CACHE_DIR = tempfile.TemporaryDirectory(prefix='tender_bench_cache_')
+os.environ['ARTIFACT_CACHE_DIR'] = _CACHE_DIR.name
+os.environ['ARTIFACT_CACHE_MAX_MB'] = '0'
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import make_bidders, make_nit_workbook  # noqa: E402
+from generator_registry import create_generator  # noqa: E402
+from report_jobs import prepare_work_info  # noqa: E402
+from tender_processor import TenderProcessor  # noqa: E402
+from logging_config import configure_logging  # noqa: E402
+
+WORK_SCALES = [1, 10, 100, 1000]
+BIDDER_SCALES = [5, 50, 500]
+# Extra scales for the HTML generators only (the PDF/DOCX ones are too slow here)
+HTML_BIDDER_SCALES = [1000]
+
+# Slower than this per call and the case is timed fewer times
+SLOW_CALL_SECONDS = 0.5
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Wall-clock seconds of repeated calls (first call is a warm-up)."""
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    if first > SLOW_CALL_SECONDS:
+        repeat = max(1, repeat // 3)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {'min': min(samples), 'median': statistics.median(samples), 'runs': len(samples)}
+
+
+def load_work(path: str) -> Dict[str, Any]:
+    work = create_generator('excel_parser').parse_nit_excel(path)
+    if not work:
+        raise RuntimeError(f"Synthetic NIT did not parse: {path}")
+    work['work_info'] = prepare_work_info(work)
+    return work
+
+
+def build_cases(workdir: str, work_scales: List[int], bidder_scales: List[int],
+                html_bidder_scales: List[int] = ()) -> Dict[str, Callable[[], Any]]:
+    """Benchmark name -> zero-argument callable."""
+    cases: Dict[str, Callable[[], Any]] = {}
+    parser = create_generator('excel_parser')
+
+    for n_works in work_scales:
+        path = make_nit_workbook(os.path.join(workdir, f'nit_{n_works}.xlsx'), n_works)
+        cases[f'parse_nit_excel[works={n_works}]'] = lambda path=path: parser.parse_nit_excel(path)
+
+    work = load_work(make_nit_workbook(os.path.join(workdir, 'nit_base.xlsx'), 1))
+    processor = TenderProcessor()
+    html_generators = {
+        'comparative_statement_html': (create_generator('comparative_statement'), 'generate_comparative_statement'),
+        'scrutiny_sheet_html': (create_generator('scrutiny_sheet'), 'generate_scrutiny_sheet'),
+        'letter_of_acceptance_html': (create_generator('letter_acceptance'), 'generate_letter_of_acceptance'),
+        'work_order_html': (create_generator('work_order'), 'generate_work_order'),
+    }
+    pdf_gen = create_generator('pdf')
+    doc_gen = create_generator('docx')
+    try:
+        latex_pdf_gen = create_generator('latex_pdf')
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        latex_pdf_gen = None
+        logging.warning("WeasyPrint unavailable; skipping LatexPDFGenerator cases")
+    zip_gen = create_generator('zip')
+
+    for n_bidders in bidder_scales:
+        bidders = make_bidders(work, n_bidders)
+        scale = f'bidders={n_bidders}'
+
+        cases[f'rank_bidders[{scale}]'] = lambda b=bidders: processor.rank_bidders([dict(x) for x in b])
+        for name, (generator, method) in html_generators.items():
+            cases[f'{name}[{scale}]'] = lambda g=generator, m=method, b=bidders: getattr(g, m)(work, b)
+        for doc in ('comparative_statement', 'scrutiny_sheet', 'letter_of_acceptance', 'work_order'):
+            cases[f'pdf_{doc}[{scale}]'] = (
+                lambda m=getattr(pdf_gen, f'generate_{doc}_pdf'), b=bidders: m(work, b))
+            cases[f'docx_{doc}[{scale}]'] = (
+                lambda m=getattr(doc_gen, f'generate_{doc}_doc'), b=bidders: m(work, b))
+        if latex_pdf_gen is not None:
+            cases[f'latex_pdf_bulk[{scale}]'] = lambda b=bidders: latex_pdf_gen.generate_bulk_pdfs(work, b)
+
+        # Built on the first (warm-up) call, so deselected cases never render them
+        documents = lru_cache(maxsize=None)(lambda n=n_bidders, b=bidders: {
+            f'comparative_statement_{n}.pdf': pdf_gen.generate_comparative_statement_pdf(work, b),
+            f'comparative_statement_{n}.docx': doc_gen.generate_comparative_statement_doc(work, b),
+            f'scrutiny_sheet_{n}.html': html_generators['scrutiny_sheet_html'][0]
+            .generate_scrutiny_sheet(work, b).encode('utf-8'),
+        })
+        cases[f'zip_create[{scale}]'] = lambda d=documents: zip_gen.create_zip(d())
+
+    for n_bidders in html_bidder_scales:
+        bidders = make_bidders(work, n_bidders)
+        for name, (generator, method) in html_generators.items():
+            cases[f'{name}[bidders={n_bidders}]'] = lambda g=generator, m=method, b=bidders: getattr(g, m)(work, b)
+
+    return cases
+
+
+def latest_results() -> Optional[Path]:
+    """Most recent local run, falling back to the committed baseline."""
+    runs = sorted(RESULTS_DIR.glob('*.json')) if RESULTS_DIR.exists() else []
+    if runs:
+        return runs[-1]
+    return BASELINE if BASELINE.exists() else None
+
+
+def compare(current: Dict[str, Dict[str, float]], previous_path: Path, threshold: float) -> int:
+    """Print per-case ratios against a previous run; return the number of regressions."""
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)['results']
+
+    print(f"\nCompared with {previous_path.name} (ratio of min time, >{threshold:.2f} flagged):")
+    regressions = 0
+    for name, timing in current.items():
+        if name not in previous or not previous[name]['min']:
+            continue
+        ratio = timing['min'] / previous[name]['min']
+        flag = ''
+        if ratio > threshold:
+            flag = '  <-- slower'
+            regressions += 1
+        elif ratio < 1 / threshold:
+            flag = '  faster'
+        print(f"  {ratio:6.2f}x  {name}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tender pipeline benchmarks")
+    parser.add_argument('--quick', action='store_true', help="smallest scales only")
+    parser.add_argument('-k', dest='select', help="only run cases whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case")
+    parser.add_argument('--compare', type=Path, help="results file to compare with (default: previous run, else baseline.json)")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument('--no-save', action='store_true', help="do not write a results file")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit with status 1 when any case is flagged as a regression")
+    args = parser.parse_args()
+
+    configure_logging(logging.ERROR)
+    work_scales = WORK_SCALES[:2] if args.quick else WORK_SCALES
+    bidder_scales = BIDDER_SCALES[:1] if args.quick else BIDDER_SCALES
+    html_bidder_scales = [] if args.quick else HTML_BIDDER_SCALES
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='tender_bench_') as workdir:
+        cases = build_cases(workdir, work_scales, bidder_scales, html_bidder_scales)
+        for name, func in cases.items():
+            if args.select and args.select not in name:
+                continue
+            try:
+                results[name] = time_call(func, args.repeat)
+            except Exception as e:
+                print(f"  FAILED     {name}: {e}")
+                continue
+            print(f"  {results[name]['min'] * 1000:9.2f} ms  {name}")
+
+    previous = args.compare or latest_results()
+    output = None
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+        print(f"\nResults written to {output}")
+
+    if previous and previous != output and previous.exists():
+        regressions = compare(results, previous, args.threshold)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Synthetic NIT workbooks and bidder sets for benchmarks.
+
+Workbooks follow the layout of test_files/NIT_10 works.xlsx: NIT number and
+dates in the header rows, then one row per work under the
+ITEM NO. / NAME OF WORK / ESTIMATED COST header.
+"""
+
+import random
+from typing import Any, Dict, List
+
+import pandas as pd
+
+WORK_HEADER = [
+    'ITEM NO.', 'NAME OF WORK', 'ESTIMATED COST RS. IN LACS',
+    'G-SCHEDULE AMOUNT RS', 'TIME OF COMPLETION IN MONTH', 'EARNEST MONEY RS.'
+]
+
+
+def make_nit_workbook(path: str, n_works: int, seed: int = 0) -> str:
+    """Write a NIT workbook with n_works works and return its path."""
+    rng = random.Random(seed)
+    rows: List[List[Any]] = [
+        ['NIT NUMBER', None, f'{n_works:02d}/2025-26', None, None, None],
+        ['DATE OF CALLING NIT', None, '2025-05-06', None, None, None],
+        ['DATE OF RECEIPT', None, '2025-05-21', None, None, None],
+        ['DATE OF OPENING', None, '2025-05-21', None, None, None],
+        WORK_HEADER,
+    ]
+    for item_no in range(1, n_works + 1):
+        cost_lacs = round(rng.uniform(1.0, 250.0), 2)
+        rows.append([
+            item_no,
+            f'Electrical work package {item_no} at sub-division {rng.randint(1, 40)}',
+            cost_lacs,
+            round(cost_lacs * 100000 * rng.uniform(0.9, 1.0)),
+            rng.randint(1, 24),
+            round(cost_lacs * 2000),
+        ])
+    # The first row becomes the DataFrame header, as in the real files
+    pd.DataFrame(rows[1:], columns=rows[0]).to_excel(path, sheet_name='Sheet1', index=False)
+    return path
+
+
+def make_bidders(work: Dict[str, Any], n_bidders: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Bidders for a parsed work, shaped like the ones the app builds."""
+    rng = random.Random(seed)
+    work_info = work['work_info']
+    estimated_cost = float(work_info['estimated_cost'])
+    bidders = []
+    for index in range(n_bidders):
+        percentage = round(rng.uniform(-25.0, 15.0), 2)
+        bidders.append({
+            'name': f'Contractor {index + 1:04d} & Sons',
+            'contact': f'Plot {index + 1}, Industrial Area, Udaipur',
+            'address': f'Plot {index + 1}, Industrial Area, Udaipur',
+            'percentage': percentage,
+            'bid_amount': round(estimated_cost * (1 + percentage / 100), 2),
+            'earnest_money': work_info['earnest_money'],
+            'estimated_cost': estimated_cost,
+            'date_added': '06/05/2025',
+        })
+    return bidders
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Byte-for-byte checks of the four HTML tender documents.
+
+The golden files in golden_html/ were rendered by the generators before they
+moved onto the shared Jinja2 environment; the current generators must still
+produce exactly the same bytes. The clock is frozen so dates are stable.
+
+    python -m pytest benchmarks/test_html_golden.py
+    python benchmarks/test_html_golden.py --update    # after an intended change
+"""
+
+import sys
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+GOLDEN_DIR = Path(__file__).resolve().parent / 'golden_html'
+sys.path.insert(0, str(ROOT))
+
+from comparative_statement_generator import ComparativeStatementGenerator  # noqa: E402
+from letter_acceptance_generator import LetterAcceptanceGenerator  # noqa: E402
+from scrutiny_sheet_generator import ScrutinySheetGenerator  # noqa: E402
+from work_order_generator import WorkOrderGenerator  # noqa: E402
+
+# Modules whose datetime.now() ends up in the documents
+CLOCK_MODULES = ('date_utils', 'comparative_statement_generator', 'scrutiny_sheet_generator',
+                 'letter_acceptance_generator', 'work_order_generator')
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 8, 14, 10, 30, 0)
+
+
+WORKS = {
+    'parsed_date': {
+        'work_name': 'Electric Repair & MTC work at Govt. Hostel, Udaipur',
+        'nit_number': '12/2025-26',
+        'work_info': {'estimated_cost': 1234567.0, 'earnest_money': 24691,
+                      'time_of_completion': '3 Months', 'date': '27-07-2025'},
+    },
+    'unparsed_date': {
+        'work_name': 'Street light work <phase II>',
+        'nit_number': 'NIT-7',
+        'item_number': '4',
+        'work_info': {'estimated_cost': '98000', 'earnest_money': '1960',
+                      'time_of_completion': '6 Months', 'date': 'to be notified'},
+    },
+}
+
+BIDDERS = {
+    'one': [{'name': 'M/s Seema Electrical', 'percentage': -4.0, 'bid_amount': 1185184.32}],
+    'seven': [
+        {'name': f'Bidder {i} & Sons', 'percentage': pct, 'bid_amount': amount}
+        for i, (pct, amount) in enumerate([(2.5, 100450.0), (-3.25, 94815.0), (0.0, 98000.0),
+                                           (-10.0, 88200.0), (5.0, 102900.0), (-1.5, 96530.0),
+                                           (12.75, 110495.0)], 1)
+    ],
+    # Only the comparative statement renders without bidders
+    'none': [],
+}
+
+DOCUMENTS = {
+    'comparative_statement': (ComparativeStatementGenerator, 'generate_comparative_statement'),
+    'scrutiny_sheet': (ScrutinySheetGenerator, 'generate_scrutiny_sheet'),
+    'letter_of_acceptance': (LetterAcceptanceGenerator, 'generate_letter_of_acceptance'),
+    'work_order': (WorkOrderGenerator, 'generate_work_order'),
+}
+
+CASES = [(document, work, bidders) for document in DOCUMENTS for work in WORKS for bidders in ('one', 'seven')]
+CASES.append(('comparative_statement', 'parsed_date', 'none'))
+
+
+def render(document: str, work: str, bidders: str) -> bytes:
+    cls, method = DOCUMENTS[document]
+    with ExitStack() as stack:
+        for module in CLOCK_MODULES:
+            stack.enter_context(mock.patch(f'{module}.datetime', FrozenDatetime))
+        html = getattr(cls(), method)(WORKS[work], [dict(b) for b in BIDDERS[bidders]])
+    return html.encode('utf-8')
+
+
+def golden_path(document: str, work: str, bidders: str) -> Path:
+    return GOLDEN_DIR / f'{document}-{work}-{bidders}.html'
+
+
+@pytest.mark.parametrize('document,work,bidders', CASES)
+def test_matches_golden(document, work, bidders):
+    assert render(document, work, bidders) == golden_path(document, work, bidders).read_bytes()
+
+
+if __name__ == '__main__':
+    if '--update' not in sys.argv:
+        sys.exit(pytest.main([__file__, '-q']))
+    GOLDEN_DIR.mkdir(exist_ok=True)
+    for case in CASES:
+        golden_path(*case).write_bytes(render(*case))
+    print(f"Wrote {len(CASES)} golden files to {GOLDEN_DIR}")
@@ -0,0 +1,182 @@
+"""
+Bidder Import for Tender Processing System
+Bulk bidder entry from CSV, Excel or JSON sheets, validated a column at a time
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from date_utils import DateUtils
+from tender_history import bidder_key
+
+# Bidder sheet columns, matched case-insensitively
+BIDDER_COLUMNS = {
+    'name': ('name', 'bidder', 'bidder name', 'contractor'),
+    'percentage': ('percentage', 'percent', '%', 'quoted percentage'),
+    'address': ('contact', 'address', 'bidder address'),
+    'bid_amount': ('bid_amount', 'bid amount', 'amount'),
+}
+
+# Quoted percentages accepted, as in TenderProcessor.validate_percentage
+PERCENTAGE_LIMIT = 99.99
+
+# Characters dropped from numeric cells before a second parse ("-5.5%", "₹1,23,456")
+_NUMBER_NOISE = re.compile(r'[%₹,\s]|^rs\.?', re.IGNORECASE)
+
+
+def read_bidder_sheet(source: Union[str, Path, BinaryIO], filename: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read a bidder sheet from a path or an uploaded file.
+
+    Args:
+        source: Path, or file object such as a Streamlit upload
+        filename: Name used to pick the format (default: the path or source.name)
+
+    Returns:
+        One row per bidder as written in the sheet
+    """
+    suffix = Path(filename or str(getattr(source, 'name', source))).suffix.lower()
+    if suffix == '.json':
+        if hasattr(source, 'read'):
+            return pd.DataFrame(json.load(source))
+        with open(source, 'r', encoding='utf-8') as f:
+            return pd.DataFrame(json.load(f))
+    if suffix in ('.xlsx', '.xls', '.xlsm'):
+        return pd.read_excel(source)
+    return pd.read_csv(source)
+
+
+def match_columns(df: pd.DataFrame) -> Dict[str, Any]:
+    """Sheet column for each BIDDER_COLUMNS field present; name and percentage are required."""
+    lookup = {str(column).strip().lower(): column for column in df.columns}
+    columns = {}
+    for field, aliases in BIDDER_COLUMNS.items():
+        match = next((lookup[alias] for alias in aliases if alias in lookup), None)
+        if match is not None:
+            columns[field] = match
+    missing = [field for field in ('name', 'percentage') if field not in columns]
+    if missing:
+        raise ValueError(f"Missing bidder column(s): {', '.join(missing)}")
+    return columns
+
+
+def _numbers(values: pd.Series) -> np.ndarray:
+    """Float array of a column, accepting "-5.5%", "₹1,23,456" and the like; unreadable values are NaN."""
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float, na_value=np.nan, copy=True)
+    # Only cells that did not parse as plain numbers are cleaned up and retried
+    retry = np.flatnonzero(np.isnan(numbers) & values.notna().to_numpy())
+    if retry.size:
+        cleaned = [_NUMBER_NOISE.sub('', str(values.iat[i])) for i in retry]
+        numbers[retry] = pd.to_numeric(pd.Series(cleaned, dtype=object), errors='coerce')
+    return numbers
+
+
+def validate_bidders(df: pd.DataFrame, estimated_cost: float, earnest_money: float = 0,
+                     registered: Optional[Mapping[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Validate every row of a bidder sheet in one pass over its columns.
+
+    Rows without a name are skipped. A row is rejected for an unreadable or
+    out-of-range percentage, an unreadable bid amount, or a name that
+    repeats an earlier row once normalised (so "M/s. ABC Traders" and
+    "abc traders" are the same bidder). Bid amounts missing from the sheet
+    are computed from the estimated cost.
+
+    Args:
+        df: Sheet as returned by read_bidder_sheet
+        estimated_cost: Estimated cost of the work the bids refer to
+        earnest_money: Earnest money of that work, recorded on every bidder
+        registered: Bidder database (name -> details with address); names
+            matching a registered bidder take its spelling, and its address
+            when the sheet gives none
+
+    Returns:
+        Dictionary with bidders (valid rows, in sheet order), errors (row,
+        name and error for each rejected row; row numbers as in a
+        spreadsheet, header on row 1) and new_bidders (valid names not in
+        the bidder database)
+    """
+    columns = match_columns(df)
+    names_column = df[columns['name']]
+    blank = names_column.isna().to_numpy()
+    names = ['' if missing else str(name).strip() for name, missing in zip(names_column.to_numpy(object), blank)]
+    rows = np.array([i for i, name in enumerate(names) if name and name.lower() != 'nan'], dtype=int)
+    df = df.iloc[rows]
+    names = [names[i] for i in rows]
+    keys = [bidder_key(name) for name in names]
+
+    raw_percentages = df[columns['percentage']]
+    percentages = _numbers(raw_percentages)
+    amounts = np.round(estimated_cost * (1 + percentages / 100), 2)
+    bad_amounts = np.zeros(len(rows), dtype=bool)
+    if 'bid_amount' in columns:
+        raw_amounts = df[columns['bid_amount']]
+        given = _numbers(raw_amounts)
+        bad_amounts = np.isnan(given) & raw_amounts.notna().to_numpy()
+        amounts = np.where(np.isnan(given), amounts, given)
+
+    first_seen: Dict[str, int] = {}
+    duplicate_of = np.array([first_seen.setdefault(key, i) for i, key in enumerate(keys)], dtype=int)
+    with np.errstate(invalid='ignore'):
+        out_of_range = np.abs(percentages) > PERCENTAGE_LIMIT
+
+    problems = [
+        (np.array([not key for key in keys], dtype=bool), lambda i: "Invalid bidder name"),
+        (np.isnan(percentages), lambda i: f"Invalid percentage: {raw_percentages.iat[i]}"),
+        (out_of_range, lambda i: f"Percentage must be between -{PERCENTAGE_LIMIT}% and "
+                                 f"+{PERCENTAGE_LIMIT}%, got {percentages[i]}%"),
+        (bad_amounts, lambda i: f"Invalid bid amount: {raw_amounts.iat[i]}"),
+        ((duplicate_of != np.arange(len(rows))) & np.array([bool(key) for key in keys], dtype=bool),
+         lambda i: f"Duplicate of row {rows[duplicate_of[i]] + 2}"),
+    ]
+    rejected = np.zeros(len(rows), dtype=bool)
+    messages: Dict[int, List[str]] = {}
+    for mask, message in problems:
+        rejected |= mask
+        for i in np.flatnonzero(mask):
+            messages.setdefault(int(i), []).append(message(i))
+
+    registered = registered or {}
+    canonical = {bidder_key(name): name for name in registered}
+    addresses = [''] * len(rows)
+    if 'address' in columns:
+        column = df[columns['address']]
+        addresses = ['' if missing else str(value).strip()
+                     for value, missing in zip(column.to_numpy(object), column.isna().to_numpy())]
+
+    date_added = DateUtils().get_current_date()
+    percentages, amounts = percentages.tolist(), amounts.tolist()
+    bidders, new_bidders = [], []
+    for i in np.flatnonzero(~rejected):
+        name = canonical.get(keys[i])
+        if name is None:
+            new_bidders.append(names[i])
+        address = addresses[i]
+        if not address and name:
+            address = (registered[name] or {}).get('address', '')
+        bidders.append({
+            'name': name or names[i],
+            'address': address,
+            'percentage': percentages[i],
+            'bid_amount': amounts[i],
+            'earnest_money': earnest_money,
+            'estimated_cost': estimated_cost,
+            'date_added': date_added,
+        })
+
+    errors = [{'row': int(rows[i]) + 2, 'name': names[i], 'error': '; '.join(problem)}
+              for i, problem in sorted(messages.items())]
+    return {'bidders': bidders, 'errors': errors, 'new_bidders': new_bidders}
+
+
+def import_bidders(source: Union[str, Path, BinaryIO], estimated_cost: float, earnest_money: float = 0,
+                   registered: Optional[Mapping[str, Dict[str, Any]]] = None,
+                   filename: Optional[str] = None) -> Dict[str, Any]:
+    """Read and validate a bidder sheet; see read_bidder_sheet and validate_bidders."""
+    return validate_bidders(read_bidder_sheet(source, filename), estimated_cost, earnest_money, registered)
+
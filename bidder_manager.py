@@ -5,8 +5,6 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from date_utils import DateUtils
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
 class BidderManager:
     """Enhanced bidder management with persistent storage and improved date handling."""
     
@@ -0,0 +1,111 @@
+"""
+Bidder Ranking for Tender Processing System
+L1 and top-k selection shared by the document generators
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+Bidder = Dict[str, Any]
+
+_MISSING = object()
+
+
+def bid_amount(bidder: Bidder) -> float:
+    """Ranking key: bid amount, with bidders that have none ranked last."""
+    return bidder.get('bid_amount', float('inf'))
+
+
+class RankedBidders(tuple):
+    """Bidders in submission order, with their ranking worked out once.
+
+    The view is the tuple of bidders it was built from, so it can be passed
+    wherever a bidder list is accepted. Generators handed one reuse its
+    ranking instead of sorting again, which lets a caller producing several
+    documents for the same tender rank the bidders a single time. Other
+    per-tender results (e.g. bid statistics) can be kept on it with derived().
+
+    Equal bids keep submission order (L1 is the earliest of the lowest
+    bids). The ranking is a snapshot: bid amounts changed afterwards are not
+    picked up.
+    """
+
+    def __new__(cls, bidders: Iterable[Bidder] = ()):
+        view = super().__new__(cls, bidders)
+        view._ranked = None
+        view._lowest = _MISSING
+        view._derived = {}
+        return view
+
+    def __reduce__(self):
+        # Pickle the bidders only; the ranking is recomputed on demand
+        return type(self), (tuple(self),)
+
+    @property
+    def ranked(self) -> Tuple[Bidder, ...]:
+        """All bidders, lowest bid first."""
+        if self._ranked is None:
+            self._ranked = tuple(sorted(self, key=bid_amount))
+        return self._ranked
+
+    @property
+    def lowest(self) -> Optional[Bidder]:
+        """The L1 bidder (None without bidders), found in one pass."""
+        if self._lowest is _MISSING:
+            if self._ranked is not None:
+                self._lowest = self._ranked[0] if self._ranked else None
+            else:
+                self._lowest = min(self, key=bid_amount, default=None)
+        return self._lowest
+
+    def derived(self, key: Hashable, compute: Callable[['RankedBidders'], Any]) -> Any:
+        """Result of compute(self), worked out once per key for this tender."""
+        if key not in self._derived:
+            self._derived[key] = compute(self)
+        return self._derived[key]
+
+    def top(self, k: int) -> Tuple[Bidder, ...]:
+        """The k lowest bidders, lowest first, without a full sort."""
+        if self._ranked is not None or k >= len(self):
+            return self.ranked[:k]
+        if k == 1:
+            return (self.lowest,)
+        return tuple(heapq.nsmallest(k, self, key=bid_amount))
+
+
+def ranked_view(bidders: Iterable[Bidder]) -> RankedBidders:
+    """Ranked view of a bidder list; a view passed in is returned as is."""
+    if isinstance(bidders, RankedBidders):
+        return bidders
+    return RankedBidders(bidders)
+
+
+def rank_order(bidders: Iterable[Bidder]) -> List[Bidder]:
+    """All bidders, lowest bid first (stable for equal bids)."""
+    return list(ranked_view(bidders).ranked)
+
+
+def select_lowest(bidders: Iterable[Bidder], default: Any = _MISSING) -> Optional[Bidder]:
+    """The L1 bidder.
+
+    Args:
+        bidders: Bidder list or ranked view
+        default: Returned when there are no bidders; without it, like min(),
+            an empty list raises ValueError
+
+    Returns:
+        Bidder with the lowest bid, the earliest submitted on a tie
+    """
+    lowest = ranked_view(bidders).lowest
+    if lowest is None:
+        if default is _MISSING:
+            raise ValueError("No bidders to rank")
+        return default
+    return lowest
+
+
+def select_top(bidders: Iterable[Bidder], k: int) -> List[Bidder]:
+    """The k lowest bidders (L1..Lk), lowest first."""
+    if k <= 0:
+        return []
+    return list(ranked_view(bidders).top(k))
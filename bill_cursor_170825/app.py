@@ -10,6 +10,7 @@ from utils.document_generator import DocumentGenerator
 from utils.latex_generator import LaTeXGenerator
 from utils.pdf_merger import PDFMerger
 from utils.zip_packager import ZipPackager
+from utils.progress import CollectingReporter
 
 # Page configuration
 st.set_page_config(
@@ -241,7 +242,22 @@ def display_expandable_info():
         **Security:** All data stays secure on your device
         """)
 
-def process_file(uploaded_file):
+def show_events(events):
+    """Render progress events collected during one processing step in a single batch"""
+    completed = []
+    for event in events:
+        if event.level in ('success', 'info'):
+            completed.append(event.message)
+        elif event.level == 'warning':
+            st.warning(event.message)
+        else:
+            st.error(event.message)
+        if event.detail and event.level in ('warning', 'error'):
+            st.text(event.detail)
+    if completed:
+        st.success("\n\n".join(completed))
+
+def process_file(uploaded_file, single_workbook=False):
     """Process the uploaded Excel file and generate all documents"""
     try:
         # Create progress container
@@ -256,8 +272,12 @@ def process_file(uploaded_file):
         status_text.text("📊 Processing Excel file...")
         progress_bar.progress(10)
         
-        processor = ExcelProcessor()
+        # Utilities report through this; events are shown once per step
+        reporter = CollectingReporter()
+        
+        processor = ExcelProcessor(reporter)
         data = processor.process_file(uploaded_file)
+        show_events(reporter.drain())
         
         if not data:
             st.error("❌ Failed to process Excel file. Please check the file format and try again.")
@@ -267,40 +287,38 @@ def process_file(uploaded_file):
         
         # Step 2: Generate HTML documents
         status_text.text("📄 Generating HTML documents...")
-        doc_generator = DocumentGenerator()
+        doc_generator = DocumentGenerator(reporter)
         html_docs = doc_generator.generate_all_documents(data)
+        show_events(reporter.drain())
         
         progress_bar.progress(40)
         
         # Step 3: Generate LaTeX documents
         status_text.text("📐 Generating LaTeX templates...")
-        latex_generator = LaTeXGenerator()
-        latex_docs = latex_generator.process_all_documents(data)
+        latex_generator = LaTeXGenerator(reporter)
+        latex_docs = latex_generator.render_documents(data)
+        show_events(reporter.drain())
         
         progress_bar.progress(55)
         
-        # Step 4: Generate PDFs from HTML
-        status_text.text("📑 Converting HTML to PDF...")
-        pdf_merger = PDFMerger()
-        html_pdfs = pdf_merger.convert_html_to_pdf(html_docs)
-        
-        progress_bar.progress(70)
-        
-        # Step 5: Generate PDFs from LaTeX
-        status_text.text("📄 Converting LaTeX to PDF...")
-        latex_pdfs = pdf_merger.convert_latex_to_pdf(latex_docs)
+        # Step 4: Convert HTML and LaTeX to PDF concurrently on the shared pool
+        status_text.text("📑 Converting HTML and LaTeX to PDF...")
+        pdf_merger = PDFMerger(reporter)
+        html_pdfs, latex_pdfs = pdf_merger.convert_all(html_docs, latex_docs)
+        show_events(reporter.drain())
         
         progress_bar.progress(85)
         
-        # Step 6: Generate Excel outputs
+        # Step 5: Generate Excel outputs
         status_text.text("📊 Creating Excel outputs...")
-        excel_outputs = doc_generator.generate_excel_outputs(data)
+        excel_outputs = doc_generator.generate_excel_outputs(data, single_workbook=single_workbook)
+        show_events(reporter.drain())
         
         progress_bar.progress(95)
         
-        # Step 7: Package everything
+        # Step 6: Package everything
         status_text.text("📦 Packaging documents...")
-        packager = ZipPackager()
+        packager = ZipPackager(reporter)
         
         # Generate smart filename with project name and timestamp
         project_name = data.get('project_name', 'Infrastructure_Project')
@@ -315,6 +333,7 @@ def process_file(uploaded_file):
             excel_outputs=excel_outputs,
             filename=zip_filename
         )
+        show_events(reporter.drain())
         
         progress_bar.progress(100)
         status_text.text("✅ Processing complete!")
@@ -524,10 +543,15 @@ def main():
         file_size = len(uploaded_file.getvalue()) / (1024 * 1024)  # Convert to MB
         st.success(f"✅ File uploaded successfully: {uploaded_file.name} ({file_size:.2f} MB)")
         
+        single_workbook = st.checkbox(
+            "📊 Combine Excel summaries into one workbook",
+            help="Write all summaries as sheets of a single Excel file"
+        )
+        
         # Process button
         if st.button("🚀 Generate Documents", type="primary", use_container_width=True):
             with st.spinner("Processing your file..."):
-                results = process_file(uploaded_file)
+                results = process_file(uploaded_file, single_workbook=single_workbook)
                 
                 if results:
                     # Store results in session state for persistence
@@ -14,11 +14,15 @@ from .document_generator import DocumentGenerator
 from .latex_generator import LaTeXGenerator
 from .pdf_merger import PDFMerger
 from .zip_packager import ZipPackager
+from .progress import ProgressEvent, ProgressReporter, CollectingReporter
 
 __all__ = [
     'ExcelProcessor',
     'DocumentGenerator', 
     'LaTeXGenerator',
     'PDFMerger',
-    'ZipPackager'
+    'ZipPackager',
+    'ProgressEvent',
+    'ProgressReporter',
+    'CollectingReporter'
 ]
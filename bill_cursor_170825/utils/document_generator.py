@@ -1,9 +1,20 @@
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import pandas as pd
 from jinja2 import Environment, FileSystemLoader, Template, StrictUndefined
-import streamlit as st
 from datetime import datetime
+from io import BytesIO
+
+from .progress import ProgressReporter
+
+try:
+    import xlsxwriter
+except ImportError:
+    # Fall back to openpyxl's write-only mode
+    xlsxwriter = None
+
+# Number format applied to numeric columns of Excel summaries
+EXCEL_NUMBER_FORMAT = '#,##0.00'
 
 class DocumentGenerator:
     """
@@ -11,7 +22,8 @@ class DocumentGenerator:
     Uses Jinja2 templates for professional document formatting.
     """
     
-    def __init__(self):
+    def __init__(self, reporter: Optional[ProgressReporter] = None):
+        self.reporter = reporter or ProgressReporter()
         self.template_dir = os.path.abspath("templates/html")
         
         # Document templates mapping
@@ -74,13 +86,13 @@ class DocumentGenerator:
                     if html_content:
                         documents[doc_name] = html_content
                 except Exception as e:
-                    st.warning(f"⚠️ Could not generate {doc_name}: {str(e)}")
+                    self.reporter.warning(f"⚠️ Could not generate {doc_name}: {str(e)}")
                     continue
             
             return documents
             
         except Exception as e:
-            st.error(f"❌ Error generating documents: {str(e)}")
+            self.reporter.error(f"❌ Error generating documents: {str(e)}")
             return {}
     
     def _generate_document(self, doc_name: str, template_name: str, data: Dict[str, Any]) -> str:
@@ -111,7 +123,7 @@ class DocumentGenerator:
             
         except Exception as e:
             error_msg = f"Error generating {doc_name} from template {template_name}: {str(e)}"
-            st.error(error_msg)
+            self.reporter.error(error_msg)
             # Return an error message that will be visible in the output
             return f"<div style='color: red; padding: 1em; border: 1px solid red;'>{error_msg}</div>"
     
@@ -239,134 +251,174 @@ class DocumentGenerator:
             'quality_status': 'Approved and accepted'
         }
     
-    def generate_excel_outputs(self, data: Dict[str, Any]) -> Dict[str, bytes]:
+    def generate_excel_outputs(self, data: Dict[str, Any], single_workbook: bool = False) -> Dict[str, bytes]:
         """
         Generate Excel outputs for each document template.
         
         Args:
             data: Processed data from ExcelProcessor
+            single_workbook: Write every summary as a sheet of one workbook
+                (returned under 'bill_summaries') instead of one file each
             
         Returns:
             Dictionary with document names as keys and Excel file bytes as values
         """
-        excel_outputs = {}
-        
         try:
-            # Generate Excel for bill items
-            if 'bill_items' in data and data['bill_items']:
-                excel_outputs['bill_items'] = self._create_excel_from_data(
-                    data['bill_items'], 
-                    'Bill Items Summary'
-                )
-            
-            # Generate Excel for extra items
-            if 'extra_items' in data and data['extra_items']:
-                excel_outputs['extra_items'] = self._create_excel_from_data(
-                    data['extra_items'],
-                    'Extra Items Summary'
-                )
+            summaries = self._collect_excel_summaries(data)
             
-            # Generate Excel for deviation analysis
-            deviation_data = self._prepare_deviation_data(data)
-            if deviation_data.get('deviations'):
-                excel_outputs['deviation_analysis'] = self._create_excel_from_data(
-                    deviation_data['deviations'],
-                    'Deviation Analysis'
-                )
+            if single_workbook:
+                return {'bill_summaries': self._write_workbook(
+                    {sheet_name: rows for sheet_name, rows in summaries.values()}
+                )}
             
-            # Generate Excel for financial summary
-            financial_summary = [
-                {
-                    'Category': 'Main Items Total',
-                    'Amount': data.get('bill_total', 0.0)
-                },
-                {
-                    'Category': 'Main Items Premium',
-                    'Amount': data.get('bill_premium', 0.0)
-                },
-                {
-                    'Category': 'Main Items Grand Total',
-                    'Amount': data.get('bill_grand_total', 0.0)
-                },
-                {
-                    'Category': 'Extra Items Total',
-                    'Amount': data.get('extra_items_total', 0.0)
-                },
-                {
-                    'Category': 'Extra Items Premium',
-                    'Amount': data.get('extra_premium', 0.0)
-                },
-                {
-                    'Category': 'Extra Items Grand Total',
-                    'Amount': data.get('extra_items_sum', 0.0)
-                },
-                {
-                    'Category': 'Final Payable Amount',
-                    'Amount': data.get('total_amount', 0.0)
-                }
-            ]
-            
-            excel_outputs['financial_summary'] = self._create_excel_from_data(
-                financial_summary,
-                'Financial Summary'
-            )
-            
-            return excel_outputs
+            return {
+                name: self._create_excel_from_data(rows, sheet_name)
+                for name, (sheet_name, rows) in summaries.items()
+            }
             
         except Exception as e:
-            st.warning(f"⚠️ Could not generate all Excel outputs: {str(e)}")
+            self.reporter.warning(f"⚠️ Could not generate all Excel outputs: {str(e)}")
             return {}
     
+    def _collect_excel_summaries(self, data: Dict[str, Any]) -> Dict[str, tuple]:
+        """Summary tables to export, as name -> (sheet name, rows)."""
+        summaries = {}
+        
+        # Bill items
+        if 'bill_items' in data and data['bill_items']:
+            summaries['bill_items'] = ('Bill Items Summary', data['bill_items'])
+        
+        # Extra items
+        if 'extra_items' in data and data['extra_items']:
+            summaries['extra_items'] = ('Extra Items Summary', data['extra_items'])
+        
+        # Deviation analysis
+        deviation_data = self._prepare_deviation_data(data)
+        if deviation_data.get('deviations'):
+            summaries['deviation_analysis'] = ('Deviation Analysis', deviation_data['deviations'])
+        
+        # Financial summary
+        financial_summary = [
+            {'Category': 'Main Items Total', 'Amount': data.get('bill_total', 0.0)},
+            {'Category': 'Main Items Premium', 'Amount': data.get('bill_premium', 0.0)},
+            {'Category': 'Main Items Grand Total', 'Amount': data.get('bill_grand_total', 0.0)},
+            {'Category': 'Extra Items Total', 'Amount': data.get('extra_items_total', 0.0)},
+            {'Category': 'Extra Items Premium', 'Amount': data.get('extra_premium', 0.0)},
+            {'Category': 'Extra Items Grand Total', 'Amount': data.get('extra_items_sum', 0.0)},
+            {'Category': 'Final Payable Amount', 'Amount': data.get('total_amount', 0.0)}
+        ]
+        summaries['financial_summary'] = ('Financial Summary', financial_summary)
+        
+        return summaries
+    
     def _create_excel_from_data(self, data_list: List[Dict], sheet_name: str) -> bytes:
         """Create Excel file from data list."""
         try:
-            # Create DataFrame from data
-            df = pd.DataFrame(data_list)
+            return self._write_workbook({sheet_name: data_list})
+        except Exception as e:
+            self.reporter.warning(f"⚠️ Could not create Excel file for {sheet_name}: {str(e)}")
+            return b''
+    
+    def _write_workbook(self, sheets: Dict[str, List[Dict]]) -> bytes:
+        """
+        Write one or more tables to a workbook in a single streaming pass.
+        
+        Uses xlsxwriter in constant-memory mode when installed, otherwise
+        openpyxl's write-only workbook. Header style, number formats and
+        column widths are computed once per column from the DataFrame
+        rather than by visiting every cell afterwards.
+        """
+        frames = {sheet_name[:31]: pd.DataFrame(rows) for sheet_name, rows in sheets.items()}
+        if xlsxwriter is not None:
+            return self._write_workbook_xlsxwriter(frames)
+        return self._write_workbook_openpyxl(frames)
+    
+    @staticmethod
+    def _column_layout(df: pd.DataFrame) -> List[tuple]:
+        """(width, is_numeric) for each column of a table."""
+        layout = []
+        for column in df.columns:
+            values = df[column]
+            lengths = values.astype(str).str.len()
+            max_length = max(len(str(column)), int(lengths.max()) if len(lengths) else 0)
+            is_numeric = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+            layout.append((min(max_length + 2, 50), is_numeric))
+        return layout
+    
+    @staticmethod
+    def _cell_rows(df: pd.DataFrame):
+        """Rows of plain Python values with NaN written as empty cells."""
+        return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    
+    def _write_workbook_xlsxwriter(self, frames: Dict[str, pd.DataFrame]) -> bytes:
+        output = BytesIO()
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True, 'default_date_format': 'dd/mm/yyyy'
+        })
+        header_format = workbook.add_format({
+            'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#4CAF50', 'align': 'center'
+        })
+        number_format = workbook.add_format({'num_format': EXCEL_NUMBER_FORMAT})
+        
+        for sheet_name, df in frames.items():
+            worksheet = workbook.add_worksheet(sheet_name)
+            for col, (width, is_numeric) in enumerate(self._column_layout(df)):
+                worksheet.set_column(col, col, width, number_format if is_numeric else None)
             
-            # Create Excel writer
-            from io import BytesIO
-            output = BytesIO()
+            # constant_memory requires rows to be written in order
+            worksheet.write_row(0, 0, [str(column) for column in df.columns], header_format)
+            for row_idx, row in enumerate(self._cell_rows(df), start=1):
+                worksheet.write_row(row_idx, 0, row)
+        
+        workbook.close()
+        return output.getvalue()
+    
+    def _write_workbook_openpyxl(self, frames: Dict[str, pd.DataFrame]) -> bytes:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+        
+        workbook = Workbook(write_only=True)
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
+        header_alignment = Alignment(horizontal="center")
+        
+        for sheet_name, df in frames.items():
+            worksheet = workbook.create_sheet(sheet_name)
+            layout = self._column_layout(df)
+            for col, (width, _) in enumerate(layout, start=1):
+                worksheet.column_dimensions[get_column_letter(col)].width = width
             
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-                
-                # Get workbook and worksheet for formatting
-                workbook = writer.book
-                worksheet = writer.sheets[sheet_name]
-                
-                # Apply basic formatting
-                from openpyxl.styles import Font, PatternFill, Alignment
-                
-                # Header formatting
-                header_font = Font(bold=True, color="FFFFFF")
-                header_fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-                
-                for cell in worksheet[1]:
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal="center")
-                
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+            header = []
+            for column in df.columns:
+                cell = WriteOnlyCell(worksheet, value=str(column))
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = header_alignment
+                header.append(cell)
+            worksheet.append(header)
             
-            output.seek(0)
-            return output.getvalue()
+            numeric_columns = [col for col, (_, is_numeric) in enumerate(layout) if is_numeric]
+            if not numeric_columns:
+                for row in self._cell_rows(df):
+                    worksheet.append(row)
+                continue
             
-        except Exception as e:
-            st.warning(f"⚠️ Could not create Excel file for {sheet_name}: {str(e)}")
-            return b''
+            # Write-only sheets have no column styles, so only numeric cells
+            # are wrapped to carry the column's number format
+            for row in self._cell_rows(df):
+                row = list(row)
+                for col in numeric_columns:
+                    if row[col] is not None:
+                        cell = WriteOnlyCell(worksheet, value=row[col])
+                        cell.number_format = EXCEL_NUMBER_FORMAT
+                        row[col] = cell
+                worksheet.append(row)
+        
+        output = BytesIO()
+        workbook.save(output)
+        return output.getvalue()
     
     def _get_builtin_template(self, doc_name: str) -> str:
         """Get built-in template content as fallback."""
@@ -1,15 +1,58 @@
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-import streamlit as st
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import traceback
 
+from .progress import ProgressReporter
+
+# Text cells that stand for "no value" in numeric columns
+NULL_NUMERIC_TOKENS = ['', 'nil', 'na', 'n/a', '-', 'above', 'below']
+
+# Title sheet fields, checked in order; the first rule matching a row wins
+TITLE_FIELD_RULES = [
+    ('agreement_no', [['agreement'], ['contract']]),
+    ('name_of_work', [['name of work'], ['project']]),
+    ('name_of_firm', [['firm'], ['contractor']]),
+    ('date_commencement', [['commencement']]),
+    ('date_completion', [['completion', 'schedule']]),
+    ('actual_completion', [['actual', 'completion']]),
+]
+
+
+def normalize_header(header: Any) -> str:
+    """Casefold a header and collapse internal whitespace."""
+    return ' '.join(str(header).split()).casefold()
+
+
+@lru_cache(maxsize=256)
+def _resolve_layout(synonym_lookup: Tuple[Tuple[str, str, int], ...],
+                    header_signature: Tuple[str, ...]) -> Dict[str, int]:
+    """Resolve standard field -> column index for one header signature.
+
+    Cached, so bills sharing a header layout skip detection entirely. For each
+    field the synonym listed first wins; among identical headers the last one
+    wins.
+    """
+    lookup = {synonym: (std_name, priority) for synonym, std_name, priority in synonym_lookup}
+    best: Dict[str, Tuple[int, int]] = {}
+    for index, header in enumerate(header_signature):
+        match = lookup.get(header)
+        if match is None:
+            continue
+        std_name, priority = match
+        if std_name not in best or priority <= best[std_name][0]:
+            best[std_name] = (priority, index)
+    return {std_name: index for std_name, (priority, index) in best.items()}
+
 class ExcelProcessor:
     """
     Utility class for processing Excel files and extracting billing data.
     Handles multiple sheets with flexible column name mapping and robust error handling.
     """
     
-    def __init__(self):
+    def __init__(self, reporter: Optional[ProgressReporter] = None):
+        self.reporter = reporter or ProgressReporter()
         self.required_sheets = ['Title', 'Work Order', 'Bill Quantity']
         self.optional_sheets = ['Extra Items']
         
@@ -24,6 +67,8 @@ class ExcelProcessor:
             'amount': ['Amount', 'Total Amount', 'Total'],
             'remark': ['Remark', 'Remarks', 'Comments', 'Notes']
         }
+        self.numeric_fields = ['quantity', 'quantity_bill', 'rate', 'amount']
+        self._synonym_lookup = self._compile_column_mappings(self.column_mappings)
     
     def process_file(self, uploaded_file) -> Optional[Dict[str, Any]]:
         """
@@ -42,7 +87,7 @@ class ExcelProcessor:
             # Validate required sheets
             missing_sheets = [sheet for sheet in self.required_sheets if sheet not in excel_data.keys()]
             if missing_sheets:
-                st.error(f"❌ Missing required sheets: {', '.join(missing_sheets)}")
+                self.reporter.error(f"❌ Missing required sheets: {', '.join(missing_sheets)}")
                 return None
             
             # Process each sheet
@@ -75,8 +120,8 @@ class ExcelProcessor:
             return processed_data
             
         except Exception as e:
-            st.error(f"❌ Error processing Excel file: {str(e)}")
-            st.error("🔍 Please check your file format and ensure all required sheets are present.")
+            self.reporter.error(f"❌ Error processing Excel file: {str(e)}")
+            self.reporter.error("🔍 Please check your file format and ensure all required sheets are present.")
             return None
     
     def _process_title_sheet(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
@@ -84,31 +129,32 @@ class ExcelProcessor:
         try:
             project_info = {}
             
-            # Convert DataFrame to list of lists for header processing
-            header_rows = []
-            for index, row in df.iterrows():
-                row_data = [str(cell).strip() if pd.notna(cell) else '' for cell in row.values]
-                if any(cell for cell in row_data):  # Skip empty rows
-                    header_rows.append(row_data)
+            # Stringify all cells at once and drop empty rows
+            cells = df.astype(object).where(df.notna(), '').astype(str)
+            cells = cells.apply(lambda col: col.str.strip())
+            cells = cells[(cells != '').any(axis=1)]
+            header_rows = cells.values.tolist()
             
             # Extract key project information
             project_info['header'] = header_rows
             
             # Try to extract specific fields if available
-            for row in header_rows:
-                row_text = ' '.join(row).lower()
-                if 'agreement' in row_text or 'contract' in row_text:
-                    project_info['agreement_no'] = ' '.join(row)
-                elif 'name of work' in row_text or 'project' in row_text:
-                    project_info['name_of_work'] = ' '.join(row)
-                elif 'firm' in row_text or 'contractor' in row_text:
-                    project_info['name_of_firm'] = ' '.join(row)
-                elif 'commencement' in row_text:
-                    project_info['date_commencement'] = ' '.join(row)
-                elif 'completion' in row_text and 'schedule' in row_text:
-                    project_info['date_completion'] = ' '.join(row)
-                elif 'actual' in row_text and 'completion' in row_text:
-                    project_info['actual_completion'] = ' '.join(row)
+            if header_rows:
+                row_texts = cells.agg(' '.join, axis=1).str.lower()
+                matched_rule = np.full(len(row_texts), -1)
+                for rule_index, (field, alternatives) in enumerate(TITLE_FIELD_RULES):
+                    mask = np.zeros(len(row_texts), dtype=bool)
+                    for terms in alternatives:
+                        term_mask = np.ones(len(row_texts), dtype=bool)
+                        for term in terms:
+                            term_mask &= row_texts.str.contains(term, regex=False).to_numpy()
+                        mask |= term_mask
+                    matched_rule[mask & (matched_rule == -1)] = rule_index
+                
+                for rule_index, (field, _) in enumerate(TITLE_FIELD_RULES):
+                    rows = np.flatnonzero(matched_rule == rule_index)
+                    if rows.size:
+                        project_info[field] = ' '.join(header_rows[rows[-1]])
             
             # Extract project name for smart filename generation
             if 'name_of_work' in project_info:
@@ -123,7 +169,7 @@ class ExcelProcessor:
             return project_info
             
         except Exception as e:
-            st.warning(f"⚠️ Could not process Title sheet completely: {str(e)}")
+            self.reporter.warning(f"⚠️ Could not process Title sheet completely: {str(e)}")
             return {'project_name': 'Infrastructure_Project'}
     
     def _process_work_order_sheet(self, df: pd.DataFrame) -> Optional[List[Dict[str, Any]]]:
@@ -131,7 +177,7 @@ class ExcelProcessor:
         try:
             return self._process_standard_sheet(df, 'Work Order')
         except Exception as e:
-            st.warning(f"⚠️ Could not process Work Order sheet: {str(e)}")
+            self.reporter.warning(f"⚠️ Could not process Work Order sheet: {str(e)}")
             return []
     
     def _process_bill_quantity_sheet(self, df: pd.DataFrame) -> Optional[List[Dict[str, Any]]]:
@@ -139,7 +185,7 @@ class ExcelProcessor:
         try:
             return self._process_standard_sheet(df, 'Bill Quantity')
         except Exception as e:
-            st.warning(f"⚠️ Could not process Bill Quantity sheet: {str(e)}")
+            self.reporter.warning(f"⚠️ Could not process Bill Quantity sheet: {str(e)}")
             return []
     
     def _process_extra_items_sheet(self, df: pd.DataFrame) -> Optional[List[Dict[str, Any]]]:
@@ -147,7 +193,7 @@ class ExcelProcessor:
         try:
             return self._process_standard_sheet(df, 'Extra Items')
         except Exception as e:
-            st.warning(f"⚠️ Could not process Extra Items sheet: {str(e)}")
+            self.reporter.warning(f"⚠️ Could not process Extra Items sheet: {str(e)}")
             return []
     
     def _process_standard_sheet(self, df: pd.DataFrame, sheet_name: str) -> List[Dict[str, Any]]:
@@ -159,89 +205,62 @@ class ExcelProcessor:
         if df.empty:
             return []
         
-        # Get column headers and create mapping
-        headers = [str(col).strip() for col in df.columns]
-        column_map = self._create_column_mapping(headers)
+        # Resolve (or reuse) the column layout for this header signature
+        layout = self._get_column_layout(df.columns)
         
-        items = []
+        # Skip rows that appear to be headers or empty
+        first_col = df.iloc[:, 0]
+        df = df[first_col.notna() & (first_col.astype(str).str.strip() != '')]
+        if df.empty:
+            return []
         
-        for index, row in df.iterrows():
-            # Skip rows that appear to be headers or empty
-            if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == '':
-                continue
-            
-            item = {}
-            
-            # Map columns to standardized names
-            for std_name, possible_names in self.column_mappings.items():
-                value = None
-                for possible_name in possible_names:
-                    if possible_name in column_map:
-                        col_index = column_map[possible_name]
-                        if col_index < len(row):
-                            value = row.iloc[col_index]
-                            break
-                
-                # Process the value based on type
-                if std_name in ['quantity', 'quantity_bill', 'rate', 'amount']:
-                    item[std_name] = self._safe_numeric_conversion(value)
-                else:
-                    item[std_name] = str(value).strip() if pd.notna(value) else ''
-            
-            # Only add item if it has meaningful data
-            if item.get('description') or item.get('item_no'):
-                items.append(item)
+        columns = {}
+        for std_name in self.column_mappings:
+            col_index = layout.get(std_name)
+            column = df.iloc[:, col_index] if col_index is not None else pd.Series(None, index=df.index, dtype=object)
+            if std_name in self.numeric_fields:
+                columns[std_name] = self._numeric_column(column)
+            else:
+                columns[std_name] = column.astype(object).where(column.notna(), '').astype(str).str.strip()
         
-        return items
-    
-    def _create_column_mapping(self, headers: List[str]) -> Dict[str, int]:
-        """Create mapping between possible column names and their indices."""
-        column_map = {}
+        items = pd.DataFrame(columns, index=df.index)
         
-        for i, header in enumerate(headers):
-            # Try exact match first
-            for std_name, possible_names in self.column_mappings.items():
-                if header in possible_names:
-                    column_map[header] = i
-                    break
-            else:
-                # Try partial match
-                header_lower = header.lower()
-                for std_name, possible_names in self.column_mappings.items():
-                    for possible_name in possible_names:
-                        if possible_name.lower() in header_lower or header_lower in possible_name.lower():
-                            column_map[header] = i
-                            break
+        # Only add item if it has meaningful data
+        items = items[(items['description'] != '') | (items['item_no'] != '')]
         
-        return column_map
+        return items.to_dict('records')
+    
+    def _compile_column_mappings(self, column_mappings: Dict[str, List[str]]) -> Tuple[Tuple[str, str, int], ...]:
+        """Compile the synonym table into a normalized (synonym, field, priority) lookup."""
+        lookup = {}
+        for std_name, possible_names in column_mappings.items():
+            for priority, possible_name in enumerate(possible_names):
+                lookup.setdefault(normalize_header(possible_name), (std_name, priority))
+        return tuple(sorted((synonym, std_name, priority) for synonym, (std_name, priority) in lookup.items()))
+    
+    def _get_column_layout(self, headers) -> Dict[str, int]:
+        """Map standard field names to column indices for the given headers."""
+        header_signature = tuple(normalize_header(header) for header in headers)
+        return _resolve_layout(self._synonym_lookup, header_signature)
+    
+    def _create_column_mapping(self, headers: List[str]) -> Dict[str, int]:
+        """Create mapping between standard field names and their column indices."""
+        return dict(self._get_column_layout(headers))
+    
+    def _numeric_column(self, column: pd.Series) -> pd.Series:
+        """Convert a whole column to float, handling currency text and placeholders."""
+        numeric = pd.to_numeric(column, errors='coerce')
+        unparsed = numeric.isna() & column.notna()
+        if unparsed.any():
+            text = column[unparsed].astype(str).str.strip().str.lower()
+            text = text.where(~text.isin(NULL_NUMERIC_TOKENS), '')
+            text = text.str.replace('rs', '', regex=False).str.replace(r'[^\d.\-]', '', regex=True)
+            numeric[unparsed] = pd.to_numeric(text, errors='coerce')
+        return numeric.fillna(0.0).astype(float)
     
     def _safe_numeric_conversion(self, value) -> float:
         """Safely convert value to numeric, handling various formats and errors."""
-        if pd.isna(value):
-            return 0.0
-        
-        try:
-            # Handle string values
-            if isinstance(value, str):
-                # Remove common non-numeric text
-                cleaned = value.strip().lower()
-                if cleaned in ['', 'nil', 'na', 'n/a', '-', 'above', 'below']:
-                    return 0.0
-                
-                # Remove currency symbols and commas
-                cleaned = cleaned.replace('₹', '').replace(',', '').replace('rs', '').replace('.', '')
-                cleaned = ''.join(c for c in cleaned if c.isdigit() or c in '.-')
-                
-                if cleaned:
-                    return float(cleaned)
-                else:
-                    return 0.0
-            
-            # Handle numeric values
-            return float(value)
-            
-        except (ValueError, TypeError):
-            return 0.0
+        return float(self._numeric_column(pd.Series([value], dtype=object)).iloc[0])
     
     def _calculate_totals(self, data: Dict[str, Any]):
         """Calculate various totals and derived values."""
@@ -288,7 +307,7 @@ class ExcelProcessor:
             data['total_amount'] = data['bill_grand_total'] + data['extra_items_sum']
             
         except Exception as e:
-            st.warning(f"⚠️ Could not calculate all totals: {str(e)}")
+            self.reporter.warning(f"⚠️ Could not calculate all totals: {str(e)}")
             # Set safe defaults
             data.setdefault('bill_total', 0.0)
             data.setdefault('extra_items_total', 0.0)
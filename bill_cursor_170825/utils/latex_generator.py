@@ -2,16 +2,18 @@ import os
 import subprocess
 from typing import Dict, List, Any, Optional
 from jinja2 import Environment, FileSystemLoader, Template, TemplateError
-import streamlit as st
 from datetime import datetime
 
+from .progress import ProgressReporter
+
 class LaTeXGenerator:
     """
     Utility class for generating LaTeX documents with Jinja2 templating.
     Handles template rendering and LaTeX compilation.
     """
     
-    def __init__(self):
+    def __init__(self, reporter: Optional[ProgressReporter] = None):
+        self.reporter = reporter or ProgressReporter()
         self.template_dir = "templates/latex"
         self.output_dir = "rendered_latex"
         
@@ -87,7 +89,7 @@ class LaTeXGenerator:
             template = self.env.get_template(template_name)
             return template.render(data=data)
         except TemplateError as e:
-            st.error(f"Error rendering template {template_name}: {str(e)}")
+            self.reporter.error(f"Error rendering template {template_name}: {str(e)}")
             raise
     
     def render_all_templates(self, data: Dict[str, Any]) -> Dict[str, str]:
@@ -104,7 +106,7 @@ class LaTeXGenerator:
         for name, template_file in self.document_templates.items():
             try:
                 if not os.path.exists(self._get_template_path(template_file)):
-                    st.warning(f"Template {template_file} not found, skipping...")
+                    self.reporter.warning(f"Template {template_file} not found, skipping...")
                     continue
                     
                 content = self.render_template(template_file, data)
@@ -114,14 +116,37 @@ class LaTeXGenerator:
                     f.write(content)
                 
                 rendered[name] = output_path
-                st.success(f"Rendered {template_file}")
+                self.reporter.success(f"Rendered {template_file}")
                 
             except Exception as e:
-                st.error(f"Failed to render {template_file}: {str(e)}")
+                self.reporter.error(f"Failed to render {template_file}: {str(e)}")
                 continue
                 
         return rendered
     
+    def render_documents(self, data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Render all LaTeX templates to source strings without writing or compiling them.
+        
+        Args:
+            data: Dictionary containing template variables
+            
+        Returns:
+            Dictionary mapping document names to rendered LaTeX content
+        """
+        rendered = {}
+        for name, template_file in self.document_templates.items():
+            try:
+                if not os.path.exists(self._get_template_path(template_file)):
+                    self.reporter.warning(f"Template {template_file} not found, skipping...")
+                    continue
+                rendered[name] = self.render_template(template_file, data)
+            except Exception as e:
+                self.reporter.error(f"Failed to render {template_file}: {str(e)}")
+                continue
+        
+        return rendered
+    
     def compile_latex(self, tex_file: str) -> Optional[str]:
         """
         Compile a LaTeX file to PDF using xelatex.
@@ -144,15 +169,14 @@ class LaTeXGenerator:
                 )
                 
                 if result.returncode != 0:
-                    st.error(f"LaTeX compilation failed for {os.path.basename(tex_file)}:")
-                    st.text(result.stderr)
+                    self.reporter.error(f"LaTeX compilation failed for {os.path.basename(tex_file)}:", detail=result.stderr)
                     return None
             
             pdf_file = os.path.splitext(tex_file)[0] + '.pdf'
             return pdf_file if os.path.exists(pdf_file) else None
             
         except Exception as e:
-            st.error(f"Error compiling LaTeX: {str(e)}")
+            self.reporter.error(f"Error compiling LaTeX: {str(e)}")
             return None
     
     def process_all_documents(self, data: Dict[str, Any]) -> Dict[str, str]:
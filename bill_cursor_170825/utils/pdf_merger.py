@@ -1,179 +1,258 @@
 import os
+import shutil
 import subprocess
-from typing import Dict, Optional, Tuple, Union, BinaryIO
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 import tempfile
-import weasyprint
-from weasyprint.text.fonts import FontConfiguration
-import streamlit as st
+
+from .progress import ProgressReporter
+
+try:
+    import weasyprint
+    from weasyprint.text.fonts import FontConfiguration
+except (ImportError, OSError):
+    # WeasyPrint missing, or its native libraries (Pango) are not installed
+    weasyprint = None
+    FontConfiguration = None
+
+# Maximum number of conversions running at once, shared by every PDFMerger
+PDF_POOL_WORKERS = int(os.environ.get('PDF_POOL_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Seconds a single pdflatex run may take before it is killed
+LATEX_TIMEOUT = float(os.environ.get('LATEX_TIMEOUT', 120))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_conversion_pool() -> ProcessPoolExecutor:
+    """Return the process-wide pool used for HTML and LaTeX conversions."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_POOL_WORKERS)
+        return _pool
+
+
+def reset_conversion_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """Replace the shared pool after one of its workers died, unless another caller already did."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken or _pool is None:
+            broken.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=PDF_POOL_WORKERS)
+        return _pool
+
+
+def _weasyprint_options() -> dict:
+    """WeasyPrint rendering options (built per process; FontConfiguration is not picklable)."""
+    return {
+        'optimize_size': ('fonts', 'images'),
+        'font_config': FontConfiguration()
+    }
+
+
+def _render_html_pdf(html_content: str) -> bytes:
+    """Render an HTML string to PDF bytes. Runs in a pool worker."""
+    return weasyprint.HTML(string=html_content, encoding='utf-8').write_pdf(**_weasyprint_options())
+
+
+def _compile_latex_pdf(doc_name: str, latex_content: str, timeout: float = LATEX_TIMEOUT) -> bytes:
+    """Compile LaTeX source to PDF bytes in an isolated temp dir. Runs in a pool worker."""
+    with tempfile.TemporaryDirectory(prefix=f'latex_{doc_name}_') as temp_dir:
+        tex_filename = os.path.join(temp_dir, f"{doc_name}.tex")
+        with open(tex_filename, 'w', encoding='utf-8') as f:
+            f.write(latex_content)
+
+        try:
+            result = subprocess.run(
+                ['pdflatex', '-interaction=nonstopmode', '-halt-on-error', f"{doc_name}.tex"],
+                cwd=temp_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise TimeoutError(f"pdflatex did not finish within {timeout:g} seconds")
+
+        pdf_filename = os.path.join(temp_dir, f"{doc_name}.pdf")
+        if result.returncode != 0 or not os.path.exists(pdf_filename):
+            raise RuntimeError(result.stdout[-2000:] or result.stderr or "PDF not generated")
+
+        with open(pdf_filename, 'rb') as f:
+            return f.read()
+
+
+@lru_cache(maxsize=None)
+def _check_weasyprint() -> bool:
+    """Check once per process whether WeasyPrint can render."""
+    if weasyprint is None:
+        return False
+    try:
+        _render_html_pdf('<html><body>Test</body></html>')
+        return True
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _check_latex() -> bool:
+    """Check once per process whether pdflatex is installed and working."""
+    if shutil.which('pdflatex') is None:
+        return False
+    try:
+        result = subprocess.run(
+            ['pdflatex', '--version'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=10
+        )
+        return result.returncode == 0
+    except (subprocess.SubprocessError, OSError):
+        return False
+
 
 class PDFMerger:
     """
     Utility class for converting HTML and LaTeX documents to PDF format.
     Handles both HTML-to-PDF and LaTeX-to-PDF conversion with proper error handling.
+
+    Conversions run on a shared, bounded process pool: HTML is rendered by
+    WeasyPrint straight from the in-memory string and every LaTeX document is
+    compiled in its own temporary directory, so both kinds of job run side by
+    side and a package takes about as long as its slowest conversion.
     """
-    
-    def __init__(self):
+
+    def __init__(self, reporter: Optional[ProgressReporter] = None):
+        self.reporter = reporter or ProgressReporter()
         # Check for available PDF generation tools
-        self.weasyprint_available = self._check_weasyprint()
-        self.latex_available = self._check_latex()
-        
-        # Configure WeasyPrint with better defaults
-        self.weasyprint_config = {
-            'encoding': 'utf-8',
-            'image_dpi': 300,
-            'optimize_size': ('fonts', 'images'),
-            'font_config': FontConfiguration()
-        }
-    
-    def _check_weasyprint(self) -> bool:
-        """Check if WeasyPrint is available and properly configured."""
-        try:
-            import weasyprint
-            # Try a simple test render
-            weasyprint.HTML(string='<html><body>Test</body></html>').write_pdf(
-                target=None, **self.weasyprint_config)
-            return True
-        except Exception as e:
-            st.warning(f"WeasyPrint initialization warning: {str(e)}")
-            return False
-    
-    def _check_latex(self) -> bool:
-        """Check if LaTeX is installed and working."""
-        try:
-            # Try running pdflatex with --version
-            result = subprocess.run(
-                ['pdflatex', '--version'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,,
-                hel=T# Add dtfsnWws combdy
-    Args:
-        html_docs: Dictionary with document names as keys and HTML content as values
-        
-    Returns:
+        self.weasyprint_available = _check_weasyprint()
+        self.latex_available = _check_latex()
+        self.latex_timeout = LATEX_TIMEOUT  # seconds per pdflatex run
+
+    def convert_all(self, html_docs: Dict[str, str],
+                    latex_docs: Dict[str, str]) -> Tuple[Dict[str, bytes], Dict[str, bytes]]:
+        """
+        Convert HTML and LaTeX documents to PDF concurrently.
+
+        Args:
+            html_docs: Dictionary with document names as keys and HTML content as values
+            latex_docs: Dictionary with document names as keys and LaTeX content as values
+
+        Returns:
+            Tuple of (HTML PDFs, LaTeX PDFs), each keyed by document name
+        """
+        html_futures = self._submit_html(html_docs)
+        latex_futures = self._submit_latex(latex_docs)
+        return self._collect_html(html_futures), self._collect_latex(latex_futures)
+
+    def convert_html_to_pdf(self, html_docs: Dict[str, str]) -> Dict[str, bytes]:
+        """
+        Convert HTML documents to PDF using WeasyPrint.
+
+        Args:
+            html_docs: Dictionary with document names as keys and HTML content as values
+
+        Returns:
             Dictionary with document names as keys and PDF bytes as values
         """
-        pdf_docs = {}
-        
-        if not self.weasyprint_available:
-            st.error("""
-            ❌ WeasyPrint is not available for HTML to PDF conversion.
-            Please install it with: pip install weasyprint
-            """)
-            return {}
-        
-        try:
-            for doc_name, html_content in html_docs.items():
-                try:
-                    # Create a temporary file for the HTML content
-                    with tempfile.NamedTemporaryFile(suffix='.html', delete=False, mode='w', encoding='utf-8') as f:
-                        f.write(html_content)
-                        html_path = f.name
-                    
-                    try:
-                            filename=html_path,
-                            encoding='utf-8'
-                        ).write_pdf(**self.weasyprint_config)
-                        
-                        pdf_docs[doc_name] = pdf_bytes
-                        st.success(f"✅ Generated PDF from {doc_name}.html")
-                        
-                    except Exception as e:
-                        st.error(f"❌ Error converting {doc_name} to PDF: {str(e)}")
-                        # Create an error PDF
-                        error_pdf = self._create_error_pdf(f"Error generating {doc_name}", str(e))
-                        pdf_docs[f"{doc_name}_error"] = error_pdf
-                        
-                except Exception as e:
-                    st.error(f"❌ Error processing {doc_name}: {str(e)}")
-                    continue
-                    
-                finally:
-                    # Clean up temporary file
-                    try:
-                        if os.path.exists(html_path):
-                            os.unlink(html_path)
-                    except Exception:
-                        pass
-            
-            return pdf_docs
-            
-        except Exception as e:
-            st.error(f"❌ Fatal error in HTML to PDF conversion: {str(e)}")
-            return {}
-    
+        return self._collect_html(self._submit_html(html_docs))
+
     def convert_latex_to_pdf(self, latex_docs: Dict[str, str]) -> Dict[str, bytes]:
         """
-        Convert LaTeX documents to PDF using pdflatex/xelatex.
-        
+        Convert LaTeX documents to PDF using pdflatex.
+
         Args:
             latex_docs: Dictionary with document names as keys and LaTeX content as values
-            
+
         Returns:
             Dictionary with document names as keys and PDF bytes as values
         """
-        if not self.latex_available:
-            st.warning("""
-            ⚠️ LaTeX is not available for PDF generation.
-            Please install a TeX distribution like MiKTeX or TeX Live.
-            """)
+        return self._collect_latex(self._submit_latex(latex_docs))
+
+    def _submit_html(self, html_docs: Dict[str, str]) -> Optional[Dict[str, Future]]:
+        """Queue HTML conversions on the shared pool."""
+        if not html_docs:
             return {}
-        
+
+        if not self.weasyprint_available:
+            self.reporter.error("❌ WeasyPrint is not available for HTML to PDF conversion.",
+                                detail="Please install it with: pip install weasyprint")
+            return None
+
+        return self._submit({
+            doc_name: (_render_html_pdf, html_content)
+            for doc_name, html_content in html_docs.items()
+        })
+
+    def _submit_latex(self, latex_docs: Dict[str, str]) -> Optional[Dict[str, Future]]:
+        """Queue LaTeX compilations on the shared pool."""
+        if not latex_docs:
+            return {}
+
+        if not self.latex_available:
+            self.reporter.warning("⚠️ LaTeX is not available for PDF generation.",
+                                  detail="Please install a TeX distribution like MiKTeX or TeX Live.")
+            return None
+
+        return self._submit({
+            doc_name: (_compile_latex_pdf, doc_name, latex_content, self.latex_timeout)
+            for doc_name, latex_content in latex_docs.items()
+        })
+
+    def _submit(self, jobs: Dict[str, tuple]) -> Optional[Dict[str, Future]]:
+        """Queue (function, *args) jobs on the shared pool, rebuilding it once if a worker died."""
+        pool = get_conversion_pool()
+        for attempt in range(2):
+            try:
+                return {doc_name: pool.submit(*job) for doc_name, job in jobs.items()}
+            except BrokenProcessPool as e:
+                if attempt:
+                    self.reporter.error("❌ PDF conversion pool is not available.", detail=str(e))
+                    return None
+                pool = reset_conversion_pool(pool)
+
+    def _collect_html(self, futures: Optional[Dict[str, Future]]) -> Dict[str, bytes]:
+        """Wait for HTML conversions, replacing failures with an error PDF."""
         pdf_docs = {}
-        temp_dir = tempfile.mkdtemp()
-        
-        try:
-            for doc_name, latex_content in latex_docs.items():
-                try:
-                    # Create a temporary .tex file
-                    tex_filename = os.path.join(temp_dir, f"{doc_name}.tex")
-                    with open(tex_filename, 'w', encoding='utf-8') as f:
-                        f.write(latex_content)
-                    
-                    # Run LaTeX compilation
-                    result = subprocess.run(
-                        ['pdflatex', '-interaction=nonstopmode', tex_filename],
-                        cwd=temp_dir,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        shell=True  # Added for Windows compatibility
-                    )
-                    
-                    if result.returncode != 0:
-                        st.error(f"❌ LaTeX compilation failed for {doc_name}:")
-                        st.text(result.stderr)
-                        continue
-                    
-                    # Read the generated PDF
-                    pdf_filename = os.path.join(temp_dir, f"{doc_name}.pdf")
-                    if os.pa=True,
-                        shellth.ee  # Addxd for Windows compatibilityists(pdf_filename):
-                        with open(pdf_filename, 'rb') as f:
-                            pdf_docs[doc_name] = f.read()
-                        st.success(f"✅ Generated PDF from {doc_name}.tex")
-                    else:
-                        st.error(f"❌ PDF not generated for {doc_name}")
-                        
-                except Exception as e:
-                    st.error(f"❌ Error processing {doc_name}: {str(e)}")
-                    continue
-            
+        if not futures:
             return pdf_docs
-            
-        except Exception as e:
-            st.error(f"❌ Fatal error in LaTeX to PDF conversion: {str(e)}")
-            return {}
-            
-        finally:
-            # Clean up temporary files
+
+        for doc_name, future in futures.items():
             try:
-                for f in os.listdir(temp_dir):
-                    os.unlink(os.path.join(temp_dir, f))
-                os.rmdir(temp_dir)
-            except Exception:
-                pass
-    
+                pdf_docs[doc_name] = future.result()
+            except Exception as e:
+                self.reporter.error(f"❌ Error converting {doc_name} to PDF: {str(e)}")
+                pdf_docs[f"{doc_name}_error"] = self._create_error_pdf(f"Error generating {doc_name}", str(e))
+
+        if pdf_docs:
+            self.reporter.success(f"✅ Generated {len(pdf_docs)} PDF(s) from HTML")
+        return pdf_docs
+
+    def _collect_latex(self, futures: Optional[Dict[str, Future]]) -> Dict[str, bytes]:
+        """Wait for LaTeX compilations, reporting failures; timeouts get an error PDF."""
+        pdf_docs = {}
+        if not futures:
+            return pdf_docs
+
+        for doc_name, future in futures.items():
+            try:
+                pdf_docs[doc_name] = future.result()
+            except TimeoutError as e:
+                self.reporter.error(f"❌ LaTeX compilation timed out for {doc_name}:", detail=str(e))
+                pdf_docs[f"{doc_name}_error"] = self._create_error_pdf(f"Error generating {doc_name}", str(e))
+            except Exception as e:
+                self.reporter.error(f"❌ LaTeX compilation failed for {doc_name}:", detail=str(e))
+
+        if pdf_docs:
+            self.reporter.success(f"✅ Generated {len(pdf_docs)} PDF(s) from LaTeX")
+        return pdf_docs
+
     def _create_error_pdf(self, title: str, message: str) -> bytes:
         """Create a PDF with an error message."""
         html = f"""
@@ -183,9 +262,9 @@ class PDFMerger:
                 <style>
                     body {{ font-family: Arial, sans-serif; padding: 20px; }}
                     h1 {{ color: #d32f2f; }}
-                    pre {{ 
-                        background: #f5f5f5; 
-                        padding: 15px; 
+                    pre {{
+                        background: #f5f5f5;
+                        padding: 15px;
                         border-radius: 4px;
                         white-space: pre-wrap;
                         word-wrap: break-word;
@@ -199,19 +278,19 @@ class PDFMerger:
             </body>
         </html>
         """
-        
+
         try:
-            return weasyprint.HTML(string=html).write_pdf(**self.weasyprint_config)
+            return _render_html_pdf(html)
         except Exception:
             # Fallback to a minimal PDF if WeasyPrint fails
             try:
                 import io
                 from reportlab.pdfgen import canvas
-                
+
                 buffer = io.BytesIO()
                 p = canvas.Canvas(buffer)
                 p.drawString(100, 700, f"Error: {title}")
-                
+
                 # Handle long messages by splitting into lines
                 y = 680
                 for line in message.split('\n'):
@@ -220,11 +299,11 @@ class PDFMerger:
                         y = 750
                     p.drawString(100, y, line)
                     y -= 15
-                
+
                 p.save()
                 buffer.seek(0)
                 return buffer.read()
-                
+
             except Exception:
                 # Return an empty PDF as last resort
                 return b'%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj 2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj 3 0 obj<</Type/Page/Parent 2 0 R/Resources<</Font<</F1 4 0 R>>>>/MediaBox[0 0 612 792]/Contents 5 0 R>>endobj 4 0 obj<</Type/Font/Subtype/Type1/BaseFont/Helvetica/Encoding/WinAnsiEncoding>>endobj 5 0 obj<</Length 44>>stream BT/F1 12 Tf 50 700 Td(Error generating PDF) Tj ET endstream endobj xref 0 6 0000000000 65535 f 0000000015 00000 n 0000000069 00000 n 0000000119 00000 n 0000000223 00000 n 0000000346 00000 n trailer <</Size 6/Root 1 0 R>> startxref 595 %%EOF'
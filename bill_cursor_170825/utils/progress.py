@@ -0,0 +1,81 @@
+"""
+Progress reporting for the billing utilities.
+
+The processing classes report warnings, errors and completed steps through a
+ProgressReporter instead of calling Streamlit. The default reporter writes to
+the logging module, so the utilities run headless; the app passes a
+CollectingReporter and renders the buffered events once per processing step
+rather than making a UI round-trip for every document.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List
+
+LOG_LEVELS = {
+    'info': logging.INFO,
+    'success': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """One status message from a processing step."""
+    level: str  # 'info', 'success', 'warning' or 'error'
+    message: str
+    detail: str = ''
+    source: str = ''
+
+
+class ProgressReporter:
+    """Reporter that writes events to the log."""
+
+    def __init__(self, logger_name: str = 'billing'):
+        self.logger = logging.getLogger(logger_name)
+
+    def emit(self, level: str, message: str, detail: str = '', source: str = ''):
+        self.handle(ProgressEvent(level, message, detail, source))
+
+    def handle(self, event: ProgressEvent):
+        log_level = LOG_LEVELS.get(event.level, logging.INFO)
+        if not self.logger.isEnabledFor(log_level):
+            return
+        message = f"{event.source}: {event.message}" if event.source else event.message
+        if event.detail:
+            message = f"{message}\n{event.detail}"
+        self.logger.log(log_level, message)
+
+    def info(self, message: str, detail: str = '', source: str = ''):
+        self.emit('info', message, detail, source)
+
+    def success(self, message: str, detail: str = '', source: str = ''):
+        self.emit('success', message, detail, source)
+
+    def warning(self, message: str, detail: str = '', source: str = ''):
+        self.emit('warning', message, detail, source)
+
+    def error(self, message: str, detail: str = '', source: str = ''):
+        self.emit('error', message, detail, source)
+
+
+class CollectingReporter(ProgressReporter):
+    """Reporter that buffers events for the UI to render in batches."""
+
+    def __init__(self, logger_name: str = 'billing'):
+        super().__init__(logger_name)
+        self._events: List[ProgressEvent] = []
+        self._lock = threading.Lock()
+
+    def handle(self, event: ProgressEvent):
+        super().handle(event)
+        with self._lock:
+            self._events.append(event)
+
+    def drain(self) -> List[ProgressEvent]:
+        """Return and forget the events collected so far."""
+        with self._lock:
+            events, self._events = self._events, []
+        return events
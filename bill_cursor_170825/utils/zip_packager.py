@@ -3,7 +3,8 @@ import tempfile
 from typing import Dict, Optional
 from io import BytesIO
 from datetime import datetime
-import streamlit as st
+
+from .progress import ProgressReporter
 
 class ZipPackager:
     """
@@ -11,7 +12,8 @@ class ZipPackager:
     Creates a professional file structure with clear organization.
     """
     
-    def __init__(self):
+    def __init__(self, reporter: Optional[ProgressReporter] = None):
+        self.reporter = reporter or ProgressReporter()
         self.folder_structure = {
             'html_docs': '01_HTML_Documents',
             'latex_docs': '02_LaTeX_Templates', 
@@ -79,7 +81,7 @@ class ZipPackager:
             return zip_buffer.getvalue()
             
         except Exception as e:
-            st.error(f"❌ Error creating ZIP package: {str(e)}")
+            self.reporter.error(f"❌ Error creating ZIP package: {str(e)}")
             return b""
     
     def _add_readme_file(self, zip_file: zipfile.ZipFile):
@@ -296,5 +298,5 @@ System: Infrastructure Billing System v2.0
             return zip_buffer.getvalue()
             
         except Exception as e:
-            st.error(f"❌ Error creating simple ZIP package: {str(e)}")
+            self.reporter.error(f"❌ Error creating simple ZIP package: {str(e)}")
             return b""
@@ -3,7 +3,7 @@ import calendar
 import logging
 from typing import Optional, Union
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 class DateUtils:
     """Centralized date utility class for handling multiple date formats and operations."""
@@ -44,7 +44,7 @@ class DateUtils:
             except ValueError:
                 continue
                 
-        logging.warning(f"Unable to parse date: {date_str}")
+        logger.warning("Unable to parse date: %s", date_str)
         return None
     
     @classmethod
@@ -71,7 +71,7 @@ class DateUtils:
         try:
             return date_obj.strftime(output_format)
         except Exception as e:
-            logging.error(f"Error formatting date {date_obj}: {e}")
+            logger.error("Error formatting date %s: %s", date_obj, e)
             return ""
     
     @classmethod
@@ -165,7 +165,7 @@ class DateUtils:
                 raise ValueError(f"Unsupported time unit: {unit}")
                 
         except (ValueError, IndexError) as e:
-            logging.error(f"Error parsing time completion '{time_completion}': {e}")
+            logger.error("Error parsing time completion '%s': %s", time_completion, e)
             # Default to 3 months if parsing fails
             return cls.add_months(start_date, 3)
     
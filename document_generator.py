@@ -6,10 +6,10 @@ from docx.oxml.shared import OxmlElement, qn
 from datetime import datetime
 from typing import Dict, Any, List
 import io
-import logging
 from date_utils import DateUtils
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from bidder_ranking import rank_order, select_lowest
+from tender_statistics import summary_rows, tender_statistics
+from instrumentation import instrumented
 
 class DocumentGenerator:
     """Generates Word documents for tender processing system."""
@@ -32,13 +32,14 @@ class DocumentGenerator:
         
         tbl.tblPr.append(tblBorders)
     
+    @instrumented()
     def generate_comparative_statement_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate comparative statement in Word format matching PWD layout."""
         
         doc = Document()
         
         # Sort bidders by bid amount
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
+        sorted_bidders = rank_order(bidders)
         
         # Get work details
         work_name = work['work_name']
@@ -190,14 +191,14 @@ class DocumentGenerator:
         doc_buffer.seek(0)
         return doc_buffer.getvalue()
     
+    @instrumented()
     def generate_scrutiny_sheet_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate scrutiny sheet in Word format matching PWD layout."""
         
         doc = Document()
         
-        # Sort bidders by bid amount
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
-        lowest_bidder = sorted_bidders[0]
+        # L1 bidder (lowest bid)
+        lowest_bidder = select_lowest(bidders)
         
         # Get work details
         work_name = work['work_name']
@@ -268,14 +269,14 @@ class DocumentGenerator:
         doc_buffer.seek(0)
         return doc_buffer.getvalue()
     
+    @instrumented()
     def generate_letter_of_acceptance_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate Letter of Acceptance in Word format."""
         
         doc = Document()
         
-        # Sort bidders and get L1
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
-        l1_bidder = sorted_bidders[0]
+        # L1 bidder (lowest bid)
+        l1_bidder = select_lowest(bidders)
         
         # Get work details
         work_name = work['work_name']
@@ -355,14 +356,14 @@ class DocumentGenerator:
         doc_buffer.seek(0)
         return doc_buffer.getvalue()
     
+    @instrumented()
     def generate_work_order_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate Work Order in Word format."""
         
         doc = Document()
         
-        # Sort bidders and get L1
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
-        l1_bidder = sorted_bidders[0]
+        # L1 bidder (lowest bid)
+        l1_bidder = select_lowest(bidders)
         
         # Get work details
         work_name = work['work_name']
@@ -451,4 +452,53 @@ class DocumentGenerator:
         doc_buffer = io.BytesIO()
         doc.save(doc_buffer)
         doc_buffer.seek(0)
-        return doc_buffer.getvalue()
\ No newline at end of file
+        return doc_buffer.getvalue()    
+    @instrumented()
+    def generate_bid_analysis_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
+        """Generate the bid statistics, outliers and screening indicators in Word format."""
+        
+        doc = Document()
+        
+        estimated_cost = float(work['work_info']['estimated_cost'])
+        stats = tender_statistics(bidders, estimated_cost)
+        
+        title = doc.add_heading('Bid Analysis', level=1)
+        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        doc.add_paragraph(f"{work['work_name']}")
+        doc.add_paragraph(f"NIT No. {work['nit_number']}    Estimated Cost: Rs. {estimated_cost:,.0f}")
+        
+        def add_table(header: List[str], rows: List[List[str]]):
+            table = doc.add_table(rows=len(rows) + 1, cols=len(header))
+            table.alignment = WD_TABLE_ALIGNMENT.CENTER
+            self.set_table_borders(table)
+            for j, text in enumerate(header):
+                table.cell(0, j).text = text
+                table.cell(0, j).paragraphs[0].runs[0].bold = True
+            for i, row in enumerate(rows, 1):
+                for j, text in enumerate(row):
+                    table.cell(i, j).text = text
+        
+        add_table(['Statistic', 'Value'], [list(row) for row in summary_rows(stats)])
+        
+        doc.add_heading('Quoted Percentage Distribution', level=2)
+        add_table(['Quoted Percentage', 'Bidders'],
+                  [[f"{band['from']:+.1f}% to {band['to']:+.1f}%", str(band['count'])]
+                   for band in stats['percentage_histogram']])
+        
+        doc.add_heading('Outliers', level=2)
+        if stats['outliers']:
+            add_table(['Bidder', 'Bid Amount (Rs.)', '% Above/Below', 'Side'],
+                      [[outlier['name'], f"{outlier['bid_amount']:,.0f}", f"{outlier['percentage']:+.2f}%",
+                        outlier['side']] for outlier in stats['outliers']])
+        else:
+            doc.add_paragraph("No bids outside the interquartile fences.")
+        
+        doc.add_heading('Screening Indicators', level=2)
+        for flag in stats['flags'] or [{'message': "No bid-rigging indicators."}]:
+            doc.add_paragraph(flag['message'])
+        
+        # Save to bytes
+        doc_buffer = io.BytesIO()
+        doc.save(doc_buffer)
+        doc_buffer.seek(0)
+        return doc_buffer.getvalue()
@@ -3,8 +3,7 @@ import logging
 from typing import Dict, Any, Optional
 import re
 from date_utils import DateUtils
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from instrumentation import instrumented
 
 class ExcelParser:
     """Enhanced Excel parser with robust date handling for NIT documents."""
@@ -12,6 +11,7 @@ class ExcelParser:
     def __init__(self):
         self.date_utils = DateUtils()
     
+    @instrumented()
     def parse_nit_excel(self, file_path: str) -> Optional[Dict[str, Any]]:
         """
         Parse NIT Excel file and extract work information with enhanced date handling.
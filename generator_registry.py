@@ -0,0 +1,70 @@
+"""
+Generator Registry for Tender Processing System
+Loads generator modules on first use so heavy rendering backends
+(pandas, reportlab, python-docx, WeasyPrint) are not imported at startup
+"""
+
+import importlib
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+# Registry name -> (module, class)
+GENERATORS: Dict[str, Tuple[str, str]] = {
+    'excel_parser': ('excel_parser', 'ExcelParser'),
+    'comparative_statement': ('comparative_statement_generator', 'ComparativeStatementGenerator'),
+    'letter_acceptance': ('letter_acceptance_generator', 'LetterAcceptanceGenerator'),
+    'work_order': ('work_order_generator', 'WorkOrderGenerator'),
+    'scrutiny_sheet': ('scrutiny_sheet_generator', 'ScrutinySheetGenerator'),
+    'report': ('report_generator', 'ReportGenerator'),
+    'pdf': ('pdf_generator', 'PDFGenerator'),
+    'docx': ('document_generator', 'DocumentGenerator'),
+    'latex_pdf': ('latex_pdf_generator', 'LatexPDFGenerator'),
+    'latex': ('latex_generator', 'LaTeXGenerator'),
+    'zip': ('zip_generator', 'ZipGenerator'),
+}
+
+_import_lock = threading.Lock()
+
+# Shared instances handed out by get_generator()
+_instances: Dict[str, Any] = {}
+_instances_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_generator_class(name: str) -> type:
+    """Import and return the generator class registered under a name."""
+    if name not in GENERATORS:
+        raise KeyError(f"Unknown generator: {name}")
+    module_name, class_name = GENERATORS[name]
+    # Serialise first imports from concurrent sessions/jobs
+    with _import_lock:
+        module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+def create_generator(name: str, *args: Any, **kwargs: Any) -> Any:
+    """Create a new instance of a registered generator."""
+    return get_generator_class(name)(*args, **kwargs)
+
+
+def get_generator(name: str) -> Any:
+    """
+    Return the process-wide instance of a registered generator.
+
+    Generators keep no per-document state, so one instance (with its
+    stylesheets and date helpers built once) serves every rerun, session
+    and background job. Use create_generator() for a private instance.
+    """
+    generator = _instances.get(name)
+    if generator is None:
+        generator = create_generator(name)
+        with _instances_lock:
+            generator = _instances.setdefault(name, generator)
+    return generator
+
+
+def clear_generators():
+    """Drop the shared instances; the next get_generator() call builds fresh ones."""
+    with _instances_lock:
+        _instances.clear()
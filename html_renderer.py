@@ -0,0 +1,78 @@
+"""
+HTML Renderer for Tender Processing System
+One precompiled Jinja2 environment for the HTML tender documents
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined, Template
+
+# Document templates and the CSS partials they share
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'html_templates')
+
+# Template engine configuration (overridable through the environment)
+TEMPLATE_AUTO_RELOAD = os.environ.get('TENDER_TEMPLATE_AUTO_RELOAD', '0').lower() in ('1', 'true', 'yes')
+TEMPLATE_CACHE_DIR = os.environ.get(
+    'TENDER_TEMPLATE_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'tender_jinja_cache')
+)
+
+_environment: Optional[Environment] = None
+_templates: Dict[str, Template] = {}
+_lock = threading.Lock()
+
+
+def fmt(value: Any, spec: str = '') -> str:
+    """Jinja filter applying a Python format spec, e.g. {{ amount|fmt(',.0f') }}"""
+    return format(value, spec)
+
+
+def get_html_environment() -> Environment:
+    """Return the process-wide Jinja2 environment for the HTML documents.
+
+    Output is not autoescaped and whitespace is kept exactly as written, so
+    templates reproduce the documents the generators used to build inline.
+    Compiled templates are persisted with a FileSystemBytecodeCache so that
+    new processes skip parsing as well.
+    """
+    global _environment
+    with _lock:
+        if _environment is None:
+            bytecode_cache = None
+            try:
+                os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+            except OSError as e:
+                logging.getLogger(__name__).warning(f"Template bytecode cache disabled: {e}")
+            _environment = Environment(
+                loader=FileSystemLoader(TEMPLATES_DIR),
+                autoescape=False,
+                keep_trailing_newline=True,
+                undefined=StrictUndefined,
+                auto_reload=TEMPLATE_AUTO_RELOAD,
+                bytecode_cache=bytecode_cache,
+                cache_size=-1
+            )
+            _environment.filters['fmt'] = fmt
+        return _environment
+
+
+def get_template(name: str) -> Template:
+    """Compiled template by file name, loaded once per process."""
+    if TEMPLATE_AUTO_RELOAD:
+        return get_html_environment().get_template(name)
+    template = _templates.get(name)
+    if template is None:
+        template = get_html_environment().get_template(name)
+        with _lock:
+            template = _templates.setdefault(name, template)
+    return template
+
+
+def render(name: str, **context: Any) -> str:
+    """Render an HTML document template."""
+    return get_template(name).render(**context)
@@ -0,0 +1,288 @@
+"""
+Instrumentation for Tender Processing System
+Per-stage wall time, CPU time, peak RSS growth and output size for the pipeline,
+plus opt-in cProfile capture per job
+"""
+
+import cProfile
+import functools
+import json
+import logging
+import os
+import pstats
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# JSON-lines file every finished stage is appended to (unset: memory only)
+TENDER_PERF_LOG = os.environ.get('TENDER_PERF_LOG')
+# Stages kept in memory for the app summary panel
+PERF_HISTORY = int(os.environ.get('TENDER_PERF_HISTORY', 2000))
+# cProfile output directory for jobs profiled without an explicit one (TENDER_PROFILE=1)
+PROFILE_DIR = os.environ.get('TENDER_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'tender_profiles'))
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """High-water mark of this process's resident set size."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def output_size(value: Any) -> Optional[int]:
+    """Size in bytes of a stage's output: bytes, text, or a dict/list of documents."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)) and value and all(
+            isinstance(item, (bytes, bytearray, str)) for item in value):
+        return sum(output_size(item) for item in value)
+    return None
+
+
+def summarize(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-stage totals of stage records, slowest total wall time first."""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        entry = stages.setdefault(record['stage'], {
+            'stage': record['stage'], 'calls': 0, 'errors': 0, 'wall_ms': 0.0,
+            'max_wall_ms': 0.0, 'cpu_ms': 0.0, 'peak_rss_delta_kb': 0, 'output_bytes': 0,
+        })
+        entry['calls'] += 1
+        entry['errors'] += record['status'] != 'ok'
+        entry['wall_ms'] += record['wall_ms']
+        entry['max_wall_ms'] = max(entry['max_wall_ms'], record['wall_ms'])
+        entry['cpu_ms'] += record['cpu_ms']
+        entry['peak_rss_delta_kb'] += record['peak_rss_delta_kb'] or 0
+        entry['output_bytes'] += record['output_bytes'] or 0
+
+    rows = sorted(stages.values(), key=lambda entry: entry['wall_ms'], reverse=True)
+    for entry in rows:
+        entry['mean_wall_ms'] = round(entry['wall_ms'] / entry['calls'], 3)
+        entry['wall_ms'] = round(entry['wall_ms'], 3)
+        entry['cpu_ms'] = round(entry['cpu_ms'], 3)
+    return rows
+
+
+class PerfRecorder:
+    """
+    Collects stage records for this process.
+
+    Records are kept in a bounded in-memory buffer for the summary panel and,
+    when TENDER_PERF_LOG is set, appended to that file as JSON lines.
+    """
+
+    def __init__(self, log_path: Optional[str] = None, history: int = PERF_HISTORY):
+        self.log_path = log_path if log_path is not None else TENDER_PERF_LOG
+        self.logger = logging.getLogger(__name__)
+        self._records = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[str]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time a block of work as one stage.
+
+        The yielded record may be updated inside the block, e.g. with
+        ``record['output_bytes']`` when the output is not returned by a function.
+
+        Args:
+            name: Stage name, e.g. "PDFGenerator.generate_work_order_pdf"
+            **fields: Extra JSON-serialisable fields stored with the record
+        """
+        stack = self._stack()
+        record = {'stage': name, 'parent': stack[-1] if stack else None, 'output_bytes': None}
+        record.update(fields)
+
+        stack.append(name)
+        rss_before = _peak_rss_bytes()
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        record['status'] = 'error'
+        try:
+            yield record
+            record['status'] = 'ok'
+        finally:
+            record['wall_ms'] = round((time.perf_counter() - wall_start) * 1000, 3)
+            record['cpu_ms'] = round((time.thread_time() - cpu_start) * 1000, 3)
+            rss_after = _peak_rss_bytes()
+            record['peak_rss_delta_kb'] = (
+                (rss_after - rss_before) // 1024 if rss_before is not None else None)
+            record['timestamp'] = datetime.now().isoformat(timespec='milliseconds')
+            stack.pop()
+            self._add(record)
+
+    def _add(self, record: Dict[str, Any]):
+        with self._lock:
+            self._records.append(record)
+            if not self.log_path:
+                return
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, default=str) + '\n')
+            except OSError as e:
+                self.logger.warning(f"Could not write performance log {self.log_path}: {e}")
+                self.log_path = None
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Stage records in completion order."""
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-stage totals of the buffered records, slowest total wall time first."""
+        return summarize(self.records())
+
+    def export_jsonl(self, path: str) -> int:
+        """Write the buffered records to a JSON-lines file; return the count."""
+        records = self.records()
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + '\n')
+        return len(records)
+
+    def to_jsonl(self) -> str:
+        """Buffered records as JSON-lines text."""
+        return ''.join(json.dumps(record, default=str) + '\n' for record in self.records())
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+_recorder: Optional[PerfRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> PerfRecorder:
+    """Return the process-wide stage recorder."""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = PerfRecorder()
+        return _recorder
+
+
+def stage(name: str, **fields: Any):
+    """Context manager timing a block as a stage on the process-wide recorder."""
+    return get_recorder().stage(name, **fields)
+
+
+def instrumented(name: Optional[str] = None):
+    """
+    Decorator recording each call of a function as a stage.
+
+    The stage is named after the function's qualified name unless given, and
+    the return value's size (see output_size) is stored as output_bytes.
+    """
+    def decorator(func: Callable) -> Callable:
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name) as record:
+                result = func(*args, **kwargs)
+                record['output_bytes'] = output_size(result)
+            return result
+
+        return wrapper
+    return decorator
+
+
+def profiling_enabled() -> bool:
+    """Whether TENDER_PROFILE asks for per-job cProfile capture."""
+    return os.environ.get('TENDER_PROFILE', '').lower() in ('1', 'true', 'yes')
+
+
+@contextmanager
+def profiled(job_id: str, directory: Optional[str] = None,
+             enabled: Optional[bool] = None) -> Iterator[Optional[str]]:
+    """
+    Capture a cProfile profile of a block as <directory>/<job_id>.prof.
+
+    Does nothing unless profiling is enabled (argument, else TENDER_PROFILE).
+    Only the calling thread is profiled, so concurrent jobs get separate files.
+
+    Args:
+        job_id: Identifies the job; used as the file name
+        directory: Where to write the profile (default PROFILE_DIR)
+        enabled: Override the TENDER_PROFILE setting
+
+    Yields:
+        Path the profile is written to on exit, or None when not profiling
+    """
+    if not (profiling_enabled() if enabled is None else enabled):
+        yield None
+        return
+
+    directory = directory or PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, re.sub(r'[^\w.-]+', '_', str(job_id)) + '.prof')
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Python 3.12+ allows one active profiler per process
+        logging.getLogger(__name__).warning(f"Not profiling {job_id}: {e}")
+        yield None
+        return
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def hotspots(paths: Iterable[str], limit: int = 20, sort: str = 'tottime') -> List[Dict[str, Any]]:
+    """
+    Aggregate profiles and return the most expensive functions.
+
+    Args:
+        paths: .prof files, e.g. one per job of a batch
+        limit: Number of functions to return
+        sort: 'tottime' (time in the function itself), 'cumtime' or 'calls'
+
+    Returns:
+        Dicts with function, calls, tottime and cumtime (seconds), most expensive first
+    """
+    paths = [path for path in paths if path and os.path.exists(path)]
+    if not paths:
+        return []
+    stats = pstats.Stats(*paths)
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        location = f"{os.path.basename(filename)}:{line}" if line else filename
+        rows.append({'function': f"{location}({function})", 'calls': calls,
+                     'tottime': round(tottime, 6), 'cumtime': round(cumtime, 6)})
+    rows.sort(key=lambda row: row[sort], reverse=True)
+    return rows[:limit]
+
+
+def format_hotspots(rows: List[Dict[str, Any]]) -> str:
+    """Render hotspots() rows as a text table."""
+    lines = [f"{'tottime':>9} {'cumtime':>9} {'calls':>9}  function"]
+    for row in rows:
+        lines.append(f"{row['tottime']:9.3f} {row['cumtime']:9.3f} {row['calls']:9d}  {row['function']}")
+    return '\n'.join(lines)
@@ -0,0 +1,234 @@
+"""
+Job Queue for Tender Processing System
+Runs document generation in background threads, persisted in SQLite
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from instrumentation import profiled
+
+# Database file and worker count, overridable from the environment
+JOB_DB_PATH = os.environ.get('TENDER_JOB_DB', 'tender_jobs.db')
+JOB_WORKERS = int(os.environ.get('TENDER_JOB_WORKERS', 2))
+
+# Finished jobs (and their files) older than this are purged
+JOB_RETENTION_HOURS = 24
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+# A task receives the job payload and a progress callback(fraction, message)
+# and returns {key: {'content': bytes, 'filename': str, 'mime': str}}
+TaskFunction = Callable[[Dict[str, Any], Callable[[float, str], None]], Dict[str, Dict[str, Any]]]
+
+_tasks: Dict[str, TaskFunction] = {}
+
+
+def register_task(kind: str):
+    """Decorator registering a task function under a job kind."""
+    def decorator(func: TaskFunction) -> TaskFunction:
+        _tasks[kind] = func
+        return func
+    return decorator
+
+
+class JobQueue:
+    """
+    Background job queue shared by every Streamlit session of a server.
+
+    Jobs and their output files live in SQLite, so any session (or a later
+    process) can poll a job by ID and download its results. Identical
+    requests that are still queued or running are de-duplicated, and jobs
+    that were queued or running when the server stopped are resumed on start.
+    """
+
+    def __init__(self, db_path: str = JOB_DB_PATH, max_workers: int = JOB_WORKERS):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tender-job')
+        self._lock = threading.Lock()
+        self.init_database()
+        self._resume_pending()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        """Create the jobs tables if needed"""
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    request_key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    message TEXT DEFAULT '',
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_request ON jobs (request_key, status)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS job_files (
+                    job_id TEXT NOT NULL,
+                    file_key TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    mime TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    PRIMARY KEY (job_id, file_key)
+                )
+            ''')
+            conn.execute(
+                "DELETE FROM job_files WHERE job_id IN (SELECT id FROM jobs WHERE status IN (?, ?) "
+                "AND updated_at < datetime('now', ?))",
+                (COMPLETED, FAILED, f'-{JOB_RETENTION_HOURS} hours')
+            )
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < datetime('now', ?)",
+                (COMPLETED, FAILED, f'-{JOB_RETENTION_HOURS} hours')
+            )
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Enqueue a job and return its ID.
+
+        Args:
+            kind: Registered task name
+            payload: JSON-serialisable task input
+
+        Returns:
+            ID of the new job, or of an identical job still queued/running
+        """
+        if kind not in _tasks:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        payload_json = json.dumps(payload, sort_keys=True, default=str)
+        request_key = hashlib.sha256(f"{kind}\n{payload_json}".encode('utf-8')).hexdigest()
+
+        with self._lock, self._connect() as conn:
+            existing = conn.execute(
+                'SELECT id FROM jobs WHERE request_key = ? AND status IN (?, ?)',
+                (request_key, QUEUED, RUNNING)
+            ).fetchone()
+            if existing:
+                return existing['id']
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                'INSERT INTO jobs (id, kind, request_key, payload, status) VALUES (?, ?, ?, ?, ?)',
+                (job_id, kind, request_key, payload_json, QUEUED)
+            )
+
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status, progress and message of a job, or None if unknown."""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, kind, status, progress, message, error, created_at, updated_at '
+                'FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """Output files of a completed job, keyed like the task's return value."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT file_key, filename, mime, content FROM job_files WHERE job_id = ? ORDER BY rowid',
+                (job_id,)
+            ).fetchall()
+        return {
+            row['file_key']: {'content': bytes(row['content']), 'filename': row['filename'], 'mime': row['mime']}
+            for row in rows
+        }
+
+    def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent jobs, newest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT id, kind, status, progress, message, created_at FROM jobs '
+                'ORDER BY created_at DESC LIMIT ?', (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _update(self, job_id: str, **fields):
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f'UPDATE jobs SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                (*fields.values(), job_id)
+            )
+
+    def _run(self, job_id: str):
+        with self._connect() as conn:
+            row = conn.execute('SELECT kind, payload FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return
+
+        task = _tasks.get(row['kind'])
+        if task is None:
+            self._update(job_id, status=FAILED, error=f"Unknown job kind: {row['kind']}")
+            return
+
+        self._update(job_id, status=RUNNING, progress=0.0, message='Starting...')
+
+        def report_progress(fraction: float, message: str = ''):
+            self._update(job_id, progress=max(0.0, min(1.0, fraction)), message=message)
+
+        try:
+            # TENDER_PROFILE=1 leaves <kind>_<job id>.prof in TENDER_PROFILE_DIR
+            with profiled(f"{row['kind']}_{job_id}") as profile_path:
+                outputs = task(json.loads(row['payload']), report_progress)
+            if profile_path:
+                self.logger.info(f"Job {job_id} profile written to {profile_path}")
+            with self._connect() as conn:
+                conn.execute('DELETE FROM job_files WHERE job_id = ?', (job_id,))
+                conn.executemany(
+                    'INSERT INTO job_files (job_id, file_key, filename, mime, content) VALUES (?, ?, ?, ?, ?)',
+                    [(job_id, key, item['filename'], item['mime'], sqlite3.Binary(item['content'] or b''))
+                     for key, item in outputs.items()]
+                )
+            self._update(job_id, status=COMPLETED, progress=1.0, message='Completed')
+        except Exception as e:
+            self.logger.error(f"Job {job_id} ({row['kind']}) failed: {e}")
+            self._update(job_id, status=FAILED, error=str(e), message='Failed')
+
+    def _resume_pending(self):
+        """Re-run jobs left queued or running by a previous process."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at', (QUEUED, RUNNING)
+            ).fetchall()
+            conn.execute('UPDATE jobs SET status = ? WHERE status = ?', (QUEUED, RUNNING))
+        for row in rows:
+            self._executor.submit(self._run, row['id'])
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,294 @@
+"""
+LaTeX Compile Service for Tender Processing System
+Compiles LaTeX sources with pdflatex using a precompiled preamble format,
+single-pass detection and bounded parallelism
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Maximum number of pdflatex processes running at once in this process
+LATEX_MAX_PARALLEL = int(os.environ.get('LATEX_MAX_PARALLEL', min(4, os.cpu_count() or 1)))
+
+# Where precompiled preamble formats (.fmt) are kept between runs
+LATEX_FORMAT_DIR = Path(os.environ.get('LATEX_FORMAT_DIR',
+                                       os.path.join(tempfile.gettempdir(), 'tender_latex_formats')))
+
+# Upper bound on pdflatex passes per document
+MAX_PASSES = 3
+COMPILE_TIMEOUT = 30
+
+_PREAMBLE_LINE = re.compile(r'^\s*\\(documentclass|usepackage)\b')
+_RERUN_MESSAGES = ('Rerun to get', 'Label(s) may have changed')
+
+_compile_slots = threading.BoundedSemaphore(LATEX_MAX_PARALLEL)
+_format_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def latex_available() -> bool:
+    """Check once per process whether pdflatex is installed and working."""
+    if shutil.which('pdflatex') is None:
+        logging.error("LaTeX (pdflatex) not found. Please install TeX Live or MiKTeX")
+        return False
+    try:
+        result = subprocess.run(['pdflatex', '--version'],
+                                capture_output=True, text=True, timeout=10)
+    except (subprocess.TimeoutExpired, OSError):
+        logging.error("LaTeX (pdflatex) not found. Please install TeX Live or MiKTeX")
+        return False
+    if result.returncode != 0:
+        logging.warning("LaTeX may not be properly installed")
+        return False
+    logging.info("LaTeX (pdflatex) is available")
+    return True
+
+
+@lru_cache(maxsize=None)
+def _pdflatex_version() -> str:
+    """First line of `pdflatex --version`, part of the format cache key."""
+    try:
+        result = subprocess.run(['pdflatex', '--version'],
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.splitlines()[0] if result.stdout else ''
+    except (subprocess.TimeoutExpired, OSError):
+        return ''
+
+
+def _preamble_lines(latex_content: str) -> List[str]:
+    """Lines before \\begin{document}, stripped of surrounding whitespace."""
+    head = latex_content.split('\\begin{document}', 1)[0]
+    return [line.strip() for line in head.splitlines()]
+
+
+def shared_preamble(template_dir: Path) -> List[str]:
+    """
+    The \\documentclass and \\usepackage lines used by every template in a
+    directory, in the order they appear in the first template. These are the
+    lines baked into the precompiled format.
+    """
+    templates = sorted(Path(template_dir).glob('*.tex'))
+    if not templates:
+        return []
+
+    line_sets = []
+    first = None
+    for template in templates:
+        lines = [line for line in _preamble_lines(template.read_text(encoding='utf-8'))
+                 if _PREAMBLE_LINE.match(line)]
+        if first is None:
+            first = lines
+        line_sets.append(set(lines))
+
+    common = set.intersection(*line_sets)
+    preamble = [line for line in first if line in common]
+    # A format is only usable if it loads the document class
+    if not preamble or not preamble[0].startswith('\\documentclass'):
+        return []
+    return preamble
+
+
+class LaTeXCompiler:
+    """
+    Compiles LaTeX documents to PDF.
+
+    The preamble lines shared by all templates are dumped once into a
+    pdflatex format file, so each compile starts with the document class and
+    packages already loaded. A second pass only runs when the first one
+    changed the .aux file or LaTeX asked for a rerun, and compiles from any
+    number of threads are limited to LATEX_MAX_PARALLEL concurrent processes.
+    Documents that do not start from the shared preamble are compiled
+    without the format, and if a compile on top of the format fails the
+    document is retried in full and the format is not used again.
+    """
+
+    def __init__(self, preamble: Optional[List[str]] = None):
+        self.preamble = preamble or []
+        self.format_name = None
+        if self.preamble and latex_available():
+            self.format_name = self._ensure_format()
+
+    def compile(self, latex_content: str) -> Optional[bytes]:
+        """Compile LaTeX content to PDF bytes, or None on failure."""
+        if not latex_available():
+            return None
+
+        format_name = self.format_name
+        source, uses_format = self._apply_format(latex_content, format_name)
+        with _compile_slots:
+            if not uses_format:
+                return self._run(latex_content, None)
+            pdf = self._run(source, format_name)
+            if pdf is None:
+                # Stale or unusable format (or MiKTeX, which ignores TEXFORMATS)
+                if self.format_name:
+                    logging.warning("Compile with precompiled LaTeX preamble failed; "
+                                    "retrying and using full compiles from now on")
+                    self.format_name = None
+                pdf = self._run(latex_content, None)
+            return pdf
+
+    def _run(self, latex_content: str, format_name: Optional[str]) -> Optional[bytes]:
+        """Compile once in a fresh temp dir, on top of format_name when given."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            tex_file = temp_path / "document.tex"
+            tex_file.write_text(latex_content, encoding='utf-8')
+
+            env = self._environment(format_name)
+            previous_aux = []
+            try:
+                for _ in range(MAX_PASSES):
+                    result = subprocess.run(self._command(tex_file, temp_path, format_name),
+                                            capture_output=True, text=True,
+                                            timeout=COMPILE_TIMEOUT, env=env, cwd=temp_dir)
+                    if result.returncode != 0:
+                        self._log_failure(result)
+                        return None
+
+                    aux = self._significant_aux(temp_path / "document.aux")
+                    rerun = any(message in result.stdout for message in _RERUN_MESSAGES)
+                    if aux == previous_aux and not rerun:
+                        break
+                    previous_aux = aux
+
+                pdf_file = temp_path / "document.pdf"
+                if pdf_file.exists():
+                    return pdf_file.read_bytes()
+                logging.error("PDF file was not generated")
+                return None
+
+            except subprocess.TimeoutExpired:
+                logging.error("LaTeX compilation timed out")
+                return None
+            except Exception as e:
+                logging.error(f"Error during LaTeX compilation: {e}")
+                return None
+
+    def compile_many(self, sources: Dict[str, str]) -> Dict[str, Optional[bytes]]:
+        """Compile several documents in parallel, keyed like the input."""
+        if not sources:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(LATEX_MAX_PARALLEL, len(sources))) as executor:
+            futures = {name: executor.submit(self.compile, content) for name, content in sources.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _command(self, tex_file: Path, output_dir: Path, format_name: Optional[str]) -> List[str]:
+        command = ['pdflatex', '-interaction=nonstopmode']
+        if format_name:
+            command.append(f'-fmt={format_name}')
+        command.extend(['-output-directory', str(output_dir), str(tex_file)])
+        return command
+
+    def _environment(self, format_name: Optional[str]) -> Dict[str, str]:
+        env = os.environ.copy()
+        if format_name:
+            # Trailing separator keeps the default search path after ours
+            env['TEXFORMATS'] = f"{LATEX_FORMAT_DIR}{os.pathsep}{env.get('TEXFORMATS', '')}"
+        return env
+
+    def _apply_format(self, latex_content: str, format_name: Optional[str]) -> Tuple[str, bool]:
+        """
+        Drop the preamble lines that the format already provides.
+
+        Returns:
+            The source to compile, and whether it must be compiled on top of
+            the format (False when the document is left as-is)
+        """
+        if not format_name:
+            return latex_content, False
+
+        head, sep, body = latex_content.partition('\\begin{document}')
+        if not sep:
+            return latex_content, False
+
+        remaining = set(self.preamble)
+        kept = []
+        for line in head.splitlines():
+            stripped = line.strip()
+            if stripped in remaining:
+                remaining.discard(stripped)
+                continue
+            kept.append(line)
+
+        if remaining:
+            # Document does not start from the shared preamble; compile it as-is
+            return latex_content, False
+        return '\n'.join(kept) + '\n' + sep + body, True
+
+    def _ensure_format(self) -> Optional[str]:
+        """Build the preamble format once per preamble/pdflatex version."""
+        key_source = '\n'.join(self.preamble + [_pdflatex_version()])
+        format_name = f"tender_{hashlib.sha256(key_source.encode('utf-8')).hexdigest()[:16]}"
+        format_file = LATEX_FORMAT_DIR / f"{format_name}.fmt"
+
+        with _format_lock:
+            if format_file.exists():
+                return format_name
+            try:
+                LATEX_FORMAT_DIR.mkdir(parents=True, exist_ok=True)
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    preamble_file = Path(temp_dir) / "preamble.tex"
+                    preamble_file.write_text('\n'.join(self.preamble) + '\n\\dump\n', encoding='utf-8')
+                    result = subprocess.run(
+                        ['pdflatex', '-ini', '-interaction=nonstopmode', f'-jobname={format_name}',
+                         '&pdflatex', str(preamble_file)],
+                        capture_output=True, text=True, timeout=60, cwd=temp_dir
+                    )
+                    built = Path(temp_dir) / f"{format_name}.fmt"
+                    if result.returncode != 0 or not built.exists():
+                        logging.warning("Could not precompile LaTeX preamble; using full compiles")
+                        return None
+                    # Move into place atomically so other processes never see a partial file
+                    staging = LATEX_FORMAT_DIR / f"{format_name}.{os.getpid()}.tmp"
+                    shutil.copyfile(built, staging)
+                    os.replace(staging, format_file)
+                logging.info(f"Precompiled LaTeX preamble format {format_file}")
+                return format_name
+            except (subprocess.TimeoutExpired, OSError) as e:
+                logging.warning(f"Could not precompile LaTeX preamble: {e}")
+                return None
+
+    @staticmethod
+    def _significant_aux(aux_file: Path) -> List[str]:
+        """Aux lines that can change the next pass (labels, toc, citations)."""
+        if not aux_file.exists():
+            return []
+        lines = aux_file.read_text(encoding='utf-8', errors='replace').splitlines()
+        return [line for line in lines
+                if line.strip() and line.strip() != '\\relax'
+                and not line.startswith('\\gdef \\@abspage@last')]
+
+    @staticmethod
+    def _log_failure(result: subprocess.CompletedProcess):
+        logging.error(f"LaTeX compilation failed: {result.stderr}")
+        # Try to extract useful error information
+        if "! LaTeX Error:" in result.stdout:
+            error_line = next((line for line in result.stdout.split('\n')
+                               if "! LaTeX Error:" in line), "Unknown error")
+            logging.error(f"LaTeX Error: {error_line}")
+
+
+_compilers: Dict[tuple, LaTeXCompiler] = {}
+_compilers_lock = threading.Lock()
+
+
+def get_compiler(template_dir: Path) -> LaTeXCompiler:
+    """Return the process-wide compiler for a template directory."""
+    preamble = tuple(shared_preamble(template_dir))
+    with _compilers_lock:
+        compiler = _compilers.get(preamble)
+        if compiler is None:
+            compiler = LaTeXCompiler(list(preamble))
+            _compilers[preamble] = compiler
+        return compiler
@@ -4,14 +4,20 @@ Handles LaTeX template processing and PDF compilation
 """
 
 import os
-import subprocess
-import tempfile
-import shutil
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime
 from date_utils import DateUtils
+import latex_compiler
+from latex_compiler import get_compiler, latex_available
+from artifact_cache import get_artifact_cache, template_version
+from bidder_ranking import ranked_view
+from instrumentation import instrumented
+
+# Rendered LaTeX already embeds the template and data, so the compiled PDF is
+# cached by source text; only a compiler change invalidates it
+CACHE_GENERATOR = 'LaTeXGenerator'
 
 class LaTeXGenerator:
     """Generates PDF documents using LaTeX templates."""
@@ -23,21 +29,17 @@ class LaTeXGenerator:
         # Ensure template directory exists
         self.template_dir.mkdir(exist_ok=True)
         
-        # Check if LaTeX is available
+        # Check if LaTeX is available (cached per process)
         self._check_latex_availability()
+        
+        # Shared compiler with the templates' common preamble precompiled
+        self.compiler = get_compiler(self.template_dir)
     
-    def _check_latex_availability(self):
+    def _check_latex_availability(self) -> bool:
         """Check if LaTeX (pdflatex) is available on the system."""
-        try:
-            result = subprocess.run(['pdflatex', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                logging.info("LaTeX (pdflatex) is available")
-            else:
-                logging.warning("LaTeX may not be properly installed")
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            logging.error("LaTeX (pdflatex) not found. Please install TeX Live or MiKTeX")
+        return latex_available()
     
+    @instrumented()
     def generate_document(self, doc_type: str, work: Dict[str, Any], 
                          bidders: List[Dict[str, Any]]) -> Optional[bytes]:
         """Generate a PDF document of the specified type."""
@@ -57,6 +59,43 @@ class LaTeXGenerator:
             logging.error(f"Error generating document {doc_type}: {e}")
             return None
     
+    @instrumented()
+    def generate_documents(self, doc_types: List[str], work: Dict[str, Any],
+                           bidders: List[Dict[str, Any]]) -> Dict[str, Optional[bytes]]:
+        """Generate several PDF documents, compiling them in parallel."""
+        
+        sources = {}
+        results = {}
+        for doc_type in doc_types:
+            try:
+                latex_content = self._generate_latex_content(doc_type, work, bidders)
+            except Exception as e:
+                logging.error(f"Error generating document {doc_type}: {e}")
+                latex_content = None
+            if latex_content:
+                sources[doc_type] = latex_content
+            else:
+                logging.error(f"Failed to generate LaTeX content for {doc_type}")
+                results[doc_type] = None
+        
+        cache = get_artifact_cache()
+        version = template_version(latex_compiler.__file__)
+        keys = {doc_type: cache.make_key(CACHE_GENERATOR, version, source)
+                for doc_type, source in sources.items()}
+        pending = {}
+        for doc_type, source in sources.items():
+            cached = cache.get(keys[doc_type])
+            if cached is not None:
+                results[doc_type] = cached
+            else:
+                pending[doc_type] = source
+        
+        for doc_type, pdf_data in self.compiler.compile_many(pending).items():
+            if pdf_data:
+                cache.put(keys[doc_type], pdf_data)
+            results[doc_type] = pdf_data
+        return {doc_type: results.get(doc_type) for doc_type in doc_types}
+    
     def _generate_latex_content(self, doc_type: str, work: Dict[str, Any], 
                                bidders: List[Dict[str, Any]]) -> Optional[str]:
         """Generate LaTeX content by substituting variables in templates."""
@@ -88,8 +127,9 @@ class LaTeXGenerator:
         """Prepare variables for template substitution."""
         
         # Sort bidders by bid amount to get L1
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
-        l1_bidder = sorted_bidders[0] if sorted_bidders else None
+        ranking = ranked_view(bidders)
+        sorted_bidders = ranking.ranked
+        l1_bidder = ranking.lowest
         
         # Parse dates
         original_date = work['work_info']['date']
@@ -168,48 +208,8 @@ class LaTeXGenerator:
         return text
     
     def _compile_latex_to_pdf(self, latex_content: str) -> Optional[bytes]:
-        """Compile LaTeX content to PDF using pdflatex."""
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Write LaTeX content to file
-            tex_file = temp_path / "document.tex"
-            with open(tex_file, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
-            
-            try:
-                # Run pdflatex (twice for proper cross-references)
-                for _ in range(2):
-                    result = subprocess.run([
-                        'pdflatex',
-                        '-interaction=nonstopmode',
-                        '-output-directory', str(temp_path),
-                        str(tex_file)
-                    ], capture_output=True, text=True, timeout=30)
-                    
-                    if result.returncode != 0:
-                        logging.error(f"LaTeX compilation failed: {result.stderr}")
-                        # Try to extract useful error information
-                        if "! LaTeX Error:" in result.stdout:
-                            error_line = next((line for line in result.stdout.split('\n') 
-                                             if "! LaTeX Error:" in line), "Unknown error")
-                            logging.error(f"LaTeX Error: {error_line}")
-                        return None
-                
-                # Read the generated PDF
-                pdf_file = temp_path / "document.pdf"
-                if pdf_file.exists():
-                    with open(pdf_file, 'rb') as f:
-                        pdf_data = f.read()
-                    return pdf_data
-                else:
-                    logging.error("PDF file was not generated")
-                    return None
-                    
-            except subprocess.TimeoutExpired:
-                logging.error("LaTeX compilation timed out")
-                return None
-            except Exception as e:
-                logging.error(f"Error during LaTeX compilation: {e}")
-                return None
+        """Compile LaTeX content to PDF using the shared compile service."""
+        return get_artifact_cache().get_or_render(
+            CACHE_GENERATOR, template_version(latex_compiler.__file__), latex_content,
+            lambda: self.compiler.compile(latex_content)
+        )
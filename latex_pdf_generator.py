@@ -6,17 +6,32 @@ import os
 import json
 import re
 from typing import Dict, List, Any
-from weasyprint import HTML, CSS
 from datetime import datetime
 import tempfile
 import logging
+from artifact_cache import cached_artifact, template_version
+from bidder_ranking import ranked_view, select_lowest
+from instrumentation import instrumented
+import bidder_ranking
+import date_utils
+
+
+def _weasyprint():
+    """Import WeasyPrint on first use; loading it (and Pango) dominates import time."""
+    import weasyprint
+    return weasyprint
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class LatexPDFGenerator:
     def __init__(self):
         self.templates_dir = "latex_templates"
 
+    def template_version(self) -> str:
+        """Version of this module, its ranking and date helpers, and every LaTeX template it may load."""
+        templates = sorted(os.path.join(self.templates_dir, name) for name in os.listdir(self.templates_dir)) \
+            if os.path.isdir(self.templates_dir) else []
+        return template_version(__file__, date_utils.__file__, bidder_ranking.__file__, *templates)
+
     def load_template(self, template_name: str) -> str:
         """Load LaTeX template content"""
         # Try .TeX extension first (LaTeX files from attached assets)
@@ -87,7 +102,7 @@ class LatexPDFGenerator:
 
         try:
             # Find L1 bidder
-            l1_bidder = min(bidders, key=lambda x: x.get('bid_amount', float('inf')))
+            l1_bidder = select_lowest(bidders)
 
             # Create bidder table rows
             bidder_rows_html = ""
@@ -280,9 +295,12 @@ class LatexPDFGenerator:
             logging.error(f"Error creating comparative statement HTML: {e}")
             return ""
 
+    @instrumented()
+    @cached_artifact('LatexPDFGenerator.comparative_statement_pdf', lambda self: self.template_version())
     def generate_comparative_statement_pdf(self, work_data: Dict, bidders: List[Dict], output_path: str = None) -> bytes:
         """Generate comparative statement PDF with improved error handling"""
         try:
+            weasyprint = _weasyprint()
             template = self.load_template("latex_code_for_comparative_statement")
             
             if template:
@@ -298,7 +316,7 @@ class LatexPDFGenerator:
                 return b""
 
             # Add CSS for better styling
-            css = CSS(string="""
+            css = weasyprint.CSS(string="""
                 @page { size: A4 landscape; margin: 1cm; }
                 body { font-family: Arial, sans-serif; font-size: 12px; }
                 table { width: 100%; border-collapse: collapse; margin: 10px 0; }
@@ -311,20 +329,23 @@ class LatexPDFGenerator:
 
             # Generate PDF
             if output_path:
-                HTML(string=html_content).write_pdf(output_path, stylesheets=[css])
+                weasyprint.HTML(string=html_content).write_pdf(output_path, stylesheets=[css])
                 with open(output_path, 'rb') as f:
                     return f.read()
             else:
                 # Return PDF bytes directly
-                return HTML(string=html_content).write_pdf(stylesheets=[css])
+                return weasyprint.HTML(string=html_content).write_pdf(stylesheets=[css])
 
         except Exception as e:
             logging.error(f"Error generating comparative statement PDF: {e}")
             return b""
 
+    @instrumented()
+    @cached_artifact('LatexPDFGenerator.letter_acceptance_pdf', lambda self: self.template_version())
     def generate_letter_acceptance_pdf(self, work_data: Dict, l1_bidder: Dict, output_path: str = None) -> bytes:
         """Generate letter of acceptance PDF with improved error handling"""
         try:
+            weasyprint = _weasyprint()
             template = self.load_template("latex_code_for_letter_of_aceptance")
             
             if template:
@@ -340,19 +361,22 @@ class LatexPDFGenerator:
 
             # Generate PDF
             if output_path:
-                HTML(string=html_content).write_pdf(output_path)
+                weasyprint.HTML(string=html_content).write_pdf(output_path)
                 with open(output_path, 'rb') as f:
                     return f.read()
             else:
-                return HTML(string=html_content).write_pdf()
+                return weasyprint.HTML(string=html_content).write_pdf()
 
         except Exception as e:
             logging.error(f"Error generating letter of acceptance PDF: {e}")
             return b""
 
+    @instrumented()
+    @cached_artifact('LatexPDFGenerator.work_order_pdf', lambda self: self.template_version())
     def generate_work_order_pdf(self, work_data: Dict, l1_bidder: Dict, output_path: str = None) -> bytes:
         """Generate work order PDF with improved error handling"""
         try:
+            weasyprint = _weasyprint()
             template = self.load_template("latex_code_for_work_order")
             
             if template:
@@ -368,19 +392,22 @@ class LatexPDFGenerator:
 
             # Generate PDF
             if output_path:
-                HTML(string=html_content).write_pdf(output_path)
+                weasyprint.HTML(string=html_content).write_pdf(output_path)
                 with open(output_path, 'rb') as f:
                     return f.read()
             else:
-                return HTML(string=html_content).write_pdf()
+                return weasyprint.HTML(string=html_content).write_pdf()
 
         except Exception as e:
             logging.error(f"Error generating work order PDF: {e}")
             return b""
 
+    @instrumented()
+    @cached_artifact('LatexPDFGenerator.scrutiny_sheet_pdf', lambda self: self.template_version())
     def generate_scrutiny_sheet_pdf(self, work_data: Dict, bidders: List[Dict], output_path: str = None) -> bytes:
         """Generate scrutiny sheet PDF with improved error handling"""
         try:
+            weasyprint = _weasyprint()
             template = self.load_template("latex_code_for_scrutiny_sheet")
             
             if template:
@@ -396,21 +423,24 @@ class LatexPDFGenerator:
 
             # Generate PDF
             if output_path:
-                HTML(string=html_content).write_pdf(output_path)
+                weasyprint.HTML(string=html_content).write_pdf(output_path)
                 with open(output_path, 'rb') as f:
                     return f.read()
             else:
-                return HTML(string=html_content).write_pdf()
+                return weasyprint.HTML(string=html_content).write_pdf()
 
         except Exception as e:
             logging.error(f"Error generating scrutiny sheet PDF: {e}")
             return b""
 
+    @instrumented()
     def generate_bulk_pdfs(self, work_data: Dict, bidders: List[Dict]) -> Dict[str, bytes]:
         """Generate all PDFs at once with memory optimization"""
         try:
             logging.info("Starting bulk PDF generation")
             generated_pdfs = {}
+            # Rank once for all four documents
+            bidders = ranked_view(bidders)
             
             # Generate each document with individual error handling
             documents = [
@@ -424,8 +454,7 @@ class LatexPDFGenerator:
                 try:
                     if doc_name in ['letter_acceptance', 'work_order']:
                         # These need L1 bidder
-                        l1_bidder = min(bidders, key=lambda x: x.get('bid_amount', float('inf')))
-                        pdf_bytes = generator_func(work_data, l1_bidder)
+                        pdf_bytes = generator_func(work_data, select_lowest(bidders))
                     else:
                         # These need all bidders
                         pdf_bytes = generator_func(work_data, bidders)
@@ -561,7 +590,7 @@ class LatexPDFGenerator:
 
         try:
             # Find L1 bidder (lowest)
-            l1_bidder = min(bidders, key=lambda x: x.get('bid_amount', float('inf')))
+            l1_bidder = select_lowest(bidders)
 
             # Create bidder table rows
             bidder_rows = ""
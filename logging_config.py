@@ -0,0 +1,103 @@
+"""
+Logging Configuration for Tender Processing System
+One place to set the log level, format and rate limiting for every module
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+
+# Root log level, overridable from the environment (DEBUG, INFO, WARNING, ...)
+TENDER_LOG_LEVEL = os.environ.get('TENDER_LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Identical messages (same logger, level and message template) let through per
+# window; later ones are counted and reported with the next one let through
+LOG_RATE_LIMIT = int(os.environ.get('TENDER_LOG_RATE_LIMIT', 5))
+LOG_RATE_WINDOW_SECONDS = 60.0
+
+# Third-party loggers that are chatty at INFO
+QUIET_LOGGERS = ('fontTools', 'weasyprint', 'PIL', 'docx')
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drop repeats of the same message template beyond a per-window limit.
+
+    Records are grouped by logger, level and the unformatted message, so
+    lazily formatted calls such as ``logger.warning("Unable to parse date: %s",
+    value)`` are limited as one message whatever the value.
+    """
+
+    def __init__(self, limit: int = LOG_RATE_LIMIT, window: float = LOG_RATE_WINDOW_SECONDS):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        # key -> (window start, messages let through, messages suppressed)
+        self._windows: Dict[Tuple[str, int, str], Tuple[float, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            start, passed, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - start >= self.window:
+                if suppressed:
+                    record.msg = f"{record.msg} [{suppressed} similar message(s) suppressed]"
+                start, passed, suppressed = now, 0, 0
+            if passed < self.limit:
+                self._windows[key] = (start, passed + 1, suppressed)
+                allowed = True
+            else:
+                self._windows[key] = (start, passed, suppressed + 1)
+                allowed = False
+            if len(self._windows) > 10000:
+                self._expire(now)
+        return allowed
+
+    def _expire(self, now: float):
+        # Unique (eagerly formatted) messages would otherwise grow the table forever
+        self._windows = {key: value for key, value in self._windows.items()
+                         if now - value[0] < self.window and value[2]}
+
+
+def configure_logging(level: Optional[Union[int, str]] = None, force: bool = False):
+    """
+    Configure the root logger once for the whole process.
+
+    Application entry points (the Streamlit app, the CLI) call this; library
+    modules only create loggers. Without a call, Python's default of printing
+    warnings and errors applies.
+
+    Args:
+        level: Root level (default TENDER_LOG_LEVEL)
+        force: Reapply handlers and level even if already configured
+    """
+    global _configured
+    with _configure_lock:
+        root = logging.getLogger()
+        root.setLevel(level if level is not None else TENDER_LOG_LEVEL)
+        if _configured and not force:
+            return
+
+        if not root.handlers or force:
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            root.addHandler(handler)
+        for handler in root.handlers:
+            if not any(isinstance(f, RateLimitFilter) for f in handler.filters):
+                handler.addFilter(RateLimitFilter())
+
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        _configured = True
@@ -7,10 +7,14 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
 from typing import Dict, Any, List
 import io
-import logging
 from date_utils import DateUtils
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from artifact_cache import cached_artifact, template_version
+from bidder_ranking import rank_order, select_lowest
+from tender_statistics import summary_rows, tender_statistics
+from instrumentation import instrumented
+import bidder_ranking
+import date_utils
+import tender_statistics as statistics_module
 
 class PDFGenerator:
     """Generates PDF documents for tender processing system."""
@@ -47,6 +51,13 @@ class PDFGenerator:
             fontName='Helvetica'
         )
     
+    def template_version(self) -> str:
+        """Layouts are built in code, so the module source (and the helpers it formats with) is the template."""
+        return template_version(__file__, date_utils.__file__, bidder_ranking.__file__,
+                                statistics_module.__file__)
+    
+    @instrumented()
+    @cached_artifact('PDFGenerator.comparative_statement_pdf', lambda self: self.template_version())
     def generate_comparative_statement_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate comparative statement in PDF format."""
         
@@ -56,7 +67,7 @@ class PDFGenerator:
                               topMargin=15*mm, bottomMargin=15*mm)
         
         # Sort bidders by bid amount
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
+        sorted_bidders = rank_order(bidders)
         
         # Get work details
         work_name = work['work_name']
@@ -164,6 +175,8 @@ class PDFGenerator:
         buffer.close()
         return pdf_data
     
+    @instrumented()
+    @cached_artifact('PDFGenerator.scrutiny_sheet_pdf', lambda self: self.template_version())
     def generate_scrutiny_sheet_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate scrutiny sheet in PDF format."""
         
@@ -172,9 +185,8 @@ class PDFGenerator:
                               rightMargin=15*mm, leftMargin=15*mm,
                               topMargin=15*mm, bottomMargin=15*mm)
         
-        # Sort bidders by bid amount
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
-        lowest_bidder = sorted_bidders[0]
+        # L1 bidder (lowest bid)
+        lowest_bidder = select_lowest(bidders)
         
         # Get work details
         work_name = work['work_name']
@@ -255,6 +267,8 @@ class PDFGenerator:
         buffer.close()
         return pdf_data
     
+    @instrumented()
+    @cached_artifact('PDFGenerator.letter_of_acceptance_pdf', lambda self: self.template_version())
     def generate_letter_of_acceptance_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate Letter of Acceptance in PDF format."""
         
@@ -263,9 +277,8 @@ class PDFGenerator:
                               rightMargin=15*mm, leftMargin=15*mm,
                               topMargin=15*mm, bottomMargin=15*mm)
         
-        # Sort bidders and get L1
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
-        l1_bidder = sorted_bidders[0]
+        # L1 bidder (lowest bid)
+        l1_bidder = select_lowest(bidders)
         
         # Get work details
         work_name = work['work_name']
@@ -336,6 +349,8 @@ class PDFGenerator:
         buffer.close()
         return pdf_data
     
+    @instrumented()
+    @cached_artifact('PDFGenerator.work_order_pdf', lambda self: self.template_version())
     def generate_work_order_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate Work Order in PDF format."""
         
@@ -344,9 +359,8 @@ class PDFGenerator:
                               rightMargin=15*mm, leftMargin=15*mm,
                               topMargin=15*mm, bottomMargin=15*mm)
         
-        # Sort bidders and get L1
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
-        l1_bidder = sorted_bidders[0]
+        # L1 bidder (lowest bid)
+        l1_bidder = select_lowest(bidders)
         
         # Get work details
         work_name = work['work_name']
@@ -425,3 +439,63 @@ class PDFGenerator:
         pdf_data = buffer.getvalue()
         buffer.close()
         return pdf_data
+    
+    @instrumented()
+    def generate_bid_analysis_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
+        """Generate the bid statistics, outliers and screening indicators in PDF format."""
+        
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, 
+                              rightMargin=15*mm, leftMargin=15*mm,
+                              topMargin=15*mm, bottomMargin=15*mm)
+        
+        estimated_cost = float(work['work_info']['estimated_cost'])
+        stats = tender_statistics(bidders, estimated_cost)
+        grid_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+        
+        elements = [
+            Paragraph("<u>Bid Analysis</u>", self.title_style),
+            Paragraph(f"{work['work_name']}<br/>NIT No. {work['nit_number']} &nbsp;&nbsp; "
+                      f"Estimated Cost: Rs. {estimated_cost:,.0f}", self.body_style),
+            Spacer(1, 12),
+        ]
+        
+        summary = Table([['Statistic', 'Value']] + [list(row) for row in summary_rows(stats)], colWidths=[240, 240])
+        summary.setStyle(grid_style)
+        elements.extend([summary, Spacer(1, 16)])
+        
+        elements.append(Paragraph("Quoted Percentage Distribution", self.header_style))
+        histogram = Table([['Quoted Percentage', 'Bidders']] +
+                          [[f"{band['from']:+.1f}% to {band['to']:+.1f}%", str(band['count'])]
+                           for band in stats['percentage_histogram']], colWidths=[240, 240])
+        histogram.setStyle(grid_style)
+        elements.extend([histogram, Spacer(1, 16)])
+        
+        elements.append(Paragraph("Outliers", self.header_style))
+        if stats['outliers']:
+            outliers = Table([['Bidder', 'Bid Amount (Rs.)', '% Above/Below', 'Side']] +
+                             [[outlier['name'], f"{outlier['bid_amount']:,.0f}", f"{outlier['percentage']:+.2f}%",
+                               outlier['side']] for outlier in stats['outliers']], colWidths=[180, 110, 100, 90])
+            outliers.setStyle(grid_style)
+            elements.append(outliers)
+        else:
+            elements.append(Paragraph("No bids outside the interquartile fences.", self.body_style))
+        elements.append(Spacer(1, 16))
+        
+        elements.append(Paragraph("Screening Indicators", self.header_style))
+        for flag in stats['flags'] or [{'message': "No bid-rigging indicators."}]:
+            elements.append(Paragraph(flag['message'], self.body_style))
+        
+        # Build PDF
+        doc.build(elements)
+        
+        pdf_data = buffer.getvalue()
+        buffer.close()
+        return pdf_data
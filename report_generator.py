@@ -2,8 +2,9 @@ import logging
 from typing import Dict, Any, List
 from datetime import datetime
 from date_utils import DateUtils
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from bidder_ranking import ranked_view, select_top
+from tender_statistics import tender_statistics
+from instrumentation import instrumented
 
 class ReportGenerator:
     """Enhanced report generator with improved date handling and formatting."""
@@ -11,6 +12,7 @@ class ReportGenerator:
     def __init__(self):
         self.date_utils = DateUtils()
     
+    @instrumented()
     def generate_detailed_report(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> str:
         """
         Generate comprehensive detailed report with enhanced formatting.
@@ -24,7 +26,8 @@ class ReportGenerator:
         """
         try:
             # Sort bidders by bid amount
-            sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
+            bidders = ranked_view(bidders)
+            sorted_bidders = bidders.ranked
             
             # Get work details with date parsing
             work_name = work['work_name']
@@ -39,7 +42,7 @@ class ReportGenerator:
             formatted_date = self.date_utils.format_display_date(parsed_date) if parsed_date else work_info['date']
             
             # Calculate statistics
-            stats = self._calculate_report_statistics(sorted_bidders, estimated_cost)
+            stats = self._calculate_report_statistics(bidders, estimated_cost)
             
             # Generate report timestamp
             report_timestamp = self.date_utils.get_current_date()
@@ -106,12 +109,30 @@ class ReportGenerator:
                             <div class="stat-label">Highest Bid</div>
                         </div>
                         <div class="stat-card">
-                            <div class="stat-value">{stats['avg_percentage']:+.2f}%</div>
+                            <div class="stat-value">{stats['average_percentage']:+.2f}%</div>
                             <div class="stat-label">Average Percentage</div>
                         </div>
+                        <div class="stat-card">
+                            <div class="stat-value">₹{stats['median_bid']:,.0f}</div>
+                            <div class="stat-label">Median Bid</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-value">₹{stats['std_bid']:,.0f}</div>
+                            <div class="stat-label">Standard Deviation</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-value">₹{stats['q1_bid']:,.0f} – ₹{stats['q3_bid']:,.0f}</div>
+                            <div class="stat-label">Interquartile Range (Q1 – Q3)</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-value">{stats['coefficient_of_variation']:.2f}%</div>
+                            <div class="stat-label">Coefficient of Variation</div>
+                        </div>
                     </div>
                 </div>
                 
+                {self._distribution_html(stats)}
+                
                 <div class="bidders-section">
                     <h2>👥 Bidder Analysis</h2>
                     <table class="bidders-table">
@@ -176,27 +197,57 @@ class ReportGenerator:
             raise
     
     def _calculate_report_statistics(self, bidders: List[Dict[str, Any]], estimated_cost: float) -> Dict[str, Any]:
-        """Calculate statistics for the report."""
-        if not bidders:
-            return {
-                'total_bidders': 0,
-                'lowest_bid': 0,
-                'highest_bid': 0,
-                'avg_percentage': 0,
-                'cost_savings': 0
-            }
-        
-        bid_amounts = [bidder['bid_amount'] for bidder in bidders]
-        percentages = [bidder['percentage'] for bidder in bidders]
-        
-        return {
-            'total_bidders': len(bidders),
-            'lowest_bid': min(bid_amounts),
-            'highest_bid': max(bid_amounts),
-            'avg_percentage': sum(percentages) / len(percentages),
-            'cost_savings': estimated_cost - min(bid_amounts)
-        }
+        """Calculate statistics for the report (shared with the PDF/DOC bid analysis)."""
+        return tender_statistics(bidders, estimated_cost)
     
+    def _distribution_html(self, stats: Dict[str, Any]) -> str:
+        """Percentage histogram, outliers and bid-rigging screens for the detailed report."""
+        histogram = stats['percentage_histogram']
+        peak = max((band['count'] for band in histogram), default=0) or 1
+        histogram_rows = ''.join(f"""
+                            <tr>
+                                <td>{band['from']:+.1f}% to {band['to']:+.1f}%</td>
+                                <td>{band['count']}</td>
+                                <td class="bar-cell"><div class="bar" style="width: {band['count'] / peak * 100:.0f}%"></div></td>
+                            </tr>""" for band in histogram)
+
+        if stats['outliers']:
+            outliers = ''.join(
+                f"<li>{outlier['name']}: ₹{outlier['bid_amount']:,.2f} ({outlier['percentage']:+.2f}%), "
+                f"{'unusually low' if outlier['side'] == 'low' else 'unusually high'}</li>"
+                for outlier in stats['outliers'])
+            outliers = f"<ul>{outliers}</ul>"
+        else:
+            outliers = "<p>No bids outside the interquartile fences.</p>"
+
+        if stats['flags']:
+            flags = ''.join(f"<li>{flag['message']}</li>" for flag in stats['flags'])
+            flags = f"<ul class=\"flags\">{flags}</ul>"
+        else:
+            flags = "<p>No bid-rigging indicators.</p>"
+
+        gap = stats['l1_l2_gap_percent']
+        gap_text = f"{gap:.2f}%" if gap is not None else "-"
+        return f"""
+                <div class="distribution">
+                    <h2>📈 Bid Distribution</h2>
+                    <p><strong>L1 - L2 gap:</strong> {gap_text} &nbsp;&nbsp;
+                       <strong>Bid range:</strong> ₹{stats['bid_range']:,.2f} &nbsp;&nbsp;
+                       <strong>Median percentage:</strong> {stats['median_percentage']:+.2f}%</p>
+                    <table class="bidders-table histogram">
+                        <thead>
+                            <tr><th>Quoted Percentage</th><th>Bidders</th><th></th></tr>
+                        </thead>
+                        <tbody>{histogram_rows}
+                        </tbody>
+                    </table>
+                    <h3>Outliers</h3>
+                    {outliers}
+                    <h3>Screening Indicators</h3>
+                    {flags}
+                </div>
+        """
+
     def _get_report_styles(self) -> str:
         """Get CSS styles for the report."""
         return """
@@ -234,7 +285,7 @@ class ReportGenerator:
                 opacity: 0.9;
             }
             
-            .work-summary, .statistics, .bidders-section, .recommendations {
+            .work-summary, .statistics, .distribution, .bidders-section, .recommendations {
                 background: white;
                 padding: 25px;
                 border-radius: 12px;
@@ -301,6 +352,31 @@ class ReportGenerator:
                 opacity: 0.9;
             }
             
+            .distribution h3 {
+                color: #2c3e50;
+                margin: 20px 0 10px;
+            }
+            
+            .distribution ul {
+                margin-left: 20px;
+            }
+            
+            .distribution .flags li {
+                color: #c0392b;
+                font-weight: 600;
+            }
+            
+            .histogram .bar-cell {
+                width: 50%;
+                text-align: left;
+            }
+            
+            .histogram .bar {
+                height: 14px;
+                background: linear-gradient(135deg, #667eea, #764ba2);
+                border-radius: 4px;
+            }
+            
             .bidders-table {
                 width: 100%;
                 border-collapse: collapse;
@@ -396,11 +472,12 @@ class ReportGenerator:
             }
         """
 
+    @instrumented()
     def generate_summary_report(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> str:
         """Generate a concise summary report."""
         try:
-            sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
-            lowest_bidder = sorted_bidders[0] if sorted_bidders else None
+            top_bidders = select_top(bidders, 5)
+            lowest_bidder = top_bidders[0] if top_bidders else None
             
             work_info = work['work_info']
             parsed_date = self.date_utils.parse_date(work_info['date'])
@@ -438,7 +515,7 @@ class ReportGenerator:
                         <tr><th>Rank</th><th>Bidder</th><th>Amount</th><th>Percentage</th></tr>
             """
             
-            for i, bidder in enumerate(sorted_bidders[:5]):  # Top 5 bidders
+            for i, bidder in enumerate(top_bidders):  # Top 5 bidders
                 html_content += f"""
                         <tr>
                             <td>{i+1}</td>
@@ -0,0 +1,104 @@
+"""
+Report Jobs for Tender Processing System
+Background tasks that generate the PDF/DOC report and document sets
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from bidder_ranking import ranked_view
+from job_queue import register_task
+from tender_history import record_history
+from generator_registry import get_generator
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def prepare_work_info(work_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the work_info block the letter/work order generators expect."""
+    work_info = {
+        'name': work_data.get('work_name', 'Unknown Work'),
+        'nit_number': work_data.get('nit_number', 'Unknown NIT'),
+        'estimated_cost': work_data.get('estimated_cost', 0),
+        'earnest_money': work_data.get('earnest_money', 0),
+        'time_completion': work_data.get('time_completion', 6),
+        'time_of_completion': work_data.get('time_completion', 6),  # Added for compatibility
+        'nit_date': work_data.get('nit_date', 'Not found'),
+        'receipt_date': work_data.get('receipt_date', 'Not found'),
+        'opening_date': work_data.get('opening_date', 'Not found'),
+        'date': work_data.get('nit_date', 'Not found')  # Added for compatibility
+    }
+    # If there's a works list, use the first work's details
+    if work_data.get('works') and len(work_data['works']) > 0:
+        work_info.update({
+            'name': work_data['works'][0]['name'],
+            'item_no': work_data['works'][0]['item_no'],
+            'estimated_cost': work_data['works'][0]['estimated_cost'],
+            'earnest_money': work_data['works'][0]['earnest_money'],
+            'time_completion': work_data['works'][0]['time_completion'],
+            'time_of_completion': work_data['works'][0]['time_completion']  # Added for compatibility
+        })
+    return work_info
+
+
+def _run_steps(steps: List[Tuple[str, str, str, str, Callable]], work: Dict[str, Any],
+               bidders: List[Dict[str, Any]],
+               progress: Callable[[float, str], None]) -> Dict[str, Dict[str, Any]]:
+    """Run (key, label, file stem, mime, generator) steps, reporting progress."""
+    generated = {}
+    extension = {PDF_MIME: 'pdf', DOCX_MIME: 'docx'}
+    # Every step reuses one ranking of the bidders
+    bidders = ranked_view(bidders)
+    # Idempotent: a tender generated again replaces its earlier record
+    record_history(work, bidders)
+    for index, (key, label, stem, mime, generate) in enumerate(steps):
+        progress(index / len(steps), f"Generating {label}...")
+        generated[key] = {
+            'content': generate(work, bidders),
+            'filename': f"{stem}_{work['nit_number']}.{extension[mime]}",
+            'mime': mime
+        }
+    progress(1.0, "Completed")
+    return generated
+
+
+@register_task('reports')
+def generate_reports(payload: Dict[str, Any],
+                     progress: Callable[[float, str], None]) -> Dict[str, Dict[str, Any]]:
+    """Comparative statement, scrutiny sheet and bid analysis, as PDF and DOC."""
+    pdf_gen = get_generator('pdf')
+    doc_gen = get_generator('docx')
+    steps = [
+        ('comparative_statement_pdf', "Comparative Statement PDF", "comparative_statement", PDF_MIME,
+         pdf_gen.generate_comparative_statement_pdf),
+        ('comparative_statement_doc', "Comparative Statement DOC", "comparative_statement", DOCX_MIME,
+         doc_gen.generate_comparative_statement_doc),
+        ('scrutiny_sheet_pdf', "Scrutiny Sheet PDF", "scrutiny_sheet", PDF_MIME,
+         pdf_gen.generate_scrutiny_sheet_pdf),
+        ('scrutiny_sheet_doc', "Scrutiny Sheet DOC", "scrutiny_sheet", DOCX_MIME,
+         doc_gen.generate_scrutiny_sheet_doc),
+        ('bid_analysis_pdf', "Bid Analysis PDF", "bid_analysis", PDF_MIME,
+         pdf_gen.generate_bid_analysis_pdf),
+        ('bid_analysis_doc', "Bid Analysis DOC", "bid_analysis", DOCX_MIME,
+         doc_gen.generate_bid_analysis_doc),
+    ]
+    return _run_steps(steps, payload['work'], payload['bidders'], progress)
+
+
+@register_task('documents')
+def generate_documents(payload: Dict[str, Any],
+                       progress: Callable[[float, str], None]) -> Dict[str, Dict[str, Any]]:
+    """Letter of acceptance and work order, as PDF and DOC."""
+    pdf_gen = get_generator('pdf')
+    doc_gen = get_generator('docx')
+    steps = [
+        ('letter_of_acceptance_pdf', "Letter of Acceptance PDF", "letter_of_acceptance", PDF_MIME,
+         pdf_gen.generate_letter_of_acceptance_pdf),
+        ('letter_of_acceptance_doc', "Letter of Acceptance DOC", "letter_of_acceptance", DOCX_MIME,
+         doc_gen.generate_letter_of_acceptance_doc),
+        ('work_order_pdf', "Work Order PDF", "work_order", PDF_MIME,
+         pdf_gen.generate_work_order_pdf),
+        ('work_order_doc', "Work Order DOC", "work_order", DOCX_MIME,
+         doc_gen.generate_work_order_doc),
+    ]
+    return _run_steps(steps, payload['work'], payload['bidders'], progress)
@@ -0,0 +1,245 @@
+"""
+Session Store for Tender Processing System
+On-disk snapshots of a browser session's parsed work and bidders, for resuming after a refresh or restart
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # snapshots fall back to JSON
+    msgpack = None
+
+# Snapshot location, size budget and lifetime, overridable from the environment
+SESSION_STORE_DIR = Path(os.environ.get('TENDER_SESSION_DIR',
+                                        os.path.join(tempfile.gettempdir(), 'tender_sessions')))
+SESSION_STORE_MAX_MB = float(os.environ.get('TENDER_SESSION_MAX_MB', 64))
+SESSION_MAX_AGE_DAYS = float(os.environ.get('TENDER_SESSION_MAX_AGE_DAYS', 7))
+
+# Session state that is checkpointed and restored
+SNAPSHOT_KEYS = ('current_work', 'bidders')
+
+# Tokens are generated by new_session_token(); anything else is ignored
+_TOKEN_PATTERN = re.compile(r'^[A-Za-z0-9_-]{16,64}$')
+
+# First byte of a snapshot file: its encoding
+_MSGPACK, _JSON = b'M', b'J'
+_EXT_DATETIME, _EXT_DATE = 1, 2
+
+
+def new_session_token() -> str:
+    """Random token identifying one browser session."""
+    return secrets.token_urlsafe(16)
+
+
+def _plain(value: Any) -> Any:
+    """Fallback for values the encoders do not know (e.g. NumPy scalars)."""
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode('ascii'))
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode('ascii'))
+    return _plain(value)
+
+
+def _msgpack_ext(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode('ascii'))
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode('ascii'))
+    return msgpack.ExtType(code, data)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    return _plain(value)
+
+
+def _json_object(value: Dict[str, Any]) -> Any:
+    if len(value) == 1:
+        if '__datetime__' in value:
+            return datetime.fromisoformat(value['__datetime__'])
+        if '__date__' in value:
+            return date.fromisoformat(value['__date__'])
+    return value
+
+
+def encode_snapshot(state: Dict[str, Any]) -> bytes:
+    """Serialise session state: MessagePack when installed, JSON otherwise."""
+    if msgpack is not None:
+        return _MSGPACK + msgpack.packb(state, default=_msgpack_default, use_bin_type=True)
+    return _JSON + json.dumps(state, default=_json_default, ensure_ascii=False,
+                              separators=(',', ':')).encode('utf-8')
+
+
+def decode_snapshot(content: bytes) -> Dict[str, Any]:
+    """Inverse of encode_snapshot."""
+    kind, payload = content[:1], content[1:]
+    if kind == _MSGPACK:
+        if msgpack is None:
+            raise ValueError("Snapshot needs msgpack, which is not installed")
+        return msgpack.unpackb(payload, ext_hook=_msgpack_ext, raw=False, strict_map_key=False)
+    if kind == _JSON:
+        return json.loads(payload.decode('utf-8'), object_hook=_json_object)
+    raise ValueError("Unknown snapshot format")
+
+
+class SessionStore:
+    """
+    Size-bounded LRU store of session snapshots on disk.
+
+    One file per session token, written atomically. Loading a snapshot
+    touches its mtime, so eviction drops the least recently used sessions
+    first once the size budget is exceeded; snapshots untouched for longer
+    than the maximum age are dropped regardless.
+    """
+
+    def __init__(self, store_dir: Optional[Path] = None, max_bytes: Optional[int] = None,
+                 max_age_seconds: Optional[float] = None):
+        self.store_dir = Path(store_dir or SESSION_STORE_DIR)
+        self.max_bytes = int(max_bytes if max_bytes is not None else SESSION_STORE_MAX_MB * 1024 * 1024)
+        self.max_age_seconds = (max_age_seconds if max_age_seconds is not None
+                                else SESSION_MAX_AGE_DAYS * 24 * 3600)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # Digest of the last snapshot written per token, to skip unchanged saves
+        self._saved: Dict[str, bytes] = {}
+
+    def _path(self, token: str) -> Optional[Path]:
+        if not token or not _TOKEN_PATTERN.match(token):
+            return None
+        return self.store_dir / f"{token}.snap"
+
+    def save(self, token: str, state: Dict[str, Any]) -> bool:
+        """
+        Checkpoint session state under a token.
+
+        Returns:
+            True if a snapshot was written, False if unchanged or not written
+        """
+        path = self._path(token)
+        if path is None:
+            return False
+        try:
+            content = encode_snapshot(state)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Could not encode session snapshot: {e}")
+            return False
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        with self._lock:
+            if self._saved.get(token) == digest and path.exists():
+                return False
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a reconnecting session never reads a partial file
+            staging = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            staging.write_bytes(content)
+            os.replace(staging, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write session snapshot: {e}")
+            return False
+        with self._lock:
+            self._saved[token] = digest
+        self._evict()
+        return True
+
+    def load(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the snapshot saved under a token, or None if there is none (or it expired)."""
+        path = self._path(token)
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+            if time.time() - stat.st_mtime > self.max_age_seconds:
+                self.delete(token)
+                return None
+            content = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        try:
+            state = decode_snapshot(content)
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable session snapshot {path.name}: {e}")
+            self.delete(token)
+            return None
+        with self._lock:
+            self._saved[token] = hashlib.blake2b(content, digest_size=16).digest()
+        return state
+
+    def delete(self, token: str):
+        """Forget the snapshot of a session."""
+        path = self._path(token)
+        with self._lock:
+            self._saved.pop(token, None)
+        if path is not None:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _entries(self) -> Iterable[Tuple[Path, os.stat_result]]:
+        for path in self.store_dir.glob('*.snap'):
+            try:
+                yield path, path.stat()
+            except OSError:
+                continue
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        expired_before = time.time() - self.max_age_seconds
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes and stat.st_mtime >= expired_before:
+                break
+            try:
+                path.unlink()
+                total -= stat.st_size
+            except OSError:
+                continue
+            with self._lock:
+                self._saved.pop(path.stem, None)
+
+    def clear(self):
+        """Remove every session snapshot."""
+        for path, _ in list(self._entries()):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+        with self._lock:
+            self._saved.clear()
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+        return _store
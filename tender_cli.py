@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Headless Tender Pipeline
+Runs NIT parsing, bidder ranking, every document generator and ZIP packaging
+without Streamlit, as a Python API and a command line tool run from the
+repository checkout (it needs the html_templates directory beside it).
+
+    python tender_cli.py process NIT.xlsx --bidders bidders.csv --out pkg.zip
+    python tender_cli.py process "nits/*.xlsx" --out packages/ --jobs 4
+    python tender_cli.py process "nits/*.xlsx" --out packages/ --profile
+    python tender_cli.py hotspots packages/
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from excel_parser import ExcelParser
+from tender_processor import TenderProcessor
+from bidder_ranking import ranked_view
+from bidder_import import import_bidders
+from report_jobs import prepare_work_info
+from tender_history import record_history
+from comparative_statement_generator import ComparativeStatementGenerator
+from scrutiny_sheet_generator import ScrutinySheetGenerator
+from letter_acceptance_generator import LetterAcceptanceGenerator
+from work_order_generator import WorkOrderGenerator
+from report_generator import ReportGenerator
+from pdf_generator import PDFGenerator
+from document_generator import DocumentGenerator
+from zip_generator import ZipGenerator
+from logging_config import configure_logging
+from instrumentation import format_hotspots, get_recorder, hotspots, profiled, stage
+
+def load_bidders(path: str, estimated_cost: float, earnest_money: float = 0) -> List[Dict[str, Any]]:
+    """
+    Read bidders from a CSV, Excel or JSON file.
+
+    Each row needs a name and a percentage above (+) or below (-) the
+    estimate; the bid amount is computed from the estimated cost unless the
+    file provides it.
+
+    Args:
+        path: Bidder file
+        estimated_cost: Estimated cost of the work the bids refer to
+        earnest_money: Earnest money of that work, recorded on every bidder
+
+    Returns:
+        Validated bidder dictionaries
+    """
+    try:
+        result = import_bidders(path, estimated_cost, earnest_money)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}")
+    if result['errors']:
+        first = result['errors'][0]
+        more = len(result['errors']) - 1
+        raise ValueError(f"{path}, row {first['row']}: {first['error']}"
+                         + (f" (and {more} more invalid row(s))" if more else ""))
+    for bidder in result['bidders']:
+        bidder['contact'] = bidder['address']
+    return result['bidders']
+
+
+def default_bidders_path(nit_path: str) -> Optional[str]:
+    """`<nit>_bidders.csv|xlsx|json` next to the NIT, if present."""
+    stem = Path(nit_path).with_suffix('')
+    for suffix in ('.csv', '.xlsx', '.json'):
+        candidate = f"{stem}_bidders{suffix}"
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def build_documents(work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> Tuple[Dict[str, bytes], List[str]]:
+    """
+    Run every document generator for one tender.
+
+    Returns:
+        (ZIP member name -> content, error messages). A failing generator
+        is recorded and skipped; the others still run.
+    """
+    stem = str(work['nit_number']).replace('/', '_').replace('\\', '_')
+    # One ranking and one set of bid statistics for every document
+    bidders = ranked_view(bidders)
+    html = lambda generate: (lambda: generate(work, bidders).encode('utf-8'))
+    raw = lambda generate: (lambda: generate(work, bidders))
+
+    comparative = ComparativeStatementGenerator()
+    scrutiny = ScrutinySheetGenerator()
+    letter = LetterAcceptanceGenerator()
+    work_order = WorkOrderGenerator()
+    report = ReportGenerator()
+    pdf_gen = PDFGenerator()
+    doc_gen = DocumentGenerator()
+
+    steps: List[Tuple[str, Callable[[], bytes]]] = [
+        (f"html/comparative_statement_{stem}.html", html(comparative.generate_comparative_statement)),
+        (f"html/scrutiny_sheet_{stem}.html", html(scrutiny.generate_scrutiny_sheet)),
+        (f"html/letter_of_acceptance_{stem}.html", html(letter.generate_letter_of_acceptance)),
+        (f"html/work_order_{stem}.html", html(work_order.generate_work_order)),
+        (f"html/detailed_report_{stem}.html", html(report.generate_detailed_report)),
+        (f"pdf/comparative_statement_{stem}.pdf", raw(pdf_gen.generate_comparative_statement_pdf)),
+        (f"pdf/scrutiny_sheet_{stem}.pdf", raw(pdf_gen.generate_scrutiny_sheet_pdf)),
+        (f"pdf/letter_of_acceptance_{stem}.pdf", raw(pdf_gen.generate_letter_of_acceptance_pdf)),
+        (f"pdf/work_order_{stem}.pdf", raw(pdf_gen.generate_work_order_pdf)),
+        (f"pdf/bid_analysis_{stem}.pdf", raw(pdf_gen.generate_bid_analysis_pdf)),
+        (f"docx/comparative_statement_{stem}.docx", raw(doc_gen.generate_comparative_statement_doc)),
+        (f"docx/scrutiny_sheet_{stem}.docx", raw(doc_gen.generate_scrutiny_sheet_doc)),
+        (f"docx/letter_of_acceptance_{stem}.docx", raw(doc_gen.generate_letter_of_acceptance_doc)),
+        (f"docx/work_order_{stem}.docx", raw(doc_gen.generate_work_order_doc)),
+        (f"docx/bid_analysis_{stem}.docx", raw(doc_gen.generate_bid_analysis_doc)),
+    ]
+
+    documents = {}
+    errors = []
+    for name, generate in steps:
+        try:
+            content = generate()
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+            continue
+        if content:
+            documents[name] = content
+        else:
+            errors.append(f"{name}: generator returned no content")
+    return documents, errors
+
+
+def process_nit(nit_path: str, bidders_path: Optional[str], out_path: str) -> Dict[str, Any]:
+    """
+    Build the complete document package for one NIT workbook.
+
+    Args:
+        nit_path: NIT Excel file
+        bidders_path: Bidder file (CSV/Excel/JSON); defaults to <nit>_bidders.* next to the NIT
+        out_path: ZIP file to write
+
+    Returns:
+        Summary dict with nit, output, documents, errors and ok, plus the
+        profile path when profiling is enabled (TENDER_PROFILE=1 / --profile)
+    """
+    out = Path(out_path)
+    with stage('process_nit', nit=nit_path), profiled(out.stem, str(out.parent)) as profile_path:
+        result = _process_nit(nit_path, bidders_path, out_path)
+    if profile_path:
+        result['profile'] = profile_path
+    return result
+
+
+def _process_nit(nit_path: str, bidders_path: Optional[str], out_path: str) -> Dict[str, Any]:
+    result = {'nit': nit_path, 'output': None, 'documents': 0, 'errors': [], 'ok': False}
+
+    work = ExcelParser().parse_nit_excel(nit_path)
+    if not work:
+        result['errors'].append("could not parse NIT workbook")
+        return result
+    work['work_info'] = prepare_work_info(work)
+
+    bidders_path = bidders_path or default_bidders_path(nit_path)
+    if not bidders_path:
+        result['errors'].append("no bidders file (use --bidders or <nit>_bidders.csv)")
+        return result
+    try:
+        bidders = load_bidders(bidders_path, float(work['work_info']['estimated_cost']),
+                               work['work_info']['earnest_money'])
+    except Exception as e:
+        result['errors'].append(f"bidders: {e}")
+        return result
+    if not bidders:
+        result['errors'].append(f"bidders: no bidders in {bidders_path}")
+        return result
+
+    bidders = TenderProcessor().rank_bidders(bidders)
+    record_history(work, bidders)
+    documents, errors = build_documents(work, bidders)
+    result['errors'].extend(errors)
+    if not documents:
+        return result
+
+    zip_data = ZipGenerator().create_zip(documents)
+    if not zip_data:
+        result['errors'].append("could not create ZIP archive")
+        return result
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(out_path).write_bytes(zip_data)
+    result.update(output=out_path, documents=len(documents), ok=not result['errors'])
+    return result
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expand glob patterns (quoted, or from shells that do not glob) and directories."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, '*.xls*')))
+        else:
+            matches = sorted(glob.glob(pattern)) or [pattern]
+        for match in matches:
+            if match not in paths and not Path(match).stem.endswith('_bidders'):
+                paths.append(match)
+    return paths
+
+
+def output_path_for(nit_path: str, out: Optional[str], multiple: bool) -> str:
+    """ZIP path for a NIT: --out itself for one NIT, or <out>/<nit>.zip for many."""
+    stem = Path(nit_path).stem
+    if out and not multiple and out.lower().endswith('.zip'):
+        return out
+    return str(Path(out or '.') / f"{stem}_package.zip")
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    status = "OK  " if result['ok'] else "FAIL"
+    line = f"{status} {result['nit']}"
+    if result['output']:
+        line += f" -> {result['output']} ({result['documents']} documents)"
+    for error in result['errors']:
+        line += f"\n     {error}"
+    return line
+
+
+def run_process(args: argparse.Namespace) -> int:
+    if args.perf_log:
+        # Worker processes pick the path up from the environment
+        os.environ['TENDER_PERF_LOG'] = args.perf_log
+        get_recorder().log_path = args.perf_log
+    if args.profile:
+        os.environ['TENDER_PROFILE'] = '1'
+
+    nits = expand_inputs(args.nits)
+    missing = [path for path in nits if not os.path.exists(path)]
+    if missing:
+        for path in missing:
+            print(f"FAIL {path}\n     file not found", file=sys.stderr)
+        return 1
+
+    multiple = len(nits) > 1
+    jobs = [(nit, args.bidders, output_path_for(nit, args.out, multiple)) for nit in nits]
+
+    results = []
+    if args.jobs > 1 and multiple:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=configure_logging,
+                                 initargs=(logging.getLogger().level,)) as executor:
+            futures = {executor.submit(process_nit, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'nit': futures[future], 'output': None, 'documents': 0,
+                              'errors': [str(e)], 'ok': False}
+                print(_format_result(result))
+                results.append(result)
+    else:
+        for job in jobs:
+            result = process_nit(*job)
+            print(_format_result(result))
+            results.append(result)
+
+    failed = sum(1 for result in results if not result['ok'])
+    print(f"{len(results) - failed}/{len(results)} package(s) built")
+
+    profiles = [result['profile'] for result in results if result.get('profile')]
+    if profiles:
+        print(f"\nHottest functions across {len(profiles)} profile(s):")
+        print(format_hotspots(hotspots(profiles, limit=args.top)))
+    return 1 if failed else 0
+
+
+def run_hotspots(args: argparse.Namespace) -> int:
+    paths = expand_profiles(args.profiles)
+    if not paths:
+        print("No profiles found", file=sys.stderr)
+        return 1
+    rows = hotspots(paths, limit=args.top, sort=args.sort)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"Hottest functions across {len(paths)} profile(s):")
+        print(format_hotspots(rows))
+    return 0
+
+
+def expand_profiles(patterns: List[str]) -> List[str]:
+    """Expand .prof files, directories of them and glob patterns."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, '*.prof'))))
+        else:
+            paths.extend(sorted(glob.glob(pattern)))
+    return paths
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='tender_cli.py', description="Tender document pipeline")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show generator log messages")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    process = subparsers.add_parser('process', help="build document packages from NIT workbooks")
+    process.add_argument('nits', nargs='+', help="NIT Excel files, directories or glob patterns")
+    process.add_argument('--bidders', help="bidder CSV/Excel/JSON (default: <nit>_bidders.* next to each NIT)")
+    process.add_argument('--out', help="output ZIP for one NIT, or output directory for several")
+    process.add_argument('--jobs', type=int, default=1, help="NITs to process in parallel")
+    process.add_argument('--perf-log', help="append per-stage timings to this JSON-lines file")
+    process.add_argument('--profile', action='store_true',
+                         help="write a cProfile profile next to each package and list the hottest functions")
+    process.add_argument('--top', type=int, default=15, help="functions listed with --profile")
+    process.set_defaults(func=run_process)
+
+    report = subparsers.add_parser('hotspots', help="aggregate saved profiles into a hot-function list")
+    report.add_argument('profiles', nargs='+', help=".prof files, directories or glob patterns")
+    report.add_argument('--sort', choices=('tottime', 'cumtime', 'calls'), default='tottime')
+    report.add_argument('--top', type=int, default=25, help="functions to list")
+    report.add_argument('--json', action='store_true', help="print JSON instead of a table")
+    report.set_defaults(func=run_hotspots)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Keep the CLI output readable: generator messages only with -v
+    configure_logging(logging.INFO if args.verbose else logging.ERROR)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
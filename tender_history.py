@@ -0,0 +1,343 @@
+"""
+Tender History for Tender Processing System
+SQLite store of every processed tender and its bids, for analytics across tenders
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bidder_ranking import rank_order
+from date_utils import DateUtils
+
+# Database file (empty: history is not recorded) and the division recorded
+# for works that do not name one, overridable from the environment
+HISTORY_DB_PATH = os.environ.get('TENDER_HISTORY_DB', 'tender_history.db')
+DEFAULT_DIVISION = os.environ.get('TENDER_DIVISION', 'PWD Electric Division, Udaipur')
+
+_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS tenders (
+        id INTEGER PRIMARY KEY,
+        nit_number TEXT NOT NULL,
+        work_name TEXT NOT NULL,
+        division TEXT NOT NULL,
+        tender_date TEXT NOT NULL,
+        quarter TEXT NOT NULL,
+        estimated_cost REAL,
+        bidder_count INTEGER NOT NULL,
+        l1_bidder TEXT,
+        l1_amount REAL,
+        l1_percentage REAL,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (nit_number, work_name)
+    )
+    ''',
+    # Tender date, quarter and division are repeated on every bid so that
+    # date-range aggregates read a single covering index
+    '''
+    CREATE TABLE IF NOT EXISTS bids (
+        tender_id INTEGER NOT NULL REFERENCES tenders (id) ON DELETE CASCADE,
+        bidder_key TEXT NOT NULL,
+        bidder_name TEXT NOT NULL,
+        division TEXT NOT NULL,
+        tender_date TEXT NOT NULL,
+        quarter TEXT NOT NULL,
+        percentage REAL,
+        bid_amount REAL,
+        rank INTEGER NOT NULL,
+        is_l1 INTEGER NOT NULL,
+        PRIMARY KEY (tender_id, rank)
+    ) WITHOUT ROWID
+    ''',
+    # Running totals per bidder, division and quarter, kept exact on every
+    # record; whole-history queries read these instead of every bid
+    '''
+    CREATE TABLE IF NOT EXISTS bidder_quarters (
+        bidder_key TEXT NOT NULL,
+        division TEXT NOT NULL,
+        quarter TEXT NOT NULL,
+        bidder_name TEXT NOT NULL,
+        bids INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        percentage_sum REAL,
+        percentage_count INTEGER NOT NULL,
+        amount_sum REAL,
+        amount_count INTEGER NOT NULL,
+        l1_percentage_sum REAL,
+        l1_percentage_count INTEGER NOT NULL,
+        last_tender TEXT NOT NULL,
+        PRIMARY KEY (bidder_key, division, quarter)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_tenders_date ON tenders (tender_date)',
+    'CREATE INDEX IF NOT EXISTS idx_tenders_division ON tenders (division, tender_date)',
+    'CREATE INDEX IF NOT EXISTS idx_bids_bidder ON bids '
+    '(bidder_key, division, quarter, tender_date, is_l1, percentage, bid_amount, bidder_name)',
+    'CREATE INDEX IF NOT EXISTS idx_bids_date ON bids '
+    '(tender_date, division, bidder_key, quarter, is_l1, percentage, bid_amount, bidder_name)',
+    'CREATE INDEX IF NOT EXISTS idx_bidder_quarters_division ON bidder_quarters (division, quarter)',
+]
+
+_REFRESH_ROLLUP = '''
+    INSERT INTO bidder_quarters
+    SELECT bidder_key, division, quarter, MAX(bidder_name), COUNT(*), SUM(is_l1),
+           SUM(percentage), COUNT(percentage), SUM(bid_amount), COUNT(bid_amount),
+           SUM(CASE WHEN is_l1 THEN percentage END), COUNT(CASE WHEN is_l1 THEN percentage END),
+           MAX(tender_date)
+    FROM bids WHERE bidder_key = ? AND division = ? AND quarter = ?
+    GROUP BY bidder_key, division, quarter
+'''
+
+# Aggregate expressions over the rollup table and over raw bids
+_ROLLUP_COLUMNS = {
+    'bidder': 'MAX(bidder_name)',
+    'bids': 'SUM(bids)',
+    'wins': 'SUM(wins)',
+    'average_percentage': 'SUM(percentage_sum) / NULLIF(SUM(percentage_count), 0)',
+    'average_bid': 'SUM(amount_sum) / NULLIF(SUM(amount_count), 0)',
+    'l1_average_percentage': 'SUM(l1_percentage_sum) / NULLIF(SUM(l1_percentage_count), 0)',
+    'last_tender': 'MAX(last_tender)',
+}
+_BIDS_COLUMNS = {
+    'bidder': 'MAX(bidder_name)',
+    'bids': 'COUNT(*)',
+    'wins': 'SUM(is_l1)',
+    'average_percentage': 'AVG(percentage)',
+    'average_bid': 'AVG(bid_amount)',
+    'l1_average_percentage': 'AVG(CASE WHEN is_l1 THEN percentage END)',
+    'last_tender': 'MAX(tender_date)',
+}
+
+
+def bidder_key(name: str) -> str:
+    """Normalised bidder name, so "M/s. ABC  Traders" and "abc traders" match."""
+    key = re.sub(r'^\s*m\s*/\s*s\.?\s*', '', str(name), flags=re.IGNORECASE)
+    return re.sub(r'[^a-z0-9&]+', ' ', key.lower()).strip()
+
+
+def quarter_of(day: datetime) -> str:
+    """Calendar quarter label, e.g. 2025-Q3."""
+    return f"{day.year}-Q{(day.month - 1) // 3 + 1}"
+
+
+class TenderHistory:
+    """
+    Local analytics store of processed tenders.
+
+    One row per tender (NIT number and work) and one per bid, with the rank
+    and L1 outcome. Recording a tender again replaces its bids, so
+    regenerating documents never double-counts. Whole-history aggregates
+    read per bidder/division/quarter totals kept up to date on every
+    record; date-range aggregates read covering indexes over the bids.
+    """
+
+    def __init__(self, db_path: str = HISTORY_DB_PATH):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self.date_utils = DateUtils()
+        self._lock = threading.Lock()
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA foreign_keys = ON')
+        return conn
+
+    def init_database(self):
+        """Create the history tables and indexes if needed"""
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _tender_date(self, work: Dict[str, Any]) -> datetime:
+        work_info = work.get('work_info') or {}
+        for value in (work_info.get('date'), work.get('nit_date'), work.get('date')):
+            parsed = self.date_utils.parse_date(value) if value else None
+            if parsed:
+                return parsed
+        return datetime.now()
+
+    def record_tender(self, work: Dict[str, Any], bidders: Iterable[Dict[str, Any]],
+                      division: Optional[str] = None) -> Optional[int]:
+        """
+        Record a processed tender and its bids, replacing an earlier record.
+
+        Args:
+            work: Parsed NIT (work_name, nit_number, optional work_info/division)
+            bidders: Bidder dictionaries with name, percentage and bid_amount
+            division: Division name (default: work['division'] or TENDER_DIVISION)
+
+        Returns:
+            Tender row ID, or None when there are no bidders
+        """
+        ranked = rank_order(bidders)
+        if not ranked:
+            return None
+
+        work_info = work.get('work_info') or {}
+        nit_number = str(work.get('nit_number') or work_info.get('nit_number') or 'Unknown NIT')
+        work_name = str(work_info.get('name') or work.get('work_name') or 'Unknown Work')
+        division = division or work.get('division') or DEFAULT_DIVISION
+        day = self._tender_date(work)
+        tender_date, quarter = day.strftime('%Y-%m-%d'), quarter_of(day)
+        estimated_cost = work_info.get('estimated_cost', work.get('estimated_cost'))
+        l1 = ranked[0]
+
+        rows = [(bidder_key(bidder.get('name', '')), bidder.get('name', ''), bidder.get('percentage'),
+                 bidder.get('bid_amount'), rank) for rank, bidder in enumerate(ranked, 1)]
+
+        with self._lock, self._connect() as conn:
+            # Rollup rows touched by the record being replaced and by this one
+            stale = conn.execute(
+                'SELECT b.bidder_key, b.division, b.quarter FROM tenders t JOIN bids b ON b.tender_id = t.id '
+                'WHERE t.nit_number = ? AND t.work_name = ?', (nit_number, work_name)
+            ).fetchall()
+            conn.execute(
+                'DELETE FROM tenders WHERE nit_number = ? AND work_name = ?', (nit_number, work_name)
+            )
+            tender_id = conn.execute(
+                'INSERT INTO tenders (nit_number, work_name, division, tender_date, quarter, estimated_cost, '
+                'bidder_count, l1_bidder, l1_amount, l1_percentage) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (nit_number, work_name, division, tender_date, quarter,
+                 float(estimated_cost) if estimated_cost not in (None, '') else None,
+                 len(ranked), l1.get('name', ''), l1.get('bid_amount'), l1.get('percentage'))
+            ).lastrowid
+            conn.executemany(
+                'INSERT INTO bids (tender_id, bidder_key, bidder_name, division, tender_date, quarter, '
+                'percentage, bid_amount, rank, is_l1) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(tender_id, key, name, division, tender_date, quarter, percentage, amount, rank, int(rank == 1))
+                 for key, name, percentage, amount, rank in rows]
+            )
+            touched = {tuple(row) for row in stale} | {(row[0], division, quarter) for row in rows}
+            conn.executemany(
+                'DELETE FROM bidder_quarters WHERE bidder_key = ? AND division = ? AND quarter = ?', touched
+            )
+            conn.executemany(_REFRESH_ROLLUP, touched)
+        return tender_id
+
+    @staticmethod
+    def _filters(bidder: Optional[str], division: Optional[str], since: Optional[str],
+                 until: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if bidder:
+            clauses.append('bidder_key = ?')
+            params.append(bidder_key(bidder))
+        if division:
+            clauses.append('division = ?')
+            params.append(division)
+        if since:
+            clauses.append('tender_date >= ?')
+            params.append(since)
+        if until:
+            clauses.append('tender_date <= ?')
+            params.append(until)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def _aggregate(self, group_by: str, bidder: Optional[str], division: Optional[str],
+                   since: Optional[str], until: Optional[str]) -> List[sqlite3.Row]:
+        """Aggregate bids by a column, from the quarterly rollup unless a date range is given."""
+        where, params = self._filters(bidder, division, since, until)
+        table, columns = ('bids', _BIDS_COLUMNS) if since or until else ('bidder_quarters', _ROLLUP_COLUMNS)
+        if table == 'bids':
+            columns = dict(columns, tenders='COUNT(DISTINCT tender_id)')
+        else:
+            # One L1 per tender; a single bidder's bids are one per tender
+            columns = dict(columns, tenders='SUM(bids)' if bidder or group_by == 'bidder_key' else 'SUM(wins)')
+        select = ', '.join(f'{expression} AS {name}' for name, expression in columns.items())
+        with self._connect() as conn:
+            return conn.execute(
+                f'SELECT {group_by}, {select} FROM {table}{where} GROUP BY {group_by}', params
+            ).fetchall()
+
+    def bidder_statistics(self, bidder: Optional[str] = None, division: Optional[str] = None,
+                          since: Optional[str] = None, until: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Per-bidder participation, wins and quotes.
+
+        Args:
+            bidder: Only this bidder (matched on the normalised name)
+            division: Only tenders of this division
+            since, until: ISO dates (YYYY-MM-DD) bounding the tender date
+            limit: Most active bidders only
+
+        Returns:
+            Dictionaries with bidder, tenders, wins, win_rate, average_percentage,
+            average_bid and last_tender, most tenders first
+        """
+        rows = sorted(self._aggregate('bidder_key', bidder, division, since, until),
+                      key=lambda row: (-row['bids'], -row['wins'], row['bidder_key']))
+        return [{
+            'bidder': row['bidder'],
+            'tenders': row['bids'],
+            'wins': row['wins'],
+            'win_rate': row['wins'] / row['bids'],
+            'average_percentage': row['average_percentage'],
+            'average_bid': row['average_bid'],
+            'last_tender': row['last_tender'],
+        } for row in rows[:limit or None]]
+
+    def quarterly_trend(self, bidder: Optional[str] = None, division: Optional[str] = None,
+                        since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Quote trend per calendar quarter.
+
+        Returns:
+            Dictionaries with quarter, tenders (with a bidder: tenders it quoted
+            in), bids, wins, average_percentage (all bids),
+            l1_average_percentage (winning bids) and bids_per_tender, oldest
+            quarter first
+        """
+        rows = sorted(self._aggregate('quarter', bidder, division, since, until), key=lambda row: row['quarter'])
+        return [{
+            'quarter': row['quarter'],
+            'tenders': row['tenders'],
+            'bids': row['bids'],
+            'wins': row['wins'],
+            'average_percentage': row['average_percentage'],
+            'l1_average_percentage': row['l1_average_percentage'],
+            'bids_per_tender': row['bids'] / row['tenders'] if row['tenders'] else 0,
+        } for row in rows]
+
+    def divisions(self) -> List[str]:
+        """Divisions with recorded tenders."""
+        with self._connect() as conn:
+            rows = conn.execute('SELECT DISTINCT division FROM tenders ORDER BY division').fetchall()
+        return [row['division'] for row in rows]
+
+    def tender_count(self) -> int:
+        """Number of recorded tenders."""
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM tenders').fetchone()[0]
+
+
+_history: Optional[TenderHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_tender_history() -> Optional[TenderHistory]:
+    """Return the process-wide history store, or None when TENDER_HISTORY_DB is empty."""
+    global _history
+    if not HISTORY_DB_PATH:
+        return None
+    with _history_lock:
+        if _history is None:
+            _history = TenderHistory()
+        return _history
+
+
+def record_history(work: Dict[str, Any], bidders: Iterable[Dict[str, Any]]) -> Optional[int]:
+    """Record a tender in the history store; failures are logged, never raised."""
+    try:
+        history = get_tender_history()
+        return history.record_tender(work, bidders) if history else None
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Could not record tender history: {e}")
+        return None
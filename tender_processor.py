@@ -2,8 +2,8 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from date_utils import DateUtils
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from bidder_ranking import rank_order
+from instrumentation import instrumented
 
 class TenderProcessor:
     """Core tender processing business logic with enhanced date handling."""
@@ -140,6 +140,7 @@ class TenderProcessor:
         
         return validated_data
     
+    @instrumented()
     def rank_bidders(self, bidders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Rank bidders by bid amount (lowest first).
@@ -153,8 +154,8 @@ class TenderProcessor:
         if not bidders:
             return []
         
-        # Sort by bid amount (lowest first)
-        sorted_bidders = sorted(bidders, key=lambda x: x['bid_amount'])
+        # Sort by bid amount (lowest first, submission order on ties)
+        sorted_bidders = rank_order(bidders)
         
         # Add rank information
         for i, bidder in enumerate(sorted_bidders):
@@ -175,29 +176,11 @@ class TenderProcessor:
             bidders: List of bidder dictionaries
             
         Returns:
-            Statistics dictionary
+            Statistics dictionary (see tender_statistics.compute_statistics)
         """
-        if not bidders:
-            return {
-                'total_bidders': 0,
-                'lowest_bid': 0,
-                'highest_bid': 0,
-                'average_bid': 0,
-                'average_percentage': 0,
-                'bid_range': 0
-            }
-        
-        bid_amounts = [bidder['bid_amount'] for bidder in bidders]
-        percentages = [bidder['percentage'] for bidder in bidders]
-        
-        return {
-            'total_bidders': len(bidders),
-            'lowest_bid': min(bid_amounts),
-            'highest_bid': max(bid_amounts),
-            'average_bid': sum(bid_amounts) / len(bid_amounts),
-            'average_percentage': sum(percentages) / len(percentages),
-            'bid_range': max(bid_amounts) - min(bid_amounts)
-        }
+        # Imported on first use so NumPy stays out of app startup
+        from tender_statistics import tender_statistics
+        return tender_statistics(bidders)
     
     def format_currency(self, amount: float) -> str:
         """
@@ -0,0 +1,189 @@
+"""
+Tender Statistics for Tender Processing System
+Descriptive bid statistics, outliers and bid-rigging screens computed with NumPy
+"""
+
+import math
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from bidder_ranking import ranked_view
+
+# Width of the quoted-percentage histogram bins, in percentage points
+PERCENT_BIN_WIDTH = float(os.environ.get('TENDER_PERCENT_BIN_WIDTH', 5))
+# Bids outside Q1 - k*IQR .. Q3 + k*IQR are outliers (Tukey fences)
+OUTLIER_IQR_FACTOR = float(os.environ.get('TENDER_OUTLIER_IQR_FACTOR', 1.5))
+# Fewer bidders than this and quartiles/screens say nothing useful
+MIN_BIDDERS_FOR_SCREENS = int(os.environ.get('TENDER_MIN_BIDDERS_FOR_SCREENS', 4))
+# Bid-rigging screens: coefficient of variation (%) below which bids are
+# suspiciously close, and relative distance (L2 - L1 over the spread of the
+# losing bids) above which the losing bids look like cover bids
+CARTEL_CV_THRESHOLD = float(os.environ.get('TENDER_CARTEL_CV_THRESHOLD', 1.0))
+CARTEL_RD_THRESHOLD = float(os.environ.get('TENDER_CARTEL_RD_THRESHOLD', 1.0))
+
+_EMPTY = {
+    'total_bidders': 0,
+    'lowest_bid': 0,
+    'highest_bid': 0,
+    'average_bid': 0,
+    'median_bid': 0,
+    'std_bid': 0,
+    'q1_bid': 0,
+    'q3_bid': 0,
+    'iqr_bid': 0,
+    'bid_range': 0,
+    'coefficient_of_variation': 0,
+    'average_percentage': 0,
+    'median_percentage': 0,
+    'std_percentage': 0,
+    'lowest_percentage': 0,
+    'highest_percentage': 0,
+    'cost_savings': 0,
+    'l1_l2_gap_percent': None,
+    'relative_distance': None,
+    'outliers': [],
+    'percentage_histogram': [],
+    'flags': [],
+}
+
+
+def _histogram(percentages: np.ndarray) -> List[Dict[str, Any]]:
+    """Bidder counts per PERCENT_BIN_WIDTH band of quoted percentage."""
+    width = PERCENT_BIN_WIDTH
+    low = math.floor(percentages.min() / width) * width
+    high = math.ceil(percentages.max() / width) * width
+    if high <= low:
+        high = low + width
+    edges = np.arange(low, high + width / 2, width)
+    counts, edges = np.histogram(percentages, bins=edges)
+    return [{'from': float(edges[i]), 'to': float(edges[i + 1]), 'count': int(count)}
+            for i, count in enumerate(counts)]
+
+
+def compute_statistics(bidders: Iterable[Dict[str, Any]], estimated_cost: float = 0) -> Dict[str, Any]:
+    """
+    Descriptive statistics of the bids for one tender.
+
+    Args:
+        bidders: Bidder dictionaries with bid_amount and percentage
+        estimated_cost: Estimated cost of the work (for cost_savings)
+
+    Returns:
+        Dictionary with bidder count, lowest/highest/average/median bid,
+        standard deviation, quartiles, range, coefficient of variation,
+        percentage statistics, L1-L2 gap, outliers (Tukey fences),
+        percentage_histogram and bid-rigging flags
+    """
+    bidders = list(bidders)
+    if not bidders:
+        return {key: (list(value) if isinstance(value, list) else value) for key, value in _EMPTY.items()}
+
+    count = len(bidders)
+    amounts = np.array([bidder['bid_amount'] for bidder in bidders], dtype=float)
+    percentages = np.array([bidder.get('percentage', 0) for bidder in bidders], dtype=float)
+
+    ddof = 1 if count > 1 else 0
+    q1, median, q3 = np.percentile(amounts, [25, 50, 75])
+    lowest, highest = amounts.min(), amounts.max()
+    mean = amounts.mean()
+    std = amounts.std(ddof=ddof)
+    order = np.argsort(amounts, kind='stable')
+
+    stats = {
+        'total_bidders': count,
+        'lowest_bid': float(lowest),
+        'highest_bid': float(highest),
+        'average_bid': float(mean),
+        'median_bid': float(median),
+        'std_bid': float(std),
+        'q1_bid': float(q1),
+        'q3_bid': float(q3),
+        'iqr_bid': float(q3 - q1),
+        'bid_range': float(highest - lowest),
+        'coefficient_of_variation': float(std / mean * 100) if mean else 0.0,
+        'average_percentage': float(percentages.mean()),
+        'median_percentage': float(np.median(percentages)),
+        'std_percentage': float(percentages.std(ddof=ddof)),
+        'lowest_percentage': float(percentages.min()),
+        'highest_percentage': float(percentages.max()),
+        'cost_savings': float(estimated_cost - lowest) if estimated_cost else 0,
+        'l1_l2_gap_percent': None,
+        'relative_distance': None,
+        'outliers': [],
+        'percentage_histogram': _histogram(percentages),
+        'flags': [],
+    }
+
+    if count >= 2:
+        l1, l2 = amounts[order[0]], amounts[order[1]]
+        stats['l1_l2_gap_percent'] = float((l2 - l1) / l1 * 100) if l1 else None
+        losing = amounts[order[1:]]
+        if losing.size >= 2:
+            losing_std = losing.std(ddof=1)
+            if losing_std:
+                stats['relative_distance'] = float((l2 - l1) / losing_std)
+
+    if count >= MIN_BIDDERS_FOR_SCREENS:
+        spread = OUTLIER_IQR_FACTOR * (q3 - q1)
+        low_fence, high_fence = q1 - spread, q3 + spread
+        outside = (amounts < low_fence) | (amounts > high_fence)
+        for index in order[outside[order]]:
+            amount = amounts[index]
+            bidder = bidders[index]
+            stats['outliers'].append({
+                'name': bidder.get('name', ''),
+                'bid_amount': float(amount),
+                'percentage': float(percentages[index]),
+                'side': 'low' if amount < low_fence else 'high',
+            })
+
+        flags = stats['flags']
+        if stats['coefficient_of_variation'] < CARTEL_CV_THRESHOLD:
+            flags.append({'code': 'tight_cluster',
+                          'message': f"Bids vary by only {stats['coefficient_of_variation']:.2f}% "
+                                     f"(coefficient of variation below {CARTEL_CV_THRESHOLD:g}%)"})
+        if stats['relative_distance'] is not None and stats['relative_distance'] > CARTEL_RD_THRESHOLD:
+            flags.append({'code': 'cover_bidding',
+                          'message': f"L1 is {stats['relative_distance']:.2f} standard deviations of the "
+                                     f"losing bids below L2 (above {CARTEL_RD_THRESHOLD:g})"})
+        _, repeats = np.unique(amounts, return_counts=True)
+        identical = int(repeats[repeats > 1].sum())
+        if identical:
+            flags.append({'code': 'identical_bids',
+                          'message': f"{identical} bidders quoted an amount identical to another bid"})
+    return stats
+
+
+def tender_statistics(bidders: Iterable[Dict[str, Any]], estimated_cost: float = 0) -> Dict[str, Any]:
+    """
+    Statistics for one tender, computed once per ranked view.
+
+    Callers that produce several outputs for a tender pass the same
+    bidder_ranking.RankedBidders view to each, and the HTML, PDF and DOCX
+    outputs share one result. Treat the returned dictionary as read-only.
+    """
+    view = ranked_view(bidders)
+    return view.derived(('statistics', float(estimated_cost or 0)),
+                        lambda bids: compute_statistics(bids, estimated_cost))
+
+
+def summary_rows(stats: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(label, value) rows of the headline statistics, as printed in the PDF and DOC bid analysis."""
+    gap = stats['l1_l2_gap_percent']
+    distance = stats['relative_distance']
+    return [
+        ('Number of bidders', str(stats['total_bidders'])),
+        ('Lowest bid (L1)', f"Rs. {stats['lowest_bid']:,.0f}"),
+        ('Highest bid', f"Rs. {stats['highest_bid']:,.0f}"),
+        ('Average bid', f"Rs. {stats['average_bid']:,.0f}"),
+        ('Median bid', f"Rs. {stats['median_bid']:,.0f}"),
+        ('Standard deviation', f"Rs. {stats['std_bid']:,.0f}"),
+        ('Quartiles (Q1 - Q3)', f"Rs. {stats['q1_bid']:,.0f} - Rs. {stats['q3_bid']:,.0f}"),
+        ('Range', f"Rs. {stats['bid_range']:,.0f}"),
+        ('Coefficient of variation', f"{stats['coefficient_of_variation']:.2f}%"),
+        ('Average / median percentage', f"{stats['average_percentage']:+.2f}% / {stats['median_percentage']:+.2f}%"),
+        ('L1 - L2 gap', f"{gap:.2f}%" if gap is not None else '-'),
+        ('Relative distance (L2 - L1 / SD of losing bids)', f"{distance:.2f}" if distance is not None else '-'),
+    ]
@@ -1,5 +1,24 @@
+import re
+from functools import lru_cache
+
 import streamlit as st
 
+@lru_cache(maxsize=128)
+def compact_markup(markup: str) -> str:
+    """
+    Return HTML/CSS without comments, indentation or line breaks.
+
+    st.markdown dedents and scans its whole argument on every rerun, so the
+    page chrome emitted on each run is compacted once per process and the
+    compact copy is reused. Call clear_style_cache() to rebuild it.
+    """
+    markup = re.sub(r'/\*.*?\*/', '', markup, flags=re.DOTALL)
+    return ' '.join(line.strip() for line in markup.splitlines() if line.strip())
+
+def clear_style_cache():
+    """Drop the compacted CSS and markup so they are rebuilt on the next rerun."""
+    compact_markup.cache_clear()
+
 def apply_custom_css():
     """Apply enhanced custom CSS while preserving Streamlit's default styling."""
     
@@ -355,7 +374,7 @@ def apply_custom_css():
     </style>
     """
     
-    st.markdown(custom_css, unsafe_allow_html=True)
+    st.markdown(compact_markup(custom_css), unsafe_allow_html=True)
 
 def get_theme_colors():
     """Return the enhanced theme color palette for consistency."""
@@ -1,10 +1,11 @@
 import streamlit as st
 from datetime import datetime
 from date_utils import DateUtils
+from theme import compact_markup
 
 def create_header():
     """Create the enhanced application header with professional styling."""
-    st.markdown("""
+    st.markdown(compact_markup("""
     <div style="
         text-align: center; 
         padding: 25px; 
@@ -34,7 +35,7 @@ def create_header():
             An Initiative by Mrs. Premlata Jain, Additional Administrative Officer, PWD, Udaipur
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 def create_footer():
     """Create the enhanced application footer with professional styling and date utilities."""
@@ -65,7 +66,7 @@ def create_footer():
         """, unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
+        st.markdown(compact_markup("""
         <div style="
             text-align: center; 
             padding: 25px; 
@@ -88,10 +89,10 @@ def create_footer():
                 PWD Electric Division - Udaipur
             </p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
+        st.markdown(compact_markup("""
         <div style="
             text-align: center; 
             padding: 15px;
@@ -106,10 +107,10 @@ def create_footer():
                 <span style="font-size: 0.8em; opacity: 0.9;">Date-Fixed Pro</span>
             </p>
         </div>
-        """, unsafe_allow_html=True)
+        """), unsafe_allow_html=True)
     
     # Enhanced copyright and additional info
-    st.markdown("""
+    st.markdown(compact_markup("""
     <div style="
         text-align: center; 
         padding: 20px; 
@@ -130,7 +131,7 @@ def create_footer():
             Built with for engineers, by engineers | Powered by Streamlit & Python | Date Bugs Fixed 
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 def show_balloons():
     """Show celebration balloons with enhanced custom message."""
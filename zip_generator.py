@@ -7,6 +7,7 @@ import zipfile
 import io
 from typing import Dict
 import logging
+from instrumentation import instrumented
 
 class ZipGenerator:
     """Generates ZIP archives containing multiple documents."""
@@ -14,6 +15,7 @@ class ZipGenerator:
     def __init__(self):
         pass
     
+    @instrumented()
     def create_zip(self, documents: Dict[str, bytes]) -> bytes:
         """
         Create a ZIP file containing multiple documents.
@@ -41,6 +43,7 @@ class ZipGenerator:
             logging.error(f"Error creating ZIP archive: {e}")
             return b""
     
+    @instrumented()
     def create_tender_documents_zip(self, work_name: str, nit_number: str, 
                                    documents: Dict[str, bytes]) -> bytes:
         """